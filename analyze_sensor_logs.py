@@ -4,31 +4,94 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
 import joblib
+import argparse
+import sys
 from datetime import datetime
 
-# === Load CSV ===
-csv_path = "sensor_logs_export.csv"
-df = pd.read_csv(csv_path, parse_dates=['event_timestamp'])
-
-# === Prepare Data ===
-df['timestamp'] = df['event_timestamp']
-df.set_index('timestamp', inplace=True)
-
-# Group into 30-minute buckets
-grouped = df.groupby([pd.Grouper(freq='30Min'), 'lot_id', 'name', 'event_type']).size().unstack(fill_value=0).reset_index()
-grouped['entry'] = grouped.get('entry', 0)
-grouped['exit'] = grouped.get('exit', 0)
-grouped['net_change'] = grouped['entry'] - grouped['exit']
-
-# === Reconstruct Occupancy ===
-occupancy_dfs = []
-for lot_id in grouped['lot_id'].unique():
-    lot_df = grouped[grouped['lot_id'] == lot_id].copy()
-    lot_df.sort_values('timestamp', inplace=True)
-    lot_df['occupancy'] = lot_df['net_change'].cumsum()
-    occupancy_dfs.append(lot_df)
-
-df_occupancy = pd.concat(occupancy_dfs)
+from columnar_io import read_sensor_logs
+from feature_store import FEATURE_STORE, train_incremental
+from lot_rollups import get_connection, occupancy_frame, read_rollups
+from model_benchmark import CANDIDATES, print_benchmark, run_benchmark
+from occupancy import attach_spots, load_spots, occupancy_by_bucket
+from occupancy_insights import compute_insights, print_insights, save_insights
+
+parser = argparse.ArgumentParser(description="Analyze sensor logs and train the availability model")
+parser.add_argument("command", nargs="?", default="train", choices=["train", "benchmark"],
+                    help="train (default): train the model and print insights; benchmark: compare candidate models")
+parser.add_argument("--input", default="sensor_logs_export.csv",
+                    help="CSV export, or a Parquet / Arrow dataset directory partitioned by event_date and lot_id")
+parser.add_argument("--rollups", action="store_true",
+                    help="Read 30-minute occupancy from the lot_occupancy_rollup table (lot_rollups.py) "
+                         "instead of the sensor logs")
+parser.add_argument("--start-date", help="Only read events on or after this date (YYYY-MM-DD)")
+parser.add_argument("--end-date", help="Only read events on or before this date (YYYY-MM-DD)")
+parser.add_argument("--lots", nargs="+", help="Only read these lot ids")
+parser.add_argument("--spots", help="spot_seed.csv, to join spot types (and lots for seed logs) by sensor_id")
+parser.add_argument("--insights-out", help="Also write the insights as JSON, or Parquet tables for a .parquet path")
+parser.add_argument("--occupancy-out", help="Write exact per-minute occupancy per lot (and spot type) to CSV or .parquet")
+parser.add_argument("--incremental", action="store_true",
+                    help="Only fold logs newer than the feature store watermark in and add trees to the existing model")
+parser.add_argument("--feature-store", default=FEATURE_STORE, help="SQLite feature store used by --incremental")
+parser.add_argument("--trees-per-run", type=int, default=25, help="Trees added per incremental run")
+parser.add_argument("--max-trees", type=int, default=200, help="Oldest trees beyond this are dropped")
+parser.add_argument("--window-days", type=int, default=28, help="Days of features the new trees are fitted on")
+parser.add_argument("--candidates", nargs="+", choices=list(CANDIDATES), help="benchmark: models to compare (default: all)")
+parser.add_argument("--splits", type=int, default=3, help="benchmark: number of time-ordered splits")
+parser.add_argument("--jobs", type=int, default=-1, help="benchmark: parallel (model, split) jobs")
+parser.add_argument("--target-rmse", type=float, help="benchmark: pick the cheapest model within this RMSE")
+parser.add_argument("--benchmark-out", help="benchmark: write per-split results to CSV")
+args = parser.parse_args()
+
+# === Incremental retraining (nightly): no full-history pass, no report ===
+if args.incremental:
+    if args.lots:
+        parser.error("--lots cannot be used with --incremental (the feature store watermark covers all lots)")
+    train_incremental(args.input, store_path=args.feature_store, trees_per_run=args.trees_per_run,
+                      max_trees=args.max_trees, window_days=args.window_days, end_date=args.end_date)
+    sys.exit(0)
+
+# === Pre-aggregated occupancy: no sensor log scan ===
+if args.rollups:
+    if args.spots or args.occupancy_out:
+        parser.error("--spots and --occupancy-out need the sensor logs, not --rollups")
+    conn = get_connection()
+    try:
+        end = pd.Timestamp(args.end_date) + pd.Timedelta(days=1) if args.end_date else None
+        rollups = read_rollups(conn, bucket_size="30m", start=args.start_date,
+                               end=None if end is None else end.to_pydatetime(), lot_ids=args.lots)
+    finally:
+        conn.close()
+    if rollups.empty:
+        print("❌ No 30-minute rollups found, run lot_rollups.py first")
+        sys.exit(1)
+    df_occupancy = occupancy_frame(rollups)
+    print(f"[INFO] Read {len(df_occupancy)} rollup rows for {df_occupancy['lot_id'].nunique()} lots")
+else:
+    # === Load sensor logs (only the columns and partitions needed) ===
+    df = read_sensor_logs(args.input, columns=['lot_id', 'name', 'sensor_id', 'event_type', 'event_timestamp'],
+                          start_date=args.start_date, end_date=args.end_date, lot_ids=args.lots)
+
+    # Spot types (and lots, for seed logs that only carry sensor_id) come from spot_seed.csv
+    if args.spots:
+        df = attach_spots(df, load_spots(args.spots))
+    if 'lot_id' not in df.columns:
+        parser.error("--spots is required for logs without lot_id")
+    if 'name' not in df.columns:
+        df['name'] = df['lot_id'].astype(str)
+
+    # === Reconstruct Occupancy (30-minute buckets per lot, entry/exit or OCCUPIED/VACANT) ===
+    df_occupancy = occupancy_by_bucket(df, by=['lot_id', 'name'], freq='30Min')
+
+# Exact per-minute occupancy per lot, and per spot type when spot types are known
+if args.occupancy_out:
+    by = ['lot_id', 'spot_type'] if 'spot_type' in df.columns else ['lot_id']
+    per_minute = occupancy_by_bucket(df, by=by, freq='1min', dense=True)
+    if args.occupancy_out.endswith('.parquet'):
+        per_minute.to_parquet(args.occupancy_out, index=False)
+    else:
+        per_minute.to_csv(args.occupancy_out, index=False)
+    print(f"✅ Per-minute occupancy by {', '.join(by)} saved to {args.occupancy_out} ({len(per_minute)} rows)")
+
 df_occupancy['weekday'] = df_occupancy['timestamp'].dt.day_name()
 df_occupancy['hour'] = df_occupancy['timestamp'].dt.hour
 df_occupancy['minute'] = df_occupancy['timestamp'].dt.minute
@@ -50,6 +113,15 @@ reverse_lot_map = df_model[['lot_id_encoded', 'name']].drop_duplicates().set_ind
 X = df_model[['lot_id_encoded', 'weekday_encoded', 'hour', 'minute']]
 y = df_model['occupancy']
 
+# === Benchmark candidate models on time-ordered splits (no training / report) ===
+if args.command == "benchmark":
+    summary, per_fold = run_benchmark(df_model, candidates=args.candidates, n_splits=args.splits, n_jobs=args.jobs)
+    print_benchmark(summary, args.target_rmse)
+    if args.benchmark_out:
+        per_fold.to_csv(args.benchmark_out, index=False)
+        print(f"✅ Per-split results saved to {args.benchmark_out}")
+    sys.exit(0)
+
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
 model = RandomForestRegressor(n_estimators=100, random_state=42)
@@ -63,34 +135,12 @@ joblib.dump((model, lot_id_map, weekday_map), model_file)
 
 print(f"✅ Model trained and saved to {model_file}, RMSE: {rmse:.2f}")
 
-# === Insights ===
-
-# 1. Peak occupancy hour per lot/weekday
-print("\n📈 Peak Occupancy Hours per Lot/Weekday:")
-for (lot_id, name) in df_occupancy[['lot_id', 'name']].drop_duplicates().values:
-    for weekday in df_occupancy['weekday'].unique():
-        df_sub = df_occupancy[(df_occupancy['lot_id'] == lot_id) & (df_occupancy['weekday'] == weekday)]
-        if not df_sub.empty:
-            avg_by_hour = df_sub.groupby('hour')['occupancy'].mean()
-            peak_hour = avg_by_hour.idxmax()
-            print(f"  Lot {name} ({lot_id}), {weekday}: {peak_hour}:00")
-
-# 2. Highest occupancy moment
-max_occ = df_occupancy.loc[df_occupancy['occupancy'].idxmax()]
-print(f"\n🚗 Highest Occupancy: {max_occ['occupancy']} at {max_occ['timestamp']} in Lot {max_occ['name']}")
-
-# 3. Busiest 30-min incoming/outgoing traffic
-print("\n🔼 Busiest 30-min Incoming Traffic:")
-incoming_counts = df_occupancy.groupby(['date', 'timestamp'])['entry'].sum()
-incoming_peak = incoming_counts.groupby('date').idxmax()
-for date, (d, ts) in incoming_peak.items():
-    print(f"  {d}: {ts.time()}")
-
-print("\n🔽 Busiest 30-min Outgoing Traffic:")
-outgoing_counts = df_occupancy.groupby(['date', 'timestamp'])['exit'].sum()
-outgoing_peak = outgoing_counts.groupby('date').idxmax()
-for date, (d, ts) in outgoing_peak.items():
-    print(f"  {d}: {ts.time()}")
+# === Insights (single aggregation pass) ===
+insights = compute_insights(df_occupancy)
+print_insights(insights)
+if args.insights_out:
+    save_insights(insights, args.insights_out)
+    print(f"\n✅ Insights saved to {args.insights_out}")
 
 # === Predict Future Availability ===
 print("\n📅 Predict Occupancy for a Future Timestamp:")
@@ -0,0 +1,223 @@
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from faker.providers.person.en_US import Provider as PersonProvider
+
+OFFICE_DATA = {
+    "office_id": "1",
+    "name": "Polaris McCoy Center",
+    "address": "1111 Polaris Parkway, Columbus, OH 43240",
+    "status": "OPEN",
+    "status_description": "Open and Operational"
+}
+
+BLOCKS = [
+    ("A", "M", "N"), ("B", "B", "Q"), ("C", "M", "N"), ("D", "B", "C"),
+    ("E", "L", "M"), ("F", "C", "B"), ("G", "L", "M"), ("H", "D", "C"),
+    ("J", "K", "L"), ("K", "D", "C"), ("L", "K", "L"), ("M", "E", "D"),
+    ("N", "J", "K"), ("P", "E", "F")
+]
+
+LOTS = [
+    ("A", "NE"), ("B", "NE"), ("C", "E"), ("D", "E"),
+    ("E", "SE"), ("F", "S"), ("G", "S"), ("H", "S"),
+    ("J", "SW"), ("K", "W"), ("L", "W"), ("M", "NW"),
+    ("N", "NW"), ("Q", "N"), ("X", "SW")
+]
+
+EMPLOYEE_COUNT = 12500
+SPOT_COUNT = 11000
+ADA_PCT = 0.03
+EV_PCT = 0.02
+REGULAR_PCT = 0.95
+SPOT_TYPES = ['REGULAR', 'ADA', 'EV']
+SPOT_TYPE_CUM_WEIGHTS = [95, 98, 100]
+NUM_ADMINS = 50
+EMPLOYEE_PCT = 0.85
+
+# Seeded runs stamp every row with this instead of the wall clock, so output is byte-identical
+SEEDED_NOW = datetime(2025, 1, 1)
+DEFAULT_CHUNK_SIZE = 50_000
+# Employees draw from one RNG per block of this many rows; worker chunks are whole blocks,
+# so the output does not depend on the chunk size either
+RNG_BLOCK_SIZE = 10_000
+
+# Weighted name pools straight from faker's en_US provider (no per-row faker calls)
+FIRST_NAMES = list(PersonProvider.first_names)
+FIRST_NAME_CUM_WEIGHTS = list(accumulate(PersonProvider.first_names.values()))
+LAST_NAMES = list(PersonProvider.last_names)
+LAST_NAME_CUM_WEIGHTS = list(accumulate(PersonProvider.last_names.values()))
+
+# Employee ids are a letter + 6 digits (26M codes). An affine permutation of the row index
+# gives every employee a distinct id (so parking tags stay unique) that still looks random.
+EMPLOYEE_ID_SPACE = 26 * 1_000_000
+EMPLOYEE_ID_STRIDE = 15_485_863  # prime, coprime with 26M
+
+
+def scoped_rng(seed, *scope):
+    # String seeds are hashed with SHA-512, so this is stable across processes and runs
+    return random.Random(":".join(str(part) for part in (seed,) + scope))
+
+
+def seeded_uuid4(rng):
+    value = rng.getrandbits(128)
+    value = (value & ~(0xf000 << 64)) | (0x4000 << 64)  # version 4
+    value = (value & ~(0xc000 << 48)) | (0x8000 << 48)  # RFC 4122 variant
+    h = '%032x' % value
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def employee_code(index, offset):
+    code = (index * EMPLOYEE_ID_STRIDE + offset) % EMPLOYEE_ID_SPACE
+    return f"{chr(65 + code // 1_000_000)}{code % 1_000_000:06d}"
+
+
+def _spot_chunk(seed, lot_name, lot_id, count):
+    rng = scoped_rng(seed, "spot", lot_name)
+    spot_types = rng.choices(SPOT_TYPES, cum_weights=SPOT_TYPE_CUM_WEIGHTS, k=count)
+    spot_rows = []
+    sensor_rows = []
+    for i, spot_type in enumerate(spot_types):
+        spot_id = seeded_uuid4(rng)
+        sensor_id = seeded_uuid4(rng)
+        spot_rows.append([
+            spot_id, f"{lot_name}-{i + 1}", lot_id, sensor_id, "AVAILABLE", "", spot_type, i // 10, i % 10
+        ])
+        sensor_rows.append([sensor_id, f"SENSOR-{sensor_id[:8]}", spot_id, "ACTIVE", "", "ULTRASONIC"])
+    return spot_rows, sensor_rows
+
+
+def _employee_chunk(seed, start, emp_types, id_offset, office_id, block_ids, lot_ids,
+                    start_ordinal, end_ordinal):
+    end_date = date(9999, 12, 31)
+    rows = []
+    for block_start in range(0, len(emp_types), RNG_BLOCK_SIZE):
+        rng = scoped_rng(seed, "employee", (start + block_start) // RNG_BLOCK_SIZE)
+        block_types = emp_types[block_start:block_start + RNG_BLOCK_SIZE]
+        first_names = rng.choices(FIRST_NAMES, cum_weights=FIRST_NAME_CUM_WEIGHTS, k=len(block_types))
+        last_names = rng.choices(LAST_NAMES, cum_weights=LAST_NAME_CUM_WEIGHTS, k=len(block_types))
+        for i, emp_type in enumerate(block_types):
+            emp_id = employee_code(start + block_start + i, id_offset)
+            preferred = rng.sample(lot_ids, k=rng.randint(0, 3))
+            rows.append([
+                seeded_uuid4(rng), emp_id, f"{first_names[i]} {last_names[i]}", office_id, rng.choice(block_ids),
+                "ACTIVE", date.fromordinal(rng.randint(start_ordinal, end_ordinal)), end_date,
+                emp_type, rng.choice(lot_ids),
+                ','.join(preferred), f"TAG-{emp_id}",
+                'admin' if emp_type == 'ADMIN' else 'pass123'
+            ])
+    return rows
+
+
+# Base tables from one explicit seed. Every table (and every spot / employee chunk) draws from
+# its own RNG derived from (seed, table, chunk), so output does not depend on the number of
+# workers or on scheduling; spots (per lot) and employees (per chunk) run on a process pool.
+class BaseGenerator:
+    def __init__(self, seed=None, now=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.seeded = seed is not None
+        self.seed = seed if self.seeded else random.SystemRandom().randrange(2 ** 63)
+        self.now = now or (SEEDED_NOW if self.seeded else datetime.utcnow())
+        self.workers = workers
+        self.chunk_size = max(RNG_BLOCK_SIZE, chunk_size // RNG_BLOCK_SIZE * RNG_BLOCK_SIZE)
+        self.office_id = seeded_uuid4(scoped_rng(self.seed, "office"))
+        self.lot_id_map = {}
+        self.block_id_map = {}
+        self.lot_spot_counts = {}
+
+    def office_rows(self):
+        return [[
+            self.office_id, OFFICE_DATA["office_id"], OFFICE_DATA["name"], OFFICE_DATA["address"],
+            OFFICE_DATA["status"], OFFICE_DATA["status_description"]
+        ]]
+
+    # Random per-lot weights, scaled to exactly `spot_count` spots in total
+    def lot_rows(self, spot_count=SPOT_COUNT):
+        rng = scoped_rng(self.seed, "lot")
+        weights = [rng.uniform(0.5, 1.5) for _ in LOTS]
+        weight_sum = sum(weights)
+        self.lot_spot_counts = {name: int(round(spot_count * (weight / weight_sum)))
+                                for (name, _), weight in zip(LOTS, weights)}
+        diff = spot_count - sum(self.lot_spot_counts.values())
+        if diff != 0:
+            largest_lot = max(self.lot_spot_counts, key=self.lot_spot_counts.get)
+            self.lot_spot_counts[largest_lot] += diff
+
+        rows = []
+        for name, location in LOTS:
+            lot_id = seeded_uuid4(rng)
+            self.lot_id_map[name] = lot_id
+            total = self.lot_spot_counts[name]
+            rows.append([
+                lot_id, name, self.office_id, f"Lot {name}", location, "ACTIVE", f"Lot {name} in use",
+                total,
+                int(total * REGULAR_PCT), int(total * ADA_PCT), int(total * EV_PCT),
+                int(total * REGULAR_PCT), int(total * REGULAR_PCT), int(total * ADA_PCT), int(total * EV_PCT)
+            ])
+        return rows
+
+    def block_rows(self):
+        rng = scoped_rng(self.seed, "block")
+        rows = []
+        for block_name, lot1, lot2 in BLOCKS:
+            block_id = seeded_uuid4(rng)
+            self.block_id_map[block_name] = block_id
+            rows.append([
+                block_id, block_name, f"Block {block_name}", self.office_id, 'ACTIVE', f"Block {block_name} is active",
+                rng.randint(500, 1200), f"{self.lot_id_map[lot1]},{self.lot_id_map[lot2]}"
+            ])
+        return rows
+
+    # (spot_rows, sensor_rows) per lot
+    def spot_and_sensor_chunks(self, executor):
+        tasks = [(self.seed, name, lot_id, self.lot_spot_counts[name]) for name, lot_id in self.lot_id_map.items()]
+        return self._ordered(executor, _spot_chunk, tasks)
+
+    def employee_chunks(self, executor, employee_count=EMPLOYEE_COUNT):
+        rng = scoped_rng(self.seed, "employee")
+        num_employees = int(employee_count * EMPLOYEE_PCT)
+        num_admins = min(NUM_ADMINS, employee_count - num_employees)
+        num_contractors = employee_count - num_admins - num_employees
+        type_pool = (['ADMIN'] * num_admins) + (['EMPLOYEE'] * num_employees) + (['CONTRACTOR'] * num_contractors)
+        rng.shuffle(type_pool)
+        id_offset = rng.randrange(EMPLOYEE_ID_SPACE)
+
+        # Joined between 5 and 1 years before the run's timestamp
+        today = self.now.date()
+        start_ordinal = (today - timedelta(days=5 * 365)).toordinal()
+        end_ordinal = (today - timedelta(days=365)).toordinal()
+        block_ids = list(self.block_id_map.values())
+        lot_ids = list(self.lot_id_map.values())
+
+        tasks = ((self.seed, start, type_pool[start:start + self.chunk_size], id_offset, self.office_id,
+                  block_ids, lot_ids, start_ordinal, end_ordinal)
+                 for start in range(0, employee_count, self.chunk_size))
+        return self._ordered(executor, _employee_chunk, tasks)
+
+    # Results in submission order, with at most two tasks per worker in flight
+    # so finished chunks never pile up faster than the sinks consume them
+    def _ordered(self, executor, fn, tasks):
+        window = 2 * (self.workers or os.cpu_count() or 1)
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(fn, *task))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    # (table, rows) chunks in foreign-key order; rows carry no audit columns
+    # (the sinks append created_at / created_by / updated_at / updated_by)
+    def iter_tables(self, employee_count=EMPLOYEE_COUNT, spot_count=SPOT_COUNT):
+        yield "office", self.office_rows()
+        yield "lot", self.lot_rows(spot_count)
+        yield "block", self.block_rows()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for spot_rows, sensor_rows in self.spot_and_sensor_chunks(executor):
+                yield "spot", spot_rows
+                yield "sensor", sensor_rows
+            for employee_rows in self.employee_chunks(executor, employee_count):
+                yield "employee", employee_rows
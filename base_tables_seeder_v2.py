@@ -1,17 +1,37 @@
-import random
-import uuid
 import csv
 import argparse
+import heapq
 
-from faker import Faker
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import psycopg2
 import time
 from tqdm import tqdm
 import os
 from collections import Counter
 
-fake = Faker()
+import numpy as np
+
+from base_generator import BaseGenerator, EMPLOYEE_COUNT, SPOT_COUNT, SPOT_TYPES, scoped_rng, seeded_uuid4
+from bulk_loader import BulkLoader, DEFAULT_BATCH_SIZE, SEED_FILES
+from columnar_io import ColumnarWriter, SEED_LOG_TYPES
+from seed_loader import load_seed_tables
+from seed_sinks import AUDIT_COLUMNS, BASE_TABLES, LOG_TABLES, SEED_HEADERS, audit_values, seed_csv_sink
+from spot_index import SpotIndex, SpotPool
+from traffic_model import load_traffic_model
+
+SEED_DIR = "seed_files"
+DEFAULT_LOG_START = "2024-06-01"
+DEFAULT_LOG_DAYS = 7
+
+# In-office pattern by weekday
+WEEKDAY_IN_OFFICE_PCT = {
+    0: 0.50,  # Monday
+    1: 0.70,  # Tuesday
+    2: 0.75,  # Wednesday
+    3: 0.65,  # Thursday
+    4: 0.30   # Friday
+}
 
 
 def read_db_credentials(path, headless=False):
@@ -42,423 +62,363 @@ def get_connection(headless=False):
     )
 
 
-def write_csv(filename, rows, headers):
-    full_path = os.path.join(seed_dir, filename)
-    with open(full_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(rows)
-
-
-parser = argparse.ArgumentParser()
-parser.add_argument("--headless", action="store_true", help="Run script without interactive prompts")
-args = parser.parse_args()
-
-start_time = time.time()
-print("[START] Script started at", datetime.now())
-now = datetime.utcnow()
-
-# Create seed_files folder if it doesn't exist
-seed_dir = "seed_files"
-os.makedirs(seed_dir, exist_ok=True)
-
-# Ask user which tables to seed
-if args.headless:
-    seed_choice = "1"
-    print("[INFO] Running in headless mode: Seeding base tables")
-else:
-    print("What do you want to seed?")
-    print("1. Base tables")
-    print("2. Log tables")
-    seed_choice = input("Enter 1 or 2: ").strip()
-
-if seed_choice == "2":
-    print("[INFO] Seeding log tables...")
-
-    if args.headless:
-        log_csv_choice = "1"
-        log_start_date = "2024-06-01"
-        log_end_date = "2024-06-07"
-        print(f"[INFO] Headless mode: Generating log data from {log_start_date} to {log_end_date}")
+# Elapsed seconds per seeding stage, reported at the end of the run
+@contextmanager
+def stage(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+        print(f"[TIMING] {name}: {timings[name]:.2f}s")
+
+
+# Streams the seed files of `tables` into CockroachDB, starting every table from the first row.
+# If the load is interrupted, `python bulk_loader.py <tables>` resumes it.
+def insert_tables(args, tables, counts):
+    connect = lambda: get_connection(headless=args.headless)
+    loader = BulkLoader(connect(), batch_size=args.batch_size, method=args.load_method, connect=connect)
+    for table in tables:
+        loader.reset(table)
+        loader.load_csv(table, os.path.join(SEED_DIR, SEED_FILES[table]), total=counts[table])
+    loader.conn.close()
+
+
+# What log generation needs from the base tables. `seed all` fills it from the generated chunks,
+# so logs are built straight from memory; `seed logs` reads it from the typed seed files.
+class LogInputs:
+    def __init__(self):
+        self.lot_id_map = {}  # name -> UUID
+        self.nearest_lots_by_block = {}  # block UUID -> nearest lot UUIDs, used when an employee's lot is full
+        self.block_names = {}  # block UUID -> block letter (the traffic model's group)
+        self.employee_ids = []  # employee UUIDs (employee_parking_history.employee_id references employee.id)
+        self.employee_blocks = []
+        self.spot_index = SpotIndex()
+
+    def add_chunk(self, table, rows):
+        if table == "lot":
+            self.lot_id_map.update((row[1], row[0]) for row in rows)
+        elif table == "block":
+            self.nearest_lots_by_block.update(
+                (row[0], [lot_id for lot_id in row[7].split(',') if lot_id]) for row in rows)
+            self.block_names.update((row[0], row[1]) for row in rows)
+        elif table == "spot":
+            self.spot_index.extend(rows)
+        elif table == "employee":
+            self.employee_ids.extend(row[0] for row in rows)
+            self.employee_blocks.extend(row[4] for row in rows)
+
+    # Typed seed columns (parsed once, then memory-mapped from seed_files/.cache while the CSVs are unchanged)
+    @classmethod
+    def from_seed_files(cls, seed_dir):
+        seeds = load_seed_tables(seed_dir, ["spot", "employee", "lot", "block"])
+        cached = [table for table, seed in seeds.items() if seed.from_cache]
+        if cached:
+            print(f"[INFO] Using cached columns for: {', '.join(cached)}")
+
+        inputs = cls()
+        inputs.lot_id_map = dict(zip(seeds["lot"].strings("lot_id"), seeds["lot"].strings("id")))
+        inputs.nearest_lots_by_block = {
+            block_id: [lot_id for lot_id in nearest.split(',') if lot_id]
+            for block_id, nearest in zip(seeds["block"].strings("id"), seeds["block"].strings("nearest_lots"))}
+        inputs.block_names = dict(zip(seeds["block"].strings("id"), seeds["block"].strings("block_id")))
+        # Block strings are shared, one per block
+        inputs.employee_ids = seeds["employee"].strings("id")
+        inputs.employee_blocks = seeds["employee"].strings("block_id")
+        inputs.spot_index = SpotIndex.from_seed_table(seeds["spot"])
+        print(f"[INFO] Loaded {len(seeds['spot'])} spot rows")
+        print(f"[INFO] Loaded {len(inputs.employee_ids)} employee rows")
+        print(f"[INFO] Loaded {len(seeds['lot'])} lot rows (reconstructed lot_id_map)")
+        return inputs
+
+
+def seed_base(args, generator, timings, inputs=None):
+    print(f"[INFO] Generating base tables (seed {generator.seed}, {'fixed' if generator.seeded else 'random'}) "
+          f"and streaming them to {SEED_DIR}/...")
+    spot_type_counter = Counter()
+    emp_type_counter = Counter()
+    with stage(timings, "base: generate + write"):
+        base_sinks = {table: seed_csv_sink(SEED_DIR, table, generator.now) for table in BASE_TABLES}
+        for table, rows in generator.iter_tables(employee_count=args.employees, spot_count=args.spots):
+            base_sinks[table].write_rows(rows)
+            if inputs is not None:
+                inputs.add_chunk(table, rows)
+            if table == "spot":
+                spot_type_counter.update((row[2], row[6]) for row in rows)
+            elif table == "employee":
+                emp_type_counter.update(row[8] for row in rows)
+        for sink in base_sinks.values():
+            sink.close()
+    base_counts = {table: sink.rows_written for table, sink in base_sinks.items()}
+    lot_spot_counts = generator.lot_spot_counts
+
+    # Print per-lot stats
+    print("[STATS] Per-lot spot counts:")
+    for name in sorted(lot_spot_counts.keys()):
+        pct = lot_spot_counts[name] / args.spots * 100
+        print(f"  Lot {name}: {lot_spot_counts[name]} spots ({pct:.2f}%)")
+    print(f"  Total assigned: {sum(lot_spot_counts.values())} spots (target: {args.spots})")
+
+    print("[SUMMARY] Spot types per lot:")
+    for name, lot_id in generator.lot_id_map.items():
+        print(f"  Lot {name}: " + ", ".join(f"{t} {spot_type_counter[(lot_id, t)]}" for t in SPOT_TYPES))
+
+    print("\n[STATS] Employee type counts:")
+    for t in ['EMPLOYEE', 'CONTRACTOR', 'ADMIN']:
+        print(f"  {t}: {emp_type_counter[t]}")
+    print(f"  Total employees: {base_counts['employee']} (target: {args.employees})\n")
+
+    if args.insert:
+        print("[INFO] Inserting into CockroachDB...")
+        with stage(timings, "base: insert"):
+            insert_tables(args, BASE_TABLES, base_counts)
+        print("[INFO] Insert complete ✅")
+
+    return [
+        ["Total lots", base_counts['lot']],
+        ["Total spots", base_counts['spot']],
+        ["Total sensors", base_counts['sensor']],
+        ["Total employees", base_counts['employee']],
+        ["EMPLOYEE count", emp_type_counter['EMPLOYEE']],
+        ["CONTRACTOR count", emp_type_counter['CONTRACTOR']],
+        ["ADMIN count", emp_type_counter['ADMIN']],
+    ]
+
+
+def daterange(start_date, end_date):
+    for n in range(int((end_date - start_date).days) + 1):
+        yield start_date + timedelta(n)
+
+
+def seed_logs(args, inputs, now, seed, start_dt, end_dt, timings):
+    print(f"[INFO] Would generate log data from {start_dt} to {end_dt} as per occupancy pattern.")
+    if args.insert:
+        print("[INFO] Writing CSV and inserting into DB...")
     else:
-        # Ask for date range
-        log_start_date = input("Enter START date (YYYY-MM-DD): ").strip()
-        log_end_date = input("Enter END date (YYYY-MM-DD): ").strip()
-
-        # Ask CSV or insert
-        print("Do you want to:")
-        print("1. Generate CSV files")
-        print("2. Insert directly into CockroachDB (will also generate CSV files)")
-        log_csv_choice = input("Enter 1 or 2: ").strip()
-
-    print(f"[INFO] Would generate log data from {log_start_date} to {log_end_date} as per occupancy pattern.")
-    if log_csv_choice == "1":
         print("[INFO] Writing CSV only...")
-    else:
-        print("[INFO] Writing CSV and inserting into DB...")
-
-
-    # Load spot_rows, employee_rows, lot_id_map from CSV
-    def load_csv(filepath):
-        with open(filepath, 'r', newline='') as f:
-            reader = csv.reader(f)
-            next(reader)  # skip header
-            return [row for row in reader]
-
-
-    print("[INFO] Loading base table seed files...")
-    spot_rows = load_csv(os.path.join("seed_files", "spot_seed.csv"))
-    employee_rows = load_csv(os.path.join("seed_files", "employee_seed.csv"))
-    lot_rows = load_csv(os.path.join("seed_files", "lot_seed.csv"))
-
-    # Rebuild lot_id_map
-    lot_id_map = {row[1]: row[0] for row in lot_rows}  # name -> UUID
-
-    print(f"[INFO] Loaded {len(spot_rows)} spot rows")
-    print(f"[INFO] Loaded {len(employee_rows)} employee rows")
-    print(f"[INFO] Loaded {len(lot_rows)} lot rows (reconstructed lot_id_map)")
-
-    from datetime import timedelta, date
-
-
-    def daterange(start_date, end_date):
-        for n in range(int((end_date - start_date).days) + 1):
-            yield start_date + timedelta(n)
 
+    spot_index = inputs.spot_index
+    lot_ids = [lot_id for lot_id in inputs.lot_id_map.values() if spot_index.spot_count(lot_id)]
+    nearest_lots_by_block = inputs.nearest_lots_by_block
+    print(f"[INFO] Indexed {len(spot_index)} spots across {len(lot_ids)} lots")
+
+    # Each day's logs go straight to the sinks, so memory does not grow with the date range.
+    # The CSV files are also the source for the DB insert below.
+    log_csv_sinks = {}
+    log_dataset_writers = {}
+    if args.log_format == "csv" or args.insert:
+        log_csv_sinks = {table: seed_csv_sink(SEED_DIR, table, now) for table in LOG_TABLES}
+    if args.log_format != "csv":
+        # Typed datasets partitioned by event_date and lot_id; sensor logs get lot_id from the spot index
+        lot_by_sensor = {spot_index.sensor_ids[pos]: lot_id
+                         for lot_id, positions in spot_index.by_lot.items() for pos in positions}
+        log_dataset_writers = {
+            table: ColumnarWriter(os.path.join(SEED_DIR, SEED_FILES[table][:-len(".csv")]),
+                                  SEED_HEADERS[table][:-len(AUDIT_COLUMNS)] + extra_columns,
+                                  fmt=args.log_format, types=SEED_LOG_TYPES,
+                                  constants=dict(zip(AUDIT_COLUMNS, audit_values(now))))
+            for table, extra_columns in (("sensor_logs", ["lot_id", "event_date"]),
+                                         ("employee_parking_history", ["event_date"]))
+        }
+    log_counts = {table: 0 for table in LOG_TABLES}
 
-    # Parse user input dates
-    start_dt = datetime.strptime(log_start_date, "%Y-%m-%d").date()
-    end_dt = datetime.strptime(log_end_date, "%Y-%m-%d").date()
+    # Allocate against a free-spot pool so a sensor is never double-booked
+    spot_pool = SpotPool(spot_index)
+    spilled_over = 0
+    turned_away = 0
 
-    # Placeholder lists for generated logs
-    sensor_log_rows = []
-    employee_history_rows = []
+    # Arrival / departure times per weekday (and per block, when the model has block curves)
+    traffic = load_traffic_model(args.traffic_model)
+    employee_groups = (np.array([inputs.block_names.get(block_id, "") for block_id in inputs.employee_blocks])
+                       if traffic.grouped else None)
 
     # Iterate days
     print("[INFO] Generating log data...")
-    for single_date in tqdm(list(daterange(start_dt, end_dt)), desc="Processing dates"):
-        if single_date.weekday() >= 5:
-            continue  # Skip weekends
-
-        # Generate employee parking history and sensor logs per present employee per day
-        # In-office pattern by weekday
-        weekday_in_office_pct = {
-            0: 0.50,  # Monday
-            1: 0.70,  # Tuesday
-            2: 0.75,  # Wednesday
-            3: 0.65,  # Thursday
-            4: 0.30   # Friday
-        }
-
-        for employee_row in employee_rows:
-            if random.random() < weekday_in_office_pct[single_date.weekday()]:
-                employee_id = employee_row[1]
-                lot_id = random.choice(list(lot_id_map.values()))
-                spot_candidates = [r for r in spot_rows if r[2] == lot_id]
-                chosen_spot = random.choice(spot_candidates)
-                sensor_id = chosen_spot[3]
-
-                # generate entry and exit timestamps
-                ts_entry = datetime(single_date.year, single_date.month, single_date.day,
-                                   random.randint(9, 11), random.randint(0, 59), random.randint(0, 59))
-                ts_exit = datetime(single_date.year, single_date.month, single_date.day,
-                                  random.randint(15, 17), random.randint(0, 59), random.randint(0, 59))
-                if ts_exit <= ts_entry:
-                    ts_exit = ts_entry + timedelta(hours=4)
-
-                # append ENTRY and sensor OCCUPIED
-                employee_history_rows.append([
-                    str(uuid.uuid4()), employee_id, ts_entry, "ENTRY", lot_id,
-                    now, "system", now, "system"
-                ])
-                sensor_log_rows.append([
-                    str(uuid.uuid4()), ts_entry, "OCCUPIED", sensor_id,
-                    "", now, "system", now, "system"
-                ])
+    with stage(timings, "logs: generate + write"):
+        for single_date in tqdm(list(daterange(start_dt, end_dt)), desc="Processing dates"):
+            if single_date.weekday() >= 5:
+                continue  # Skip weekends
+
+            # Each day draws from its own RNGs derived from the run seed, so --seed reproduces the logs too
+            day_rng = scoped_rng(seed, "logs", single_date.isoformat())
+            rng = np.random.default_rng(day_rng.getrandbits(64))
+
+            # Draw the present employees, their entry / exit times and target lots for the whole day at once
+            in_office_pct = WEEKDAY_IN_OFFICE_PCT[single_date.weekday()]
+            present = np.flatnonzero(rng.random(len(inputs.employee_ids)) < in_office_pct)
+            entries, exits = traffic.sample_visits(single_date.weekday(), len(present),
+                                                   groups=None if employee_groups is None else employee_groups[present],
+                                                   rng=rng)
+            targets = rng.integers(len(lot_ids), size=len(present))
+            day_start = datetime.combine(single_date, datetime.min.time())
+
+            # Replay arrivals in time order against the free-spot pool,
+            # releasing every spot whose car has left before the next arrival
+            order = np.argsort(entries, kind="stable")
+            departures = []
+            day_sensor_logs = []
+            day_history = []
+            for employee, entry, exit_, target in zip(present[order].tolist(), entries[order].tolist(),
+                                                      exits[order].tolist(), targets[order].tolist()):
+                ts_entry = day_start + timedelta(seconds=entry)
+                ts_exit = day_start + timedelta(seconds=exit_)
+                while departures and departures[0][0] <= ts_entry:
+                    _, lot_id, pos = heapq.heappop(departures)
+                    spot_pool.release(lot_id, pos)
+
+                target_lot = lot_ids[target]
+                candidate_lots = [target_lot] + nearest_lots_by_block.get(inputs.employee_blocks[employee], [])
+                allocation = spot_pool.acquire_first(candidate_lots, day_rng)
+                if allocation is None:
+                    turned_away += 1
+                    continue
+                lot_id, pos = allocation
+                if lot_id != target_lot:
+                    spilled_over += 1
+                heapq.heappush(departures, (ts_exit, lot_id, pos))
+
+                employee_id = inputs.employee_ids[employee]
+                sensor_id = spot_pool.sensor_id(pos)
+
+                # append ENTRY and sensor OCCUPIED (audit columns are added by the sinks)
+                day_history.append([seeded_uuid4(day_rng), employee_id, ts_entry, "ENTRY", lot_id])
+                day_sensor_logs.append([seeded_uuid4(day_rng), ts_entry, "OCCUPIED", sensor_id, ""])
 
                 # append EXIT and sensor VACANT
-                employee_history_rows.append([
-                    str(uuid.uuid4()), employee_id, ts_exit, "EXIT", lot_id,
-                    now, "system", now, "system"
-                ])
-                sensor_log_rows.append([
-                    str(uuid.uuid4()), ts_exit, "VACANT", sensor_id,
-                    "", now, "system", now, "system"
-                ])
-
-print(f"[INFO] Generated {len(sensor_log_rows)} sensor_log rows")
-print(f"[INFO] Generated {len(employee_history_rows)} employee_parking_history rows")
-
-sensor_log_headers = [
-    "id", "event_timestamp", "event_type", "sensor_id", "parking_tag",
-    "created_at", "created_by", "updated_at", "updated_by"
-]
-
-employee_history_headers = [
-    "id", "employee_id", "event_timestamp", "event_type", "lot_id",
-    "created_at", "created_by", "updated_at", "updated_by"
-]
-
-write_csv("sensor_log_seed.csv", sensor_log_rows, sensor_log_headers)
-write_csv("employee_parking_history_seed.csv", employee_history_rows, employee_history_headers)
-
-if log_csv_choice == "2":
-    print("[INFO] Inserting log tables into CockroachDB...")
-    conn = get_connection(headless=args.headless)
-
-
-    def insert_to_db(table, rows):
-        with conn.cursor() as cur:
-            for row in tqdm(rows, desc=f"Inserting {table}"):
-                q = f"INSERT INTO park_smart.{table} VALUES ({','.join(['%s'] * len(row))})"
-                cur.execute(q, row)
-            conn.commit()
-
-
-    insert_to_db("sensor_log", sensor_log_rows)
-    insert_to_db("employee_parking_history", employee_history_rows)
-
-    conn.close()
-    print("[INFO] Log table insert complete ✅")
-
-# For now — no actual log generation yet
-print("[INFO] Log tables seeding logic to be implemented. Exiting.")
-exit(0)
-
-if args.headless:
-    choice = "2"
-    print("[INFO] Running in headless mode: Generating CSV + Inserting into DB")
-else:
+                day_history.append([seeded_uuid4(day_rng), employee_id, ts_exit, "EXIT", lot_id])
+                day_sensor_logs.append([seeded_uuid4(day_rng), ts_exit, "VACANT", sensor_id, ""])
+
+            # Everyone has gone home by the end of the day
+            for _, lot_id, pos in departures:
+                spot_pool.release(lot_id, pos)
+
+            if log_csv_sinks:
+                log_csv_sinks["sensor_logs"].write_rows(day_sensor_logs)
+                log_csv_sinks["employee_parking_history"].write_rows(day_history)
+            if log_dataset_writers:
+                log_dataset_writers["sensor_logs"].write_rows(
+                    [row + [lot_by_sensor[row[3]], row[1].date()] for row in day_sensor_logs])
+                log_dataset_writers["employee_parking_history"].write_rows(
+                    [row + [row[2].date()] for row in day_history])
+            log_counts["sensor_logs"] += len(day_sensor_logs)
+            log_counts["employee_parking_history"] += len(day_history)
+
+        for sink in list(log_csv_sinks.values()) + list(log_dataset_writers.values()):
+            sink.close()
+
+    print(f"[INFO] Spilled over to a nearest lot: {spilled_over} visits")
+    print(f"[INFO] Turned away (all candidate lots full): {turned_away} visits")
+    print(f"[INFO] Generated {log_counts['sensor_logs']} sensor_log rows")
+    print(f"[INFO] Generated {log_counts['employee_parking_history']} employee_parking_history rows")
+    if log_csv_sinks:
+        print(f"[INFO] Wrote log CSV files under {SEED_DIR}/")
+    if log_dataset_writers:
+        print(f"[INFO] Wrote {args.log_format} log datasets under {SEED_DIR}/")
+
+    if args.insert:
+        print("[INFO] Inserting log tables into CockroachDB...")
+        with stage(timings, "logs: insert"):
+            insert_tables(args, LOG_TABLES, log_counts)
+        print("[INFO] Log table insert complete ✅")
+
+    return [
+        ["Total sensor_logs", log_counts['sensor_logs']],
+        ["Total employee_parking_history", log_counts['employee_parking_history']],
+    ]
+
+
+# The old interactive flow: which tables, which dates, CSV only or CSV + insert
+def prompt_for_command(args):
+    if args.headless:
+        print("[INFO] Running in headless mode: Seeding base tables, generating CSV + inserting into DB")
+        args.insert = True
+        return "base"
+
+    print("What do you want to seed?")
+    print("1. Base tables")
+    print("2. Log tables")
+    print("3. Both (base tables, then log tables built from them)")
+    command = {"1": "base", "2": "logs", "3": "all"}.get(input("Enter 1, 2 or 3: ").strip(), "base")
+    if command != "base":
+        # Ask for date range
+        args.start_date = input("Enter START date (YYYY-MM-DD): ").strip()
+        args.end_date = input("Enter END date (YYYY-MM-DD): ").strip()
+
+    # Ask CSV or insert
     print("Do you want to:")
     print("1. Generate CSV files")
     print("2. Insert directly into CockroachDB (will also generate CSV files)")
-    choice = input("Enter 1 or 2: ").strip()
-
-print("[INFO] Initializing constants and structures...")
-OFFICE_ID = str(uuid.uuid4())
-OFFICE_DATA = {
-    "office_id": "1",
-    "name": "Polaris McCoy Center",
-    "address": "1111 Polaris Parkway, Columbus, OH 43240",
-    "status": "OPEN",
-    "status_description": "Open and Operational"
-}
-
-print("[INFO] Creating office rows...")
-office_rows = [[
-    OFFICE_ID, OFFICE_DATA["office_id"], OFFICE_DATA["name"], OFFICE_DATA["address"],
-    OFFICE_DATA["status"], OFFICE_DATA["status_description"],
-    now, now, 'system', 'system'
-]]
-
-BLOCKS = [
-    ("A", "M", "N"), ("B", "B", "Q"), ("C", "M", "N"), ("D", "B", "C"),
-    ("E", "L", "M"), ("F", "C", "B"), ("G", "L", "M"), ("H", "D", "C"),
-    ("J", "K", "L"), ("K", "D", "C"), ("L", "K", "L"), ("M", "E", "D"),
-    ("N", "J", "K"), ("P", "E", "F")
-]
-
-LOTS = [
-    ("A", "NE"), ("B", "NE"), ("C", "E"), ("D", "E"),
-    ("E", "SE"), ("F", "S"), ("G", "S"), ("H", "S"),
-    ("J", "SW"), ("K", "W"), ("L", "W"), ("M", "NW"),
-    ("N", "NW"), ("Q", "N"), ("X", "SW")
-]
-
-EMPLOYEE_COUNT = 12500
-SPOT_COUNT = 11000
-ADA_PCT = 0.03
-EV_PCT = 0.02
-REGULAR_PCT = 0.95
-
-block_id_map = {}
-lot_id_map = {}
-
-print("[INFO] Creating lot rows with balanced random total spots...")
-# Generate random weights for each lot
-lot_weights = [random.uniform(0.5, 1.5) for _ in LOTS]
-weight_sum = sum(lot_weights)
-
-# Pre-calculate lot -> spot counts
-lot_spot_counts = {}
-for i, (lot_info, weight) in enumerate(zip(LOTS, lot_weights)):
-    raw_count = SPOT_COUNT * (weight / weight_sum)
-    count = int(round(raw_count))
-    lot_spot_counts[lot_info[0]] = count
-
-# Adjust rounding errors
-total_assigned = sum(lot_spot_counts.values())
-diff = SPOT_COUNT - total_assigned
-if diff != 0:
-    largest_lot = max(lot_spot_counts, key=lot_spot_counts.get)
-    lot_spot_counts[largest_lot] += diff
-
-# Now generate lot_rows
-lot_rows = []
-for name, location in LOTS:
-    lot_id = str(uuid.uuid4())
-    lot_id_map[name] = lot_id
-    total = lot_spot_counts[name]
-
-    lot_rows.append([
-        lot_id, name, OFFICE_ID, f"Lot {name}", location, "ACTIVE", f"Lot {name} in use",
-        total,
-        int(total * REGULAR_PCT), int(total * ADA_PCT), int(total * EV_PCT),
-        int(total * REGULAR_PCT), int(total * REGULAR_PCT), int(total * ADA_PCT), int(total * EV_PCT),
-        now, now, 'system', 'system'
-    ])
-
-# Print per-lot stats
-print("[INFO] Creating block rows...")
-block_rows = []
-for block_name, lot1, lot2 in BLOCKS:
-    block_id = str(uuid.uuid4())
-    block_id_map[block_name] = block_id
-    preferred_lots = f"{lot_id_map[lot1]},{lot_id_map[lot2]}"
-    block_rows.append([
-        block_id, block_name, OFFICE_ID, 'ACTIVE', f"Block {block_name} is active",
-        random.randint(500, 1200), preferred_lots,
-        now, now, 'system', 'system'
-    ])
-
-# Print per-lot stats
-print("[STATS] Per-lot spot counts:")
-for name in sorted(lot_spot_counts.keys()):
-    pct = lot_spot_counts[name] / SPOT_COUNT * 100
-    print(f"  Lot {name}: {lot_spot_counts[name]} spots ({pct:.2f}%)")
-print(f"  Total assigned: {sum(lot_spot_counts.values())} spots (target: {SPOT_COUNT})")
-
-print("[INFO] Creating spot and sensor rows...")
-spot_rows = []
-sensor_rows = []
-spot_counter = 0
-for lot_name, lot_id in lot_id_map.items():
-    lot_total = next((int(row[7]) for row in lot_rows if row[0] == lot_id), 0)
-    print(f"[INFO] Generating {lot_total} spots for lot {lot_name}")
-    type_counter = {'REGULAR': 0, 'ADA': 0, 'EV': 0}
-    for i in tqdm(range(lot_total), desc=f"Processing lot {lot_name}"):
-        spot_id = str(uuid.uuid4())
-        sensor_id = str(uuid.uuid4())
-        row_num = i // 10
-        pos = i % 10
-        spot_type = random.choices(['REGULAR', 'ADA', 'EV'], weights=[95, 3, 2])[0]
-        type_counter[spot_type] += 1
-        spot_rows.append([
-            spot_id, f"{lot_name}-{i + 1}", lot_id, sensor_id, "AVAILABLE", "", spot_type, row_num, pos,
-            now, now, 'system', 'system'
-        ])
-        sensor_rows.append([
-            sensor_id, f"SENSOR-{sensor_id[:8]}", spot_id, "ACTIVE", "", "ULTRASONIC",
-            now, now, 'system', 'system'
-        ])
-        spot_counter += 1
-        if spot_counter >= SPOT_COUNT:
-            break
-    print(f"[SUMMARY] Lot {lot_name}:")
-    for t in ['REGULAR', 'ADA', 'EV']:
-        print(f"  {t}: {type_counter[t]} spots")
+    args.insert = input("Enter 1 or 2: ").strip() == "2"
+    return command
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the park_smart base tables and/or log tables")
+    parser.add_argument("command", nargs="?", choices=["base", "logs", "all"],
+                        help="base tables, log tables from the existing seed files, or both in one pass "
+                             "(default: ask interactively)")
+    parser.add_argument("--headless", action="store_true", help="Run script without interactive prompts")
+    parser.add_argument("--insert", action="store_true", help="Also insert the generated tables into CockroachDB")
+    parser.add_argument("--employees", type=int, default=EMPLOYEE_COUNT, help="Employees to generate")
+    parser.add_argument("--spots", type=int, default=SPOT_COUNT, help="Spots (and sensors) to generate")
+    parser.add_argument("--start-date", default=DEFAULT_LOG_START, help="First day of log data (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=DEFAULT_LOG_DAYS, help="Days of log data from --start-date")
+    parser.add_argument("--end-date", help="Last day of log data (YYYY-MM-DD, overrides --days)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per committed chunk when inserting")
+    parser.add_argument("--load-method", choices=["copy", "values"], default="copy",
+                        help="COPY FROM STDIN or multi-row INSERT ... VALUES")
+    parser.add_argument("--log-format", choices=["csv", "parquet", "arrow"], default="csv",
+                        help="Write generated logs as CSV or as Parquet / Arrow IPC datasets partitioned by event_date and lot_id")
+    parser.add_argument("--traffic-model", help="Arrival / departure curves from traffic_model.py (default: built-in 8:45 peak)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible runs (byte-identical seed and log files)")
+    parser.add_argument("--workers", type=int, help="Processes generating spots and employees (default: all cores)")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    print("[START] Script started at", datetime.now())
+    command = args.command or prompt_for_command(args)
+    generator = BaseGenerator(seed=args.seed, workers=args.workers)
+
+    # Create seed_files folder if it doesn't exist
+    os.makedirs(SEED_DIR, exist_ok=True)
+
+    timings = {}
+    summary_rows = []
+    inputs = None
+    if command in ("base", "all"):
+        inputs = LogInputs() if command == "all" else None
+        summary_rows += seed_base(args, generator, timings, inputs)
+
+    if command in ("logs", "all"):
+        print("[INFO] Seeding log tables...")
+        start_dt = datetime.strptime(args.start_date, "%Y-%m-%d").date()
+        end_dt = (datetime.strptime(args.end_date, "%Y-%m-%d").date() if args.end_date
+                  else start_dt + timedelta(days=args.days - 1))
+        if inputs is None:
+            print("[INFO] Loading base table seed files...")
+            with stage(timings, "logs: load seed files"):
+                inputs = LogInputs.from_seed_files(SEED_DIR)
+        summary_rows += seed_logs(args, inputs, generator.now, generator.seed, start_dt, end_dt, timings)
+
+    end_time = time.time()
+    print("[END] Script completed at", datetime.now())
+    print(f"[INFO] Total elapsed time: {end_time - start_time:.2f} seconds")
+    print("[SUMMARY] Grand totals:")
+    for metric, value in summary_rows:
+        print(f"  {metric}: {value}")
+    print("[SUMMARY] Per-stage timings:")
+    for name, seconds in timings.items():
+        print(f"  {name}: {seconds:.2f}s")
     print()
-    if spot_counter >= SPOT_COUNT:
-        break
-
-print("[INFO] Creating employee rows...")
-employee_rows = []
-
-num_admins = 50
-num_employees = int(EMPLOYEE_COUNT * 0.85)
-num_contractors = EMPLOYEE_COUNT - num_admins - num_employees
-
-# Build type pool
-type_pool = (['ADMIN'] * num_admins) + (['EMPLOYEE'] * num_employees) + (['CONTRACTOR'] * num_contractors)
-random.shuffle(type_pool)
-
-for i in tqdm(range(EMPLOYEE_COUNT), desc="Generating employees"):
-    emp_id = random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') + ''.join(random.choices('0123456789', k=6))
-    emp_name = fake.name()
-    block_id = random.choice(list(block_id_map.values()))
-    lot_ids = random.sample(list(lot_id_map.values()), k=random.randint(0, 3))
-    emp_type = type_pool[i]
-    employee_rows.append([
-        str(uuid.uuid4()), emp_id, emp_name, OFFICE_ID, block_id, "ACTIVE",
-        fake.date_between(start_date='-5y', end_date='-1y'),
-        datetime(9999, 12, 31).date(),
-        emp_type, random.choice(list(lot_id_map.values())),
-        ','.join(lot_ids), f"TAG-{emp_id}",
-        'admin' if emp_type == 'ADMIN' else 'pass123', now, now, 'system', 'system'
-    ])
-
-print("\n[STATS] Employee type counts:")
-emp_type_counter = Counter([row[8] for row in employee_rows])
-for t in ['EMPLOYEE', 'CONTRACTOR', 'ADMIN']:
-    print(f"  {t}: {emp_type_counter[t]}")
-print(f"  Total employees: {len(employee_rows)} (target: {EMPLOYEE_COUNT})\n")
-
-print("[INFO] Writing CSV files...")
-
-# The actual header lists would be filled in here
-write_csv("office_seed.csv", office_rows, [
-    "id","office_id","name","address","status","status_description","created_at","created_by","updated_at","updated_by"
-])
-write_csv("block_seed.csv", block_rows, [
-    "id","block_id","name","office_id","status","status_description","total_workstations","nearest_lots","created_at","created_by","updated_at","updated_by"
-])
-write_csv("lot_seed.csv", lot_rows, [
-    "id","lot_id","office_id","name","location","status","status_description","total_spots","total_regular_spots","total_ada_spots","total_ev_spots","available_spots","available_regular_spots","available_ada_spots","available_ev_spots","created_at","created_by","updated_at","updated_by"
-])
-write_csv("spot_seed.csv", spot_rows, [
-    "id","spot_id","lot_id","sensor_id","status","status_description","type","row_number","position_number","created_at","created_by","updated_at","updated_by"
-])
-write_csv("sensor_seed.csv", sensor_rows, [
-    "id","sensor_id","spot_id","status","status_description","type","created_at","created_by","updated_at","updated_by"
-])
-write_csv("employee_seed.csv", employee_rows, [
-    "id","employee_id","name","office_id","block_id","status","start_date","end_date","type","last_parked_lot","preferred_lots","parking_tag","password","created_at","created_by","updated_at","updated_by"
-])
-
-if choice == "2":
-    print("[INFO] Inserting into CockroachDB...")
-    conn = get_connection(headless=args.headless)
-
-
-    def insert_to_db(table, rows):
-        with conn.cursor() as cur:
-            for row in tqdm(rows, desc=f"Inserting {table}"):
-                q = f"INSERT INTO park_smart.{table} VALUES ({','.join(['%s'] * len(row))})"
-                cur.execute(q, row)
-            conn.commit()
-
-
-    insert_to_db("office", office_rows)
-    insert_to_db("block", block_rows)
-    insert_to_db("lot", lot_rows)
-    insert_to_db("spot", spot_rows)
-    insert_to_db("sensor", sensor_rows)
-    insert_to_db("employee", employee_rows)
-    conn.close()
-    print("[INFO] Insert complete ✅")
-
-end_time = time.time()
-print("[END] Script completed at", datetime.now())
-print(f"[INFO] Total elapsed time: {end_time - start_time:.2f} seconds")
-print(f"[SUMMARY] Grand totals:")
-print(f"  Total lots: {len(lot_rows)}")
-print(f"  Total spots: {len(spot_rows)}")
-print(f"  Total sensors: {len(sensor_rows)}")
-print(f"  Total employees: {len(employee_rows)}")
-print()
-
-# Save summary to CSV
-summary_filename = os.path.join(seed_dir, "summary_report.csv")
-with open(summary_filename, 'w', newline='') as f:
-    writer = csv.writer(f)
-    writer.writerow(["Metric", "Value"])
-    writer.writerow(["Total lots", len(lot_rows)])
-    writer.writerow(["Total spots", len(spot_rows)])
-    writer.writerow(["Total sensors", len(sensor_rows)])
-    writer.writerow(["Total employees", len(employee_rows)])
-    writer.writerow(["EMPLOYEE count", emp_type_counter['EMPLOYEE']])
-    writer.writerow(["CONTRACTOR count", emp_type_counter['CONTRACTOR']])
-    writer.writerow(["ADMIN count", emp_type_counter['ADMIN']])
-    writer.writerow(["Elapsed time (seconds)", round(end_time - start_time, 2)])
-
-print(f"[INFO] Summary saved to {summary_filename}")
+
+    # Save summary to CSV
+    summary_filename = os.path.join(SEED_DIR, "summary_report.csv")
+    with open(summary_filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Metric", "Value"])
+        writer.writerows(summary_rows)
+        for name, seconds in timings.items():
+            writer.writerow([f"Stage {name} (seconds)", round(seconds, 2)])
+        writer.writerow(["Elapsed time (seconds)", round(end_time - start_time, 2)])
+
+    print(f"[INFO] Summary saved to {summary_filename}")
@@ -0,0 +1,260 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import time
+from itertools import islice
+
+import psycopg2
+from psycopg2.extras import execute_values
+from tqdm import tqdm
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_CHECKPOINT = os.path.join("seed_files", "load_checkpoint.json")
+
+# Seed file behind each table, in foreign-key order
+SEED_FILES = {
+    "office": "office_seed.csv",
+    "block": "block_seed.csv",
+    "lot": "lot_seed.csv",
+    "spot": "spot_seed.csv",
+    "sensor": "sensor_seed.csv",
+    "employee": "employee_seed.csv",
+    "sensor_logs": "sensor_log_seed.csv",
+    "employee_parking_history": "employee_parking_history_seed.csv",
+}
+
+# Column headers of every seed file, matching the rows the seeders write
+SEED_HEADERS = {
+    "office": ["id", "office_id", "name", "address", "status", "status_description",
+               "created_at", "created_by", "updated_at", "updated_by"],
+    "block": ["id", "block_id", "name", "office_id", "status", "status_description", "total_workstations",
+              "nearest_lots", "created_at", "created_by", "updated_at", "updated_by"],
+    "lot": ["id", "lot_id", "office_id", "name", "location", "status", "status_description", "total_spots",
+            "total_regular_spots", "total_ada_spots", "total_ev_spots", "available_spots", "available_regular_spots",
+            "available_ada_spots", "available_ev_spots", "created_at", "created_by", "updated_at", "updated_by"],
+    "spot": ["id", "spot_id", "lot_id", "sensor_id", "status", "status_description", "type", "row_number",
+             "position_number", "created_at", "created_by", "updated_at", "updated_by"],
+    "sensor": ["id", "sensor_id", "spot_id", "status", "status_description", "type",
+               "created_at", "created_by", "updated_at", "updated_by"],
+    "employee": ["id", "employee_id", "name", "office_id", "block_id", "status", "start_date", "end_date", "type",
+                 "last_parked_lot", "preferred_lots", "parking_tag", "password",
+                 "created_at", "created_by", "updated_at", "updated_by"],
+    "sensor_logs": ["id", "event_timestamp", "event_type", "sensor_id", "parking_tag",
+                    "created_at", "created_by", "updated_at", "updated_by"],
+    "employee_parking_history": ["id", "employee_id", "event_timestamp", "event_type", "lot_id",
+                                 "created_at", "created_by", "updated_at", "updated_by"],
+}
+
+
+def iter_csv_rows(path):
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # skip header
+        yield from reader
+
+
+# Identifies one version of a seed file, so a checkpoint never resumes into a regenerated file
+def source_key(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Streams rows into a table in chunks, committing after each chunk and recording
+# the committed row count per table (and the seed file it came from) in a checkpoint file.
+# Re-running a load of the same file skips what was already committed, so a dropped
+# connection only costs the chunk that was in flight; a regenerated file starts over.
+# Rows are written to the table's seed columns by name (SEED_HEADERS).
+class BulkLoader:
+    def __init__(self, conn, schema="park_smart", batch_size=DEFAULT_BATCH_SIZE, method="copy",
+                 checkpoint_path=DEFAULT_CHECKPOINT, connect=None, max_retries=3, columns=SEED_HEADERS):
+        if method not in ("copy", "values"):
+            raise ValueError(f"Unknown load method: {method}")
+        self.conn = conn
+        self.schema = schema
+        self.batch_size = batch_size
+        self.method = method
+        self.checkpoint_path = checkpoint_path
+        self.connect = connect
+        self.max_retries = max_retries
+        self.columns = columns or {}
+        self.checkpoint = self._read_checkpoint()
+
+    def _read_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def reset(self, table=None):
+        if table is None:
+            self.checkpoint = {}
+        else:
+            self.checkpoint.pop(table, None)
+        self._save_checkpoint()
+
+    def _qualified(self, table):
+        qualified = f"{self.schema}.{table}" if self.schema else table
+        if table in self.columns:
+            qualified += f" ({', '.join(self.columns[table])})"
+        return qualified
+
+    # Committed rows to skip; a checkpoint taken from a different version of the source starts over
+    def _resume_point(self, table, source):
+        entry = self.checkpoint.get(table)
+        if entry is None:
+            return 0
+        if isinstance(entry, int):
+            entry = {"rows": entry, "source": None}  # checkpoints written before sources were recorded
+        if source is not None and entry["source"] != source:
+            print(f"[WARN] {table}: the seed file changed since the checkpoint, loading from the first row")
+            self.reset(table)
+            return 0
+        return entry["rows"]
+
+    def _cursor(self):
+        if isinstance(self.conn, sqlite3.Connection):
+            return _SqliteCursor(self.conn)
+        return self.conn.cursor()
+
+    def _write_chunk(self, table, chunk):
+        qualified = self._qualified(table)
+        with self._cursor() as cur:
+            if isinstance(self.conn, sqlite3.Connection):
+                cur.executemany(f"INSERT INTO {qualified} VALUES ({','.join(['?'] * len(chunk[0]))})", chunk)
+            elif self.method == "copy":
+                buf = io.StringIO()
+                csv.writer(buf).writerows(chunk)
+                buf.seek(0)
+                cur.copy_expert(f"COPY {qualified} FROM STDIN WITH CSV", buf)
+            else:
+                execute_values(cur, f"INSERT INTO {qualified} VALUES %s", chunk, page_size=len(chunk))
+        self.conn.commit()
+
+    def _reconnect(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+        self.conn = self.connect()
+
+    def load(self, table, rows, total=None, source=None):
+        done = self._resume_point(table, source)
+        rows = iter(rows)
+        if done:
+            print(f"[INFO] Resuming {table} after {done} committed rows")
+            next(islice(rows, done, done), None)
+
+        start = time.time()
+        loaded = 0
+        with tqdm(total=total, initial=done, desc=f"Loading {table}") as progress:
+            for chunk in chunked(rows, self.batch_size):
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        self._write_chunk(table, chunk)
+                        break
+                    except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                        if self.connect is None or attempt == self.max_retries:
+                            raise
+                        print(f"[WARN] {table}: connection lost ({e}), reconnecting (attempt {attempt + 1})")
+                        self._reconnect()
+                done += len(chunk)
+                loaded += len(chunk)
+                self.checkpoint[table] = {"rows": done, "source": source}
+                self._save_checkpoint()
+                progress.update(len(chunk))
+
+        elapsed = time.time() - start
+        print(f"[INFO] {table}: loaded {loaded} rows in {elapsed:.2f}s ({done} total committed)")
+        return loaded
+
+    def load_csv(self, table, path, total=None):
+        return self.load(table, iter_csv_rows(path), total=total, source=source_key(path))
+
+
+# sqlite3 cursors are not context managers; mirror psycopg2's `with conn.cursor()`
+class _SqliteCursor:
+    def __init__(self, conn):
+        self.cur = conn.cursor()
+
+    def __enter__(self):
+        return self.cur
+
+    def __exit__(self, *exc):
+        self.cur.close()
+
+
+def read_db_credentials(path, headless=False):
+    try:
+        with open(path, 'r') as f:
+            lines = f.readlines()
+            user = lines[0].split(':')[1].strip()
+            password = lines[1].split(':')[1].strip()
+            return user, password
+    except FileNotFoundError:
+        if headless:
+            raise RuntimeError("[ERROR] Missing secrets/pwd.txt in headless mode")
+        print("Password file not found. Please enter manually.")
+        user = input("Enter DB user: ")
+        password = input("Enter DB password: ")
+        return user, password
+
+
+def get_connection(headless=False):
+    user, password = read_db_credentials("secrets/pwd.txt", headless=headless)
+    return psycopg2.connect(
+        dbname="social_elves",
+        user=user,
+        password=password,
+        host="social-elves-11376.j77.aws-us-west-2.cockroachlabs.cloud",
+        port=26257,
+        sslmode="require"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load seed CSV files, resuming from the last checkpoint")
+    parser.add_argument("tables", nargs="*", default=list(SEED_FILES), help="Tables to load (default: all, in FK order)")
+    parser.add_argument("--seed-dir", default="seed_files")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--method", choices=["copy", "values"], default="copy")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and load from the first row")
+    parser.add_argument("--sqlite", help="Load into a local SQLite file instead of CockroachDB")
+    parser.add_argument("--headless", action="store_true", help="Run script without interactive prompts")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        connect = lambda: sqlite3.connect(args.sqlite)
+        schema = None
+    else:
+        connect = lambda: get_connection(headless=args.headless)
+        schema = "park_smart"
+
+    loader = BulkLoader(connect(), schema=schema, batch_size=args.batch_size, method=args.method,
+                        checkpoint_path=args.checkpoint, connect=connect)
+    if args.restart:
+        loader.reset()
+    for table in args.tables:
+        loader.load_csv(table, os.path.join(args.seed_dir, SEED_FILES[table]))
+    loader.conn.close()
+    print("[INFO] Bulk load complete ✅")
@@ -0,0 +1,223 @@
+import json
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+LOT_COLUMNS = ['lot_id', 'name', 'available_spots', 'available_regular_spots', 'available_ev_spots',
+               'available_ada_spots']
+LOG_COLUMNS = ['id', 'sensor_id', 'event_type', 'event_timestamp']
+
+
+# Shared live state for the dashboard, fed by incremental changes.
+# Every refresh that changes something bumps `version` and records which lot cells
+# changed, so a session only highlights what moved since the version it last drew.
+class ChangeFeed(ABC):
+    def __init__(self, interval=3, log_limit=10, history=200):
+        self.interval = interval
+        self.log_limit = log_limit
+        self.lock = threading.Lock()
+        self.last_refresh = 0.0
+        self.version = 0
+        self.changes = deque(maxlen=history)  # (version, changed-cell mask of the lots that changed)
+        self.lots = pd.DataFrame(columns=LOT_COLUMNS).set_index('lot_id')
+        self.logs = pd.DataFrame(columns=LOG_COLUMNS)
+
+    # (lot rows that may have changed, new log rows)
+    @abstractmethod
+    def fetch(self):
+        ...
+
+    def refresh(self):
+        with self.lock:
+            if time.monotonic() - self.last_refresh < self.interval:
+                return
+            self.last_refresh = time.monotonic()
+            lot_rows, new_logs = self.fetch()
+            changed = self._apply_lots(lot_rows)
+            if not new_logs.empty:
+                self.logs = pd.concat([new_logs[LOG_COLUMNS], self.logs]).head(self.log_limit)
+            if changed is not None or not new_logs.empty:
+                self.version += 1
+                if changed is not None:
+                    self.changes.append((self.version, changed))
+
+    def _apply_lots(self, lot_rows):
+        if lot_rows.empty:
+            return None
+        lot_rows = lot_rows.set_index('lot_id')[self.lots.columns]
+        lot_rows = lot_rows[~lot_rows.index.duplicated(keep='last')]
+
+        # Compare only the incoming rows against their previous values
+        known = lot_rows.index.intersection(self.lots.index)
+        mask = pd.DataFrame(True, index=lot_rows.index, columns=lot_rows.columns)
+        mask.loc[known] = (lot_rows.loc[known] != self.lots.loc[known]).to_numpy()
+        mask = mask[mask.any(axis=1)]
+        if mask.empty:
+            return None
+
+        new_ids = lot_rows.index.difference(self.lots.index)
+        self.lots.loc[known] = lot_rows.loc[known]
+        if len(new_ids):
+            self.lots = pd.concat([self.lots, lot_rows.loc[new_ids]]).sort_index()
+        return mask
+
+    # Current state plus the cells changed after `since_version` (None = first draw)
+    def snapshot(self, since_version=None):
+        with self.lock:
+            lots = self.lots.copy()
+            logs = self.logs.copy()
+            version = self.version
+            masks = [mask for v, mask in self.changes if since_version is not None and v > since_version]
+        changed = pd.concat(masks).groupby(level=0).any() if masks else None
+        return lots, logs, changed, version
+
+
+# Local fallback: re-read the (small) lots table and page through new sensor logs
+# with a (event_timestamp, id) cursor, so each poll only transfers new log rows
+class PollingChangeFeed(ChangeFeed):
+    def __init__(self, get_connection, **kwargs):
+        super().__init__(**kwargs)
+        self.get_connection = get_connection
+        self.log_cursor = None
+
+    def fetch(self):
+        with self.get_connection() as conn:
+            lot_rows = pd.read_sql(f"SELECT {', '.join(LOT_COLUMNS)} FROM parksmart.lots", conn)
+            if self.log_cursor is None:
+                new_logs = pd.read_sql(f"""
+                    SELECT {', '.join(LOG_COLUMNS)}
+                    FROM parksmart.sensorlogs
+                    ORDER BY event_timestamp DESC, id DESC
+                    LIMIT %s
+                """, conn, params=(self.log_limit,))
+            else:
+                new_logs = pd.read_sql(f"""
+                    SELECT {', '.join(LOG_COLUMNS)}
+                    FROM parksmart.sensorlogs
+                    WHERE (event_timestamp, id) > (%s, %s)
+                    ORDER BY event_timestamp DESC, id DESC
+                    LIMIT %s
+                """, conn, params=(*self.log_cursor, self.log_limit))
+        if not new_logs.empty:
+            self.log_cursor = (new_logs['event_timestamp'].iloc[0], new_logs['id'].iloc[0])
+        return lot_rows, new_logs
+
+
+# CockroachDB core changefeeds streamed over COPY ... TO STDOUT on dedicated connections.
+# The lots feed starts with an initial scan (the current state); the sensor log feed
+# only carries rows written after it starts. If a stream fails (e.g. kv.rangefeed.enabled
+# is off) the feed keeps going by polling, continuing from the newest log row it has seen.
+class CockroachChangeFeed(PollingChangeFeed):
+    STATEMENTS = {
+        'lots': "COPY (EXPERIMENTAL CHANGEFEED FOR TABLE parksmart.lots) TO STDOUT",
+        'sensorlogs': "COPY (EXPERIMENTAL CHANGEFEED FOR TABLE parksmart.sensorlogs WITH initial_scan = 'no') TO STDOUT",
+    }
+
+    def __init__(self, connect, get_connection, **kwargs):
+        super().__init__(get_connection, **kwargs)
+        self.connect = connect
+        self.rows = queue.Queue()
+        self.errors = []
+        self.seeded = False
+        self.polling = False
+        for table, statement in self.STATEMENTS.items():
+            threading.Thread(target=self._stream, args=(statement,), name=f"changefeed-{table}", daemon=True).start()
+
+    def _stream(self, statement):
+        try:
+            conn = self.connect()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.copy_expert(statement, _ChangefeedSink(self.rows))
+        except Exception as e:
+            self.errors.append(e)
+
+    def fetch(self):
+        if self.errors and not self.polling:
+            print(f"[WARN] Changefeed stopped ({self.errors[0]}), falling back to polling")
+            self.polling = True
+        if self.polling:
+            return super().fetch()
+        if not self.seeded:
+            # Recent history comes from one query; everything after it from the feed
+            self.seeded = True
+            _, new_logs = super().fetch()
+        else:
+            new_logs = pd.DataFrame(columns=LOG_COLUMNS)
+
+        lot_rows, log_rows = [], []
+        while True:
+            try:
+                table, after = self.rows.get_nowait()
+            except queue.Empty:
+                break
+            (lot_rows if table == 'lots' else log_rows).append(after)
+
+        lots = pd.DataFrame(lot_rows, columns=LOT_COLUMNS)
+        if log_rows:
+            logs = pd.DataFrame(log_rows, columns=LOG_COLUMNS)
+            logs['event_timestamp'] = pd.to_datetime(logs['event_timestamp'])
+            new_logs = pd.concat([logs.sort_values(['event_timestamp', 'id'], ascending=False), new_logs])
+            self.log_cursor = (new_logs['event_timestamp'].iloc[0], new_logs['id'].iloc[0])
+        return lots, new_logs
+
+
+# File-like target for copy_expert: each line is "table<TAB>key<TAB>value" with a JSON envelope
+class _ChangefeedSink:
+    def __init__(self, rows):
+        self.rows = rows
+        self.buffer = ""
+
+    def write(self, data):
+        self.buffer += data.decode() if isinstance(data, bytes) else data
+        *lines, self.buffer = self.buffer.split("\n")
+        for line in lines:
+            table, _, value = line.split("\t", 2)
+            if value == "\\N":
+                continue  # resolved timestamp rows carry no value
+            after = json.loads(value.replace("\\\\", "\\")).get('after')
+            if after is not None:
+                self.rows.put((table, after))
+
+
+# Core changefeeds need rangefeeds; reading the setting needs VIEWCLUSTERSETTING, so assume
+# they are on when it cannot be read and let CockroachChangeFeed fall back if they are not
+def rangefeeds_enabled(cur):
+    try:
+        cur.execute("SHOW CLUSTER SETTING kv.rangefeed.enabled")
+        return bool(cur.fetchone()[0])
+    except psycopg2.Error:
+        return True
+
+
+def open_change_feed(connect, get_connection, mode='auto', **kwargs):
+    if mode == 'auto':
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT version()")
+                cockroach = 'CockroachDB' in cur.fetchone()[0]
+                mode = 'changefeed' if cockroach and rangefeeds_enabled(cur) else 'polling'
+    if mode == 'changefeed':
+        return CockroachChangeFeed(connect, get_connection, **kwargs)
+    return PollingChangeFeed(get_connection, **kwargs)
+
+
+HIGHLIGHT = "background-color: yellow"
+
+
+# Styles for the lots table: only rows in `changed` are touched, so the cost
+# tracks the number of changed lots rather than the table size
+def highlight_changes(lots, changed):
+    styles = pd.DataFrame("", index=lots.index, columns=lots.columns)
+    if changed is None or changed.empty:
+        return styles
+    rows = changed.index.intersection(lots.index)
+    cols = changed.columns.intersection(lots.columns)
+    styles.loc[rows, cols] = np.where(changed.loc[rows, cols].to_numpy(), HIGHLIGHT, "")
+    return styles
@@ -0,0 +1,178 @@
+import os
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+DEFAULT_PARTITIONS = ["event_date", "lot_id"]
+
+# Column types for the sensor log exports; anything not listed is inferred.
+# Repeated strings are dictionary-encoded so they load as pandas categoricals.
+CATEGORICAL = pa.dictionary(pa.int32(), pa.string())
+SENSOR_LOG_TYPES = {
+    "lot_id": pa.string(),
+    "name": CATEGORICAL,
+    "sensor_id": pa.string(),
+    "event_type": CATEGORICAL,
+    "event_timestamp": pa.timestamp("us"),
+    "event_date": pa.string(),
+    "weekday": pa.int8(),
+    "hour": pa.int8(),
+    "minute": pa.int8(),
+}
+
+SEED_LOG_TYPES = {
+    "id": pa.string(),
+    "employee_id": pa.string(),
+    "sensor_id": pa.string(),
+    "lot_id": pa.string(),
+    "event_type": CATEGORICAL,
+    "event_timestamp": pa.timestamp("us"),
+    "event_date": pa.string(),
+    "parking_tag": pa.string(),
+    "created_at": pa.timestamp("us"),
+    "created_by": CATEGORICAL,
+    "updated_at": pa.timestamp("us"),
+    "updated_by": CATEGORICAL,
+}
+
+
+# Writes rows to a hive-partitioned Parquet or Arrow IPC dataset in bounded chunks.
+# Every flush adds new files under <root>/event_date=.../lot_id=.... With append=True they
+# are added to the existing dataset (incremental exports); otherwise the run is written to
+# a staging directory that replaces the dataset on close, so a re-run does not duplicate rows
+# and a failed run leaves the previous dataset in place.
+# `constants` (name -> value) are columns with the same value in every row: rows leave them
+# out and each flush adds them as repeated arrays.
+class ColumnarWriter:
+    def __init__(self, root, columns, fmt="parquet", partition_cols=DEFAULT_PARTITIONS,
+                 types=SENSOR_LOG_TYPES, flush_rows=100_000, constants=None, append=False):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown columnar format: {fmt}")
+        self.root = root
+        self.columns = list(columns)
+        self.fmt = fmt
+        self.partition_cols = list(partition_cols)
+        self.types = types
+        self.flush_rows = flush_rows
+        self.constants = dict(constants or {})
+        self.buffer = []
+        self.run_id = uuid.uuid4().hex[:12]
+        self.append = append
+        self.target = root if append else f"{root.rstrip(os.sep)}.{self.run_id}.tmp"
+        self.flushes = 0
+        self.rows_written = 0
+        os.makedirs(self.target, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif not self.append:
+            shutil.rmtree(self.target, ignore_errors=True)
+
+    def write_rows(self, rows):
+        self.buffer.extend(rows)
+        if len(self.buffer) >= self.flush_rows:
+            self.flush()
+
+    def _table(self, rows):
+        arrays = []
+        for i, name in enumerate(self.columns):
+            values = [row[i] for row in rows]
+            arrow_type = self.types.get(name)
+            if arrow_type is None:
+                arrays.append(pa.array(values))
+            elif pa.types.is_dictionary(arrow_type):
+                arrays.append(pa.array(values, type=arrow_type.value_type).dictionary_encode())
+            elif pa.types.is_string(arrow_type):
+                arrays.append(pa.array([None if v is None else str(v) for v in values], type=arrow_type))
+            else:
+                arrays.append(pa.array(values, type=arrow_type))
+        for name, value in self.constants.items():
+            arrow_type = self.types.get(name)
+            if arrow_type is not None and pa.types.is_dictionary(arrow_type):
+                indices = pa.repeat(pa.scalar(0, type=arrow_type.index_type), len(rows))
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array([value], type=arrow_type.value_type)))
+            else:
+                arrays.append(pa.repeat(pa.scalar(value, type=arrow_type), len(rows)))
+        return pa.Table.from_arrays(arrays, names=self.columns + list(self.constants))
+
+    def flush(self):
+        if not self.buffer:
+            return
+        table = self._table(self.buffer)
+        ds.write_dataset(
+            table, self.target, format=FORMATS[self.fmt],
+            partitioning=self.partition_cols, partitioning_flavor="hive",
+            basename_template=f"part-{self.run_id}-{self.flushes}-{{i}}.{EXTENSIONS[self.fmt]}",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        self.rows_written += len(self.buffer)
+        self.flushes += 1
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if not self.append and self.target != self.root:
+            if os.path.isdir(self.root):
+                shutil.rmtree(self.root)
+            os.replace(self.target, self.root)
+            self.target = self.root
+
+
+def dataset_format(path):
+    for fmt, ext in EXTENSIONS.items():
+        for _, _, files in os.walk(path):
+            if any(name.endswith("." + ext) for name in files):
+                return fmt
+    return "parquet"
+
+
+# Read sensor logs from a CSV export or a partitioned dataset. For datasets only the
+# requested columns are read and partitions outside the date range / lot list are skipped.
+def read_sensor_logs(path, columns=None, start_date=None, end_date=None, lot_ids=None):
+    # Requested columns a source does not have (e.g. lot name in seed logs) are skipped
+    if not os.path.isdir(path):
+        usecols = None if columns is None else (lambda name: name in columns)
+        df = pd.read_csv(path, parse_dates=["event_timestamp"], usecols=usecols)
+        if start_date is not None:
+            df = df[df["event_timestamp"] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df["event_timestamp"] < pd.Timestamp(end_date) + pd.Timedelta(days=1)]
+        if lot_ids is not None and "lot_id" in df.columns:
+            df = df[df["lot_id"].astype(str).isin([str(lot_id) for lot_id in lot_ids])]
+        return df
+
+    partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+    dataset = ds.dataset(path, format=FORMATS[dataset_format(path)], partitioning=partitioning)
+
+    # Partition values are discovered as dictionary-encoded strings; ISO dates compare correctly as text
+    conditions = []
+    if start_date is not None:
+        conditions.append(ds.field("event_date").cast(pa.string()) >= str(start_date))
+    if end_date is not None:
+        conditions.append(ds.field("event_date").cast(pa.string()) <= str(end_date))
+    if lot_ids is not None:
+        conditions.append(ds.field("lot_id").cast(pa.string()).isin([str(lot_id) for lot_id in lot_ids]))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    if columns is not None:
+        columns = [name for name in columns if name in dataset.schema.names]
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    # Numeric partition values (e.g. integer lot ids) keep their numeric type as categories
+    for name in DEFAULT_PARTITIONS:
+        if name in df.columns and isinstance(df[name].dtype, pd.CategoricalDtype):
+            categories = df[name].cat.categories
+            if len(categories) and all(str(c).lstrip("-").isdigit() for c in categories):
+                df[name] = df[name].cat.rename_categories([int(c) for c in categories])
+    return df
@@ -1,12 +1,20 @@
+import argparse
+import heapq
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+import numpy as np
 import psycopg2
+from psycopg2.extras import execute_values
 import uuid
 import random
 import time
 from datetime import datetime, timedelta
 
+from traffic_model import TrafficModel, load_traffic_model
+
 # Vehicle types
 VEHICLE_TYPES = ['regular', 'ev', 'ada']
-EVENT_TYPES = ['entry', 'exit']
 
 # Read DB credentials
 def read_db_credentials(path):
@@ -23,8 +31,8 @@ def read_db_credentials(path):
         return user, password
 
 # Connect to DB
-def get_connection():
-    user, password = read_db_credentials("secrets/pwd.txt")
+def get_connection(credentials=None):
+    user, password = credentials or read_db_credentials("secrets/pwd.txt")
     return psycopg2.connect(
         dbname="defaultdb",
         user=user,
@@ -37,7 +45,11 @@ def get_connection():
 # Load lots and sensors
 def load_lots_and_sensors(conn):
     with conn.cursor() as cur:
-        cur.execute("SELECT lot_id, total_regular_spots, total_ev_spots, total_ada_spots FROM parksmart.lots;")
+        cur.execute("""
+            SELECT lot_id, total_regular_spots, total_ev_spots, total_ada_spots,
+                   available_regular_spots, available_ev_spots, available_ada_spots
+            FROM parksmart.lots;
+        """)
         lots = cur.fetchall()
 
         cur.execute("SELECT sensor_id, lot_id FROM parksmart.sensors;")
@@ -47,34 +59,72 @@ def load_lots_and_sensors(conn):
     for sensor_id, lot_id in sensors:
         sensors_by_lot.setdefault(lot_id, []).append(sensor_id)
 
-    lot_dict = {lot_id: {'total_regular_spots': reg, 'total_ev_spots': ev, 'total_ada_spots': ada}
-                for lot_id, reg, ev, ada in lots}
+    lot_dict = {lot_id: {'total_regular_spots': reg, 'total_ev_spots': ev, 'total_ada_spots': ada,
+                         'available_regular_spots': avail_reg, 'available_ev_spots': avail_ev,
+                         'available_ada_spots': avail_ada}
+                for lot_id, reg, ev, ada, avail_reg, avail_ev, avail_ada in lots}
 
     return lot_dict, sensors_by_lot
 
-# Update lots availability
+# In-memory occupancy of one lot.
+# Sensors are grouped by (synthetic, position-based) vehicle type; each type keeps an array of free positions
+# (swap-remove, O(1) park/leave) and `occupied` holds one flag per sensor, so entries
+# only ever hit free sensors and exits only occupied ones.
+class LotState:
+    def __init__(self, lot_id, sensor_ids, info):
+        self.lot_id = lot_id
+        self.sensor_ids = list(sensor_ids)
+        self.occupied = bytearray(len(self.sensor_ids))
+        self.types = []
+        self.free = {vehicle_type: array('I') for vehicle_type in VEHICLE_TYPES}
+        self.totals = {}
+
+        # parksmart.sensors carries no spot type, so the types here are synthetic: the first
+        # total_ev_spots sensors (in load order) count as EV, the next total_ada_spots as ADA and
+        # the rest as regular. They only keep the per-type availability counts consistent and
+        # say nothing about the real spot behind a sensor.
+        ev_end = min(info['total_ev_spots'] or 0, len(self.sensor_ids))
+        ada_end = min(ev_end + (info['total_ada_spots'] or 0), len(self.sensor_ids))
+        for pos in range(len(self.sensor_ids)):
+            vehicle_type = 'ev' if pos < ev_end else 'ada' if pos < ada_end else 'regular'
+            self.types.append(vehicle_type)
+            self.free[vehicle_type].append(pos)
+        for vehicle_type in VEHICLE_TYPES:
+            self.totals[vehicle_type] = len(self.free[vehicle_type])
+
+    def available(self, vehicle_type):
+        return len(self.free[vehicle_type])
+
+    def park(self, vehicle_type):
+        free = self.free[vehicle_type]
+        if not free:
+            return None
+        i = random.randrange(len(free))
+        pos = free[i]
+        last = free.pop()
+        if i < len(free):
+            free[i] = last
+        self.occupied[pos] = 1
+        return pos
+
+    def leave(self, pos):
+        if not self.occupied[pos]:
+            raise ValueError(f"Sensor {self.sensor_ids[pos]} in lot {self.lot_id} is not occupied")
+        self.occupied[pos] = 0
+        self.free[self.types[pos]].append(pos)
+        return self.types[pos]
+
+# Update lots availability with an exact delta computed from the local occupancy state
 def update_lot_availability(conn, lot_id, vehicle_type, event_type):
     spot_column = f"available_{vehicle_type}_spots"
+    delta = -1 if event_type == 'entry' else 1
     with conn.cursor() as cur:
-        if event_type == 'entry':
-            cur.execute(f"""
-                UPDATE parksmart.lots
-                SET {spot_column} = GREATEST({spot_column} - 1, 0)
-                WHERE lot_id = %s;
-            """, (lot_id,))
-        else:
-            cur.execute(f"""
-                UPDATE parksmart.lots
-                SET {spot_column} = LEAST({spot_column} + 1, total_{vehicle_type}_spots)
-                WHERE lot_id = %s;
-            """, (lot_id,))
-
-        # Update available_spots
-        cur.execute("""
+        cur.execute(f"""
             UPDATE parksmart.lots
-            SET available_spots = available_regular_spots + available_ev_spots + available_ada_spots
+            SET {spot_column} = {spot_column} + %s,
+                available_spots = available_spots + %s
             WHERE lot_id = %s;
-        """, (lot_id,))
+        """, (delta, delta, lot_id))
     conn.commit()
 
 # Insert sensor log event
@@ -86,41 +136,253 @@ def insert_sensor_log(conn, sensor_id, event_type, timestamp):
         """, (str(uuid.uuid4()), sensor_id, event_type, timestamp))
     conn.commit()
 
-# Main simulation loop
-def run_simulation(start_time, duration_minutes):
-    conn = get_connection()
-    lot_info, sensors_by_lot = load_lots_and_sensors(conn)
-    print(f"✅ Loaded {len(lot_info)} lots for simulation.")
+# Write one tick of buffered events in a single transaction:
+# one multi-row INSERT for the logs and one UPDATE per lot carrying net deltas per vehicle type
+def flush_tick(conn, events):
+    if not events:
+        return
+
+    deltas = {}
+    for lot_id, sensor_id, vehicle_type, event_type, timestamp in events:
+        lot_deltas = deltas.setdefault(lot_id, dict.fromkeys(VEHICLE_TYPES, 0))
+        lot_deltas[vehicle_type] += -1 if event_type == 'entry' else 1
+
+    update_sql = f"""
+        UPDATE parksmart.lots
+        SET {', '.join(f"available_{vehicle_type}_spots = available_{vehicle_type}_spots + %({vehicle_type})s"
+                       for vehicle_type in VEHICLE_TYPES)},
+            available_spots = available_spots + {' + '.join(f"%({vehicle_type})s" for vehicle_type in VEHICLE_TYPES)}
+        WHERE lot_id = %(lot_id)s;
+    """
+
+    with conn.cursor() as cur:
+        execute_values(cur, """
+            INSERT INTO parksmart.sensorlogs (id, sensor_id, event_type, event_timestamp)
+            VALUES %s;
+        """, [(str(uuid.uuid4()), sensor_id, event_type, timestamp)
+              for _, sensor_id, _, event_type, timestamp in events], page_size=len(events))
+
+        for lot_id, lot_deltas in deltas.items():
+            cur.execute(update_sql, dict(lot_deltas, lot_id=lot_id))
+    conn.commit()
+
+# Simulation clock: maps simulated time onto wall-clock time.
+# 'realtime' runs at 1x, 'scaled' at `speed`x and 'fast' never sleeps.
+CLOCK_MODES = ['realtime', 'scaled', 'fast']
+
+class SimulationClock:
+    def __init__(self, start_time, mode='realtime', speed=1.0):
+        if mode not in CLOCK_MODES:
+            raise ValueError(f"Unknown clock mode: {mode}")
+        self.mode = mode
+        self.speed = 1.0 if mode == 'realtime' else speed
+        self.sim_start = start_time
+        self.wall_start = time.monotonic()
+
+    def wait_until(self, sim_time):
+        if self.mode == 'fast':
+            return
+        target = self.wall_start + (sim_time - self.sim_start).total_seconds() / self.speed
+        delay = target - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def elapsed(self):
+        return time.monotonic() - self.wall_start
 
+# Future arrivals and departures, ordered by simulated time
+ARRIVAL = 'arrival'
+DEPARTURE = 'departure'
+
+class EventQueue:
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()  # tie-breaker so payloads are never compared
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, event_time, kind, lot_id, payload=None):
+        heapq.heappush(self.heap, (event_time, next(self.counter), kind, lot_id, payload))
+
+    def pop_until(self, until):
+        while self.heap and self.heap[0][0] < until:
+            event_time, _, kind, lot_id, payload = heapq.heappop(self.heap)
+            yield event_time, kind, lot_id, payload
+
+# Traffic parameters per lot. Arrivals are a Poisson process whose rate follows the traffic
+# model's arrival curve over the day (8:45 peak by default), with the same daily volume
+# as the old constant rate
+ARRIVALS_PER_MINUTE = 1.4   # daily average; matches the old 70% entry share of one event per 30s
+ARRIVALS_PER_DAY = ARRIVALS_PER_MINUTE * 24 * 60
+DWELL_MINUTES = (30, 240)
+
+def dwell_time():
+    return timedelta(minutes=random.uniform(*DWELL_MINUTES))
+
+# Simulate a set of lots on one connection and return the run's stats
+def simulate_lots(conn, lot_info, sensors_by_lot, start_time, duration_minutes, clock_mode='scaled', speed=30.0,
+                  pipeline=True, flush_seconds=30, verbose=True, label="", traffic=None):
+    traffic = traffic or TrafficModel.default()
+    rng = np.random.default_rng()
     end_time = start_time + timedelta(minutes=duration_minutes)
     current_time = start_time
+    clock = SimulationClock(start_time, clock_mode, speed)
+    queue = EventQueue()
+    event_count = 0
+    turned_away = 0
+
+    # Seed the local occupancy from the lots table: cars already parked get a departure
+    # somewhere inside one dwell time
+    lot_states = {}
+    for lot_id, info in lot_info.items():
+        if lot_id not in sensors_by_lot:
+            continue
+        state = LotState(lot_id, sensors_by_lot[lot_id], info)
+        lot_states[lot_id] = state
+        for vehicle_type in VEHICLE_TYPES:
+            parked = (info[f'total_{vehicle_type}_spots'] or 0) - (info[f'available_{vehicle_type}_spots'] or 0)
+            for _ in range(max(0, min(parked, state.totals[vehicle_type]))):
+                pos = state.park(vehicle_type)
+                queue.schedule(start_time + random.uniform(0, 1) * dwell_time(), DEPARTURE, lot_id, pos)
 
     while current_time < end_time:
-        for lot_id in lot_info.keys():
-            if lot_id not in sensors_by_lot:
-                continue
+        window_end = min(current_time + timedelta(seconds=flush_seconds), end_time)
+        tick_events = []
+        # This window's arrivals, drawn as one batch per lot
+        for lot_id in lot_states:
+            for arrival_time in traffic.arrival_times(current_time, window_end, ARRIVALS_PER_DAY, group=lot_id, rng=rng):
+                queue.schedule(arrival_time, ARRIVAL, lot_id)
+        for event_time, kind, lot_id, payload in queue.pop_until(window_end):
+            state = lot_states[lot_id]
+            if kind == ARRIVAL:
+                vehicle_type = random.choices(VEHICLE_TYPES, weights=[state.totals[t] for t in VEHICLE_TYPES])[0]
+                pos = state.park(vehicle_type)
+                if pos is None:
+                    turned_away += 1  # no free spot of this type
+                    continue
+                event_type = 'entry'
+                queue.schedule(event_time + dwell_time(), DEPARTURE, lot_id, pos)
+            else:
+                pos = payload
+                vehicle_type = state.leave(pos)
+                event_type = 'exit'
+            sensor_id = state.sensor_ids[pos]
+
+            if verbose:
+                print(f"{label}[{event_time.strftime('%H:%M:%S')}] {event_type.upper()} - Lot: {lot_id}, Sensor: {sensor_id}, Vehicle: {vehicle_type}")
+            tick_events.append((lot_id, sensor_id, vehicle_type, event_type, event_time))
 
-            vehicle_type = random.choice(VEHICLE_TYPES)
-            event_type = random.choices(EVENT_TYPES, weights=[0.7, 0.3])[0]  # Entry more likely
-            sensor_id = random.choice(sensors_by_lot[lot_id])
+        clock.wait_until(window_end)
+        if pipeline:
+            flush_tick(conn, tick_events)
+        else:
+            for lot_id, sensor_id, vehicle_type, event_type, event_time in tick_events:
+                insert_sensor_log(conn, sensor_id, event_type, event_time)
+                update_lot_availability(conn, lot_id, vehicle_type, event_type)
 
-            print(f"[{current_time.strftime('%H:%M:%S')}] {event_type.upper()} - Lot: {lot_id}, Sensor: {sensor_id}, Vehicle: {vehicle_type}")
+        event_count += len(tick_events)
+        current_time = window_end
 
-            insert_sensor_log(conn, sensor_id, event_type, current_time)
-            update_lot_availability(conn, lot_id, vehicle_type, event_type)
+    return {'lots': len(lot_states), 'events': event_count, 'turned_away': turned_away, 'elapsed': clock.elapsed()}
 
-        time.sleep(1)  # simulate real-time delay
-        current_time += timedelta(seconds=30)
+def print_stats(stats, prefix="🛑 Simulation completed"):
+    elapsed = stats['elapsed']
+    print(f"{prefix}: {stats['events']} events for {stats['lots']} lots in {elapsed:.2f}s "
+          f"({stats['events'] / elapsed if elapsed else 0:,.0f} events/s), {stats['turned_away']} arrivals turned away.")
 
-    print("🛑 Simulation completed.")
+# Main simulation loop
+def run_simulation(start_time, duration_minutes, **options):
+    conn = get_connection()
+    lot_info, sensors_by_lot = load_lots_and_sensors(conn)
+    print(f"✅ Loaded {len(lot_info)} lots for simulation.")
+
+    stats = simulate_lots(conn, lot_info, sensors_by_lot, start_time, duration_minutes, **options)
+    print_stats(stats)
+    conn.close()
+    return stats
+
+# Split lots across shards, largest first onto the shard with the fewest sensors
+def partition_lots(lot_info, sensors_by_lot, shards):
+    buckets = [[] for _ in range(shards)]
+    loads = [0] * shards
+    lot_ids = [lot_id for lot_id in lot_info if lot_id in sensors_by_lot]
+    for lot_id in sorted(lot_ids, key=lambda l: len(sensors_by_lot[l]), reverse=True):
+        target = loads.index(min(loads))
+        buckets[target].append(lot_id)
+        loads[target] += len(sensors_by_lot[lot_id])
+    return [bucket for bucket in buckets if bucket]
+
+# Worker process: owns its lots' state and its own connection
+def run_shard(shard, credentials, lot_info, sensors_by_lot, start_time, duration_minutes, options):
+    random.seed()  # forked workers would otherwise share the parent's random state
+    conn = get_connection(credentials)
+    try:
+        stats = simulate_lots(conn, lot_info, sensors_by_lot, start_time, duration_minutes,
+                              label=f"[shard {shard}]", **options)
+    finally:
+        conn.close()
+    print_stats(stats, prefix=f"✅ Shard {shard} done")
+    return stats
+
+# Coordinator: partition the lots, run one worker process per shard and aggregate their stats
+def run_sharded_simulation(start_time, duration_minutes, shards, **options):
+    # Read credentials once here; worker processes cannot prompt for them
+    credentials = read_db_credentials("secrets/pwd.txt")
+    conn = get_connection(credentials)
+    lot_info, sensors_by_lot = load_lots_and_sensors(conn)
     conn.close()
 
+    partitions = partition_lots(lot_info, sensors_by_lot, shards)
+    print(f"✅ Loaded {len(lot_info)} lots, running {len(partitions)} shards.")
+
+    wall_start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+        futures = [
+            pool.submit(run_shard, shard, credentials,
+                        {lot_id: lot_info[lot_id] for lot_id in lot_ids},
+                        {lot_id: sensors_by_lot[lot_id] for lot_id in lot_ids},
+                        start_time, duration_minutes, options)
+            for shard, lot_ids in enumerate(partitions)
+        ]
+        results = [future.result() for future in futures]
+
+    stats = {
+        'lots': sum(r['lots'] for r in results),
+        'events': sum(r['events'] for r in results),
+        'turned_away': sum(r['turned_away'] for r in results),
+        'elapsed': time.monotonic() - wall_start,
+    }
+    print_stats(stats, prefix=f"🛑 Simulation completed across {len(partitions)} shards")
+    return stats
+
 # --- Entry Point ---
 if __name__ == "__main__":
-    start_input = input("Enter simulation start datetime (YYYY-MM-DD HH:MM:SS): ")
-    duration_input = int(input("Enter duration in minutes: "))
+    parser = argparse.ArgumentParser(description="Realtime parking lot simulator")
+    parser.add_argument("--start", help="Simulation start datetime (YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument("--duration", type=int, help="Duration in simulated minutes")
+    parser.add_argument("--clock", choices=CLOCK_MODES, default="scaled",
+                        help="realtime (1x), scaled (--speed x) or fast (no sleeping)")
+    parser.add_argument("--speed", type=float, default=30.0, help="Speed-up factor for the scaled clock")
+    parser.add_argument("--flush-seconds", type=int, default=30, help="Simulated seconds buffered per DB write")
+    parser.add_argument("--no-pipeline", action="store_true", help="Write every event with its own statements")
+    parser.add_argument("--quiet", action="store_true", help="Do not print individual events")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Worker processes; lots are partitioned across them, each with its own connection")
+    parser.add_argument("--traffic-model", help="Arrival curves from traffic_model.py (default: built-in 8:45 peak)")
+    parser.add_argument("--flat-traffic", action="store_true", help="Constant arrival rate around the clock")
+    args = parser.parse_args()
+
+    start_input = args.start or input("Enter simulation start datetime (YYYY-MM-DD HH:MM:SS): ")
+    duration_input = args.duration or int(input("Enter duration in minutes: "))
     try:
         start_dt = datetime.strptime(start_input, "%Y-%m-%d %H:%M:%S")
-        run_simulation(start_dt, duration_input)
     except ValueError:
-        print("Invalid date format.")
+        parser.error("Invalid date format, expected YYYY-MM-DD HH:MM:SS")
+    options = dict(clock_mode=args.clock, speed=args.speed, pipeline=not args.no_pipeline,
+                   flush_seconds=args.flush_seconds, verbose=not args.quiet,
+                   traffic=TrafficModel.flat() if args.flat_traffic else load_traffic_model(args.traffic_model))
+    if args.shards > 1:
+        run_sharded_simulation(start_dt, duration_input, args.shards, **options)
+    else:
+        run_simulation(start_dt, duration_input, **options)
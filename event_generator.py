@@ -0,0 +1,66 @@
+from collections import namedtuple
+
+import numpy as np
+
+from traffic_model import TrafficModel
+
+# Arrival and departure times come from the shared traffic model (8:45 peak by default)
+DEFAULT_TRAFFIC = TrafficModel.default()
+
+# Lunch window, in minutes after midnight
+LUNCH_EXIT_START = 12 * 60      # Lunch exit: 12:00–12:30
+LUNCH_EXIT_SPAN = 30
+LUNCH_GAP_MIN, LUNCH_GAP_MAX = 30, 60
+LUNCH_PROB = 0.3
+
+# One columnar batch of sensor log events; every field is a NumPy array of equal length
+EventBatch = namedtuple("EventBatch", ["ids", "sensor_ids", "event_types", "event_timestamps"])
+
+
+def random_uuids(rng, n):
+    # Draw n version-4 UUIDs at once and format them as 36-char strings
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    hex_chars = np.frombuffer(raw.tobytes().hex().encode("ascii"), dtype="S1").reshape(n, 32)
+    dashed = np.insert(hex_chars, [8, 12, 16, 20], b"-", axis=1)
+    return np.ascontiguousarray(dashed).view("S36").ravel().astype("U36")
+
+
+def generate_day(sensor_ids, day, occupancy_rate, rng, traffic=DEFAULT_TRAFFIC):
+    sensor_ids = np.asarray(sensor_ids)
+    occupied = rng.choice(len(sensor_ids), int(len(sensor_ids) * occupancy_rate), replace=False)
+    n = len(occupied)
+
+    # Seconds after midnight
+    entry, exit_ = traffic.sample_visits(day.weekday(), n, rng=rng)
+
+    # Optional lunch exit/entry, for visits that span it
+    lunch_exit = (LUNCH_EXIT_START + rng.integers(0, LUNCH_EXIT_SPAN + 1, size=n)) * 60
+    lunch_entry = lunch_exit + rng.integers(LUNCH_GAP_MIN, LUNCH_GAP_MAX + 1, size=n) * 60
+    lunch_mask = (rng.random(n) < LUNCH_PROB) & (entry < lunch_exit) & (lunch_entry < exit_)
+    lunch = occupied[lunch_mask]
+    lunch_exit, lunch_entry = lunch_exit[lunch_mask], lunch_entry[lunch_mask]
+
+    positions = np.concatenate([occupied, lunch, lunch, occupied])
+    seconds = np.concatenate([entry, lunch_exit, lunch_entry, exit_])
+    event_types = np.repeat(np.array(["entry", "exit", "entry", "exit"]), [n, len(lunch), len(lunch), n])
+    timestamps = np.datetime64(day, "D").astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+
+    return EventBatch(random_uuids(rng, len(positions)), sensor_ids[positions], event_types, timestamps)
+
+
+# Split a day's batch into fixed-size slices so callers can insert with bounded memory
+def split_batch(batch, batch_size):
+    for start in range(0, len(batch.ids), batch_size):
+        yield EventBatch(*(column[start:start + batch_size] for column in batch))
+
+
+# Row tuples (id, sensor_id, event_type, event_timestamp) for DB drivers, built column-wise
+def batch_rows(batch):
+    return list(zip(
+        batch.ids.tolist(),
+        batch.sensor_ids.tolist(),
+        batch.event_types.tolist(),
+        batch.event_timestamps.astype("datetime64[s]").tolist(),
+    ))
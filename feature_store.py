@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import time
+from datetime import timedelta
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+
+from columnar_io import read_sensor_logs
+from occupancy import occupancy_by_bucket
+
+FEATURE_STORE = "feature_store.sqlite"
+MODEL_FILE = "availability_model.joblib"
+BUCKET = '30Min'
+FEATURES = ['lot_id_encoded', 'weekday_encoded', 'hour', 'minute']
+
+# lot_id has no declared type so integer and text lot ids keep their type
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS occupancy_features (
+    lot_id NOT NULL,
+    name TEXT,
+    bucket TEXT NOT NULL,
+    entry INTEGER NOT NULL,
+    exit INTEGER NOT NULL,
+    net_change INTEGER NOT NULL,
+    occupancy INTEGER NOT NULL,
+    PRIMARY KEY (lot_id, bucket)
+);
+CREATE INDEX IF NOT EXISTS occupancy_features_bucket ON occupancy_features (bucket);
+CREATE TABLE IF NOT EXISTS encodings (
+    kind TEXT NOT NULL,
+    value NOT NULL,
+    code INTEGER NOT NULL,
+    PRIMARY KEY (kind, value)
+);
+CREATE TABLE IF NOT EXISTS store_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# A bucket that was only partly covered by the previous run gets the new counts added,
+# and its occupancy replaced by the (carry-in based) recomputed value
+UPSERT = """
+INSERT INTO occupancy_features (lot_id, name, bucket, entry, exit, net_change, occupancy)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (lot_id, bucket) DO UPDATE SET
+    entry = entry + excluded.entry,
+    exit = exit + excluded.exit,
+    net_change = net_change + excluded.net_change,
+    occupancy = excluded.occupancy
+"""
+
+
+# Persistent 30-minute occupancy features per lot, updated only from logs newer than the watermark.
+# Also holds the lot / weekday encodings so model inputs stay stable across runs.
+class FeatureStore:
+    def __init__(self, path=FEATURE_STORE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def watermark(self):
+        row = self.conn.execute("SELECT value FROM store_state WHERE key = 'watermark'").fetchone()
+        return pd.Timestamp(row[0]) if row else None
+
+    def encoding(self, kind):
+        return dict(self.conn.execute("SELECT value, code FROM encodings WHERE kind = ?", (kind,)).fetchall())
+
+    # Existing values keep their codes; unseen ones get the next codes in sorted order
+    # (so a fresh store matches the category codes a full training run would use)
+    def extend_encoding(self, kind, values):
+        mapping = self.encoding(kind)
+        new_values = sorted(set(values) - set(mapping))
+        next_code = max(mapping.values(), default=-1) + 1
+        for offset, value in enumerate(new_values):
+            mapping[value] = next_code + offset
+        self.conn.executemany("INSERT INTO encodings (kind, value, code) VALUES (?, ?, ?)",
+                              [(kind, value, mapping[value]) for value in new_values])
+        self.conn.commit()
+        return mapping
+
+    # Occupancy at each lot's latest stored bucket: the starting point for newer events
+    def carry_in(self):
+        return dict(self.conn.execute("""
+            SELECT f.lot_id, f.occupancy FROM occupancy_features f
+            JOIN (SELECT lot_id, MAX(bucket) AS bucket FROM occupancy_features GROUP BY lot_id) latest
+              ON latest.lot_id = f.lot_id AND latest.bucket = f.bucket
+        """).fetchall())
+
+    # Fold events newer than the watermark into the store. Returns (buckets written, first new bucket).
+    def update(self, df):
+        grouped = occupancy_by_bucket(df, by=['lot_id', 'name'], freq=BUCKET)
+        lot_ids = grouped['lot_id'].astype(object).tolist()
+        carry = self.carry_in()
+        occupancy = grouped['occupancy'].to_numpy() + np.array([carry.get(lot_id, 0) for lot_id in lot_ids],
+                                                               dtype=np.int64)
+        rows = zip(
+            lot_ids,
+            grouped['name'].astype(str).tolist(),
+            grouped['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S').tolist(),
+            grouped['entry'].tolist(),
+            grouped['exit'].tolist(),
+            grouped['net_change'].tolist(),
+            occupancy.tolist(),
+        )
+        self.conn.executemany(UPSERT, rows)
+        self.conn.execute("INSERT OR REPLACE INTO store_state (key, value) VALUES ('watermark', ?)",
+                          (str(df['event_timestamp'].max()),))
+        self.conn.commit()
+        return len(grouped), grouped['timestamp'].min()
+
+    def features(self, since=None):
+        query = "SELECT lot_id, name, bucket, entry, exit, net_change, occupancy FROM occupancy_features"
+        params = ()
+        if since is not None:
+            query += " WHERE bucket >= ?"
+            params = (str(since),)
+        df = pd.read_sql_query(query, self.conn, params=params)
+        df['timestamp'] = pd.to_datetime(df.pop('bucket'))
+        df['weekday'] = df['timestamp'].dt.day_name()
+        df['hour'] = df['timestamp'].dt.hour
+        df['minute'] = df['timestamp'].dt.minute
+        return df
+
+
+def _load_forest(model_file):
+    if not os.path.exists(model_file):
+        return None
+    model = joblib.load(model_file)[0]
+    # Only a forest trained by this mode can be extended; a full-history model is replaced
+    if isinstance(model, RandomForestRegressor) and model.warm_start:
+        return model
+    return None
+
+
+# Nightly retraining: fold new logs into the feature store, then add `trees_per_run` trees fitted on
+# the last `window_days` of features to the existing forest, dropping the oldest trees beyond `max_trees`.
+# Cost depends on the new logs and the window, not on the length of the history.
+# Always reads every lot: the watermark is global, so a run over some lots would mark the others as done.
+def train_incremental(input_path, store_path=FEATURE_STORE, model_file=MODEL_FILE, trees_per_run=25,
+                      max_trees=200, window_days=28, end_date=None):
+    start = time.time()
+    store = FeatureStore(store_path)
+    watermark = store.watermark
+
+    df = read_sensor_logs(input_path, columns=['lot_id', 'name', 'event_type', 'event_timestamp'],
+                          start_date=None if watermark is None else watermark.date(), end_date=end_date)
+    if watermark is not None:
+        df = df[df['event_timestamp'] > watermark]
+    if df.empty:
+        print(f"✅ No sensor logs newer than {watermark}, model unchanged")
+        store.close()
+        return
+    if 'name' not in df.columns:
+        df['name'] = df['lot_id'].astype(str)
+
+    buckets, first_new_bucket = store.update(df)
+    print(f"[INFO] {len(df)} new events → {buckets} feature buckets (watermark {store.watermark})")
+
+    features = store.features(since=store.watermark.floor(BUCKET) - timedelta(days=window_days))
+    lot_id_map = store.extend_encoding('lot_id', features['lot_id'].unique().tolist())
+    weekday_map = store.extend_encoding('weekday', features['weekday'].unique().tolist())
+    store.close()
+    features['lot_id_encoded'] = features['lot_id'].map(lot_id_map)
+    features['weekday_encoded'] = features['weekday'].map(weekday_map)
+    X = features[FEATURES]
+    y = features['occupancy']
+
+    model = _load_forest(model_file)
+    if model is None:
+        model = RandomForestRegressor(n_estimators=0, warm_start=True, random_state=42, n_jobs=-1)
+    else:
+        # Score the previous model on the buckets it has not seen yet
+        new_rows = features['timestamp'] >= first_new_bucket
+        rmse = np.sqrt(mean_squared_error(y[new_rows], model.predict(X[new_rows])))
+        print(f"[INFO] RMSE of the previous model on new buckets: {rmse:.2f}")
+        keep = max_trees - trees_per_run
+        if len(model.estimators_) > keep:
+            model.estimators_ = model.estimators_[len(model.estimators_) - keep:]
+
+    model.n_estimators = len(getattr(model, 'estimators_', [])) + trees_per_run
+    model.fit(X, y)
+
+    joblib.dump((model, lot_id_map, weekday_map), model_file)
+    print(f"✅ Model updated with {trees_per_run} trees ({len(model.estimators_)} total) on {len(X)} feature rows, "
+          f"saved to {model_file} in {time.time() - start:.1f}s")
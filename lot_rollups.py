@@ -0,0 +1,369 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import psycopg2
+from psycopg2.extras import execute_values
+
+from occupancy import EVENT_DELTAS
+
+JOB_NAME = "lot_occupancy"
+CREATED_BY = "rollup_job"
+# bucket_size label -> pandas frequency; 1m rows are the base the others are built from.
+# 30m rows match the buckets analyze_sensor_logs.py reports and trains on.
+BUCKETS = {"1m": "1min", "15m": "15min", "30m": "30min", "1h": "1h"}
+# Every bucket size divides this one, so a rewind to a multiple of it only drops whole buckets
+REWIND_FREQ = "1h"
+SNAPSHOT_FREQ = "15min"
+SPOT_TYPES = {"REGULAR": "regular", "ADA": "ada", "EV": "ev"}
+ARRIVALS = tuple(sorted(event.upper() for event, delta in EVENT_DELTAS.items() if delta > 0))
+DEPARTURES = tuple(sorted(event.upper() for event, delta in EVENT_DELTAS.items() if delta < 0))
+OCCUPIED_COLUMNS = ["occupied_spots"] + [f"occupied_{name}_spots" for name in SPOT_TYPES.values()]
+ROLLUP_COLUMNS = ["lot_id", "bucket_size", "bucket_start", "entries", "exits"] + OCCUPIED_COLUMNS + ["peak_occupied_spots"]
+
+# Arrivals / departures per lot, spot type and minute for events in (since, until]
+MINUTE_COUNTS_SQL = """
+    SELECT sp.lot_id, upper(sp.type), date_trunc('minute', l.event_timestamp) AS minute,
+           count(*) FILTER (WHERE upper(l.event_type) IN %(arrivals)s) AS entries,
+           count(*) FILTER (WHERE upper(l.event_type) IN %(departures)s) AS exits
+    FROM park_smart.sensor_logs l
+    JOIN park_smart.sensor s ON s.id = l.sensor_id
+    JOIN park_smart.spot sp ON sp.id = s.spot_id
+    WHERE l.event_timestamp > %(since)s AND l.event_timestamp <= %(until)s
+    GROUP BY 1, 2, 3
+"""
+
+# A bucket the previous chunk only partly covered gets the new counts added;
+# its end-of-bucket occupancy is replaced (it already includes the carry-in)
+UPSERT_ROLLUPS_SQL = f"""
+    INSERT INTO park_smart.lot_occupancy_rollup ({', '.join(ROLLUP_COLUMNS)}) VALUES %s
+    ON CONFLICT (lot_id, bucket_size, bucket_start) DO UPDATE SET
+        entries = lot_occupancy_rollup.entries + excluded.entries,
+        exits = lot_occupancy_rollup.exits + excluded.exits,
+        {', '.join(f'{column} = excluded.{column}' for column in OCCUPIED_COLUMNS)},
+        peak_occupied_spots = greatest(lot_occupancy_rollup.peak_occupied_spots, excluded.peak_occupied_spots),
+        updated_at = current_timestamp
+"""
+
+HISTORY_COLUMNS = [
+    "lot_id", "history_timestamp",
+    "total_spots", "total_regular_spots", "total_ada_spots", "total_ev_spots",
+    "available_spots", "available_regular_spots", "available_ada_spots", "available_ev_spots",
+    "created_by", "updated_by",
+]
+
+
+def read_db_credentials(path, headless=False):
+    try:
+        with open(path, 'r') as f:
+            lines = f.readlines()
+            user = lines[0].split(':')[1].strip()
+            password = lines[1].split(':')[1].strip()
+            return user, password
+    except FileNotFoundError:
+        if headless:
+            raise RuntimeError("[ERROR] Missing secrets/pwd.txt in headless mode")
+        print("Password file not found. Please enter manually.")
+        user = input("Enter DB user: ")
+        password = input("Enter DB password: ")
+        return user, password
+
+
+def get_connection(headless=False):
+    user, password = read_db_credentials("secrets/pwd.txt", headless=headless)
+    return psycopg2.connect(
+        dbname="social_elves",
+        user=user,
+        password=password,
+        host="social-elves-11376.j77.aws-us-west-2.cockroachlabs.cloud",
+        port=26257,
+        sslmode="require"
+    )
+
+
+# (last event_timestamp rolled up, commit timestamp the run that got there started reading at)
+def read_watermark(cur):
+    cur.execute("SELECT watermark, commit_watermark FROM park_smart.rollup_watermark WHERE job = %s", (JOB_NAME,))
+    row = cur.fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def write_watermark(cur, watermark, commit_watermark):
+    cur.execute("""
+        UPSERT INTO park_smart.rollup_watermark (job, watermark, commit_watermark, updated_at)
+        VALUES (%s, %s, %s, current_timestamp)
+    """, (JOB_NAME, watermark, commit_watermark))
+
+
+# CockroachDB HLC timestamp of the current transaction: any row written later commits above it
+def read_commit_timestamp(cur):
+    cur.execute("SELECT cluster_logical_timestamp()")
+    return cur.fetchone()[0]
+
+
+# Earliest event committed after `commit_watermark` whose event time the watermark has already passed
+# (late or backfilled events). crdb_internal_mvcc_timestamp is not indexed, so this scans sensor_logs.
+def earliest_late_event(cur, commit_watermark, watermark):
+    cur.execute("""
+        SELECT min(event_timestamp) FROM park_smart.sensor_logs
+        WHERE crdb_internal_mvcc_timestamp > %s AND event_timestamp <= %s
+    """, (commit_watermark, watermark))
+    return cur.fetchone()[0]
+
+
+def load_lots(cur):
+    cur.execute("""
+        SELECT id, total_spots, total_regular_spots, total_ada_spots, total_ev_spots
+        FROM park_smart.lot
+    """)
+    lots = pd.DataFrame(cur.fetchall(), columns=["lot_id", "total_spots", "total_regular_spots",
+                                                 "total_ada_spots", "total_ev_spots"])
+    lots["lot_id"] = lots["lot_id"].astype(str)
+    return lots.fillna(0)
+
+
+# Occupancy per lot (total and per spot type) at the end of the latest 1m bucket written so far
+def read_carry_in(cur):
+    cur.execute(f"""
+        SELECT DISTINCT ON (lot_id) lot_id, {', '.join(OCCUPIED_COLUMNS)}
+        FROM park_smart.lot_occupancy_rollup
+        WHERE bucket_size = '1m'
+        ORDER BY lot_id, bucket_start DESC
+    """)
+    carry = pd.DataFrame(cur.fetchall(), columns=["lot_id"] + OCCUPIED_COLUMNS)
+    carry["lot_id"] = carry["lot_id"].astype(str)
+    return carry.set_index("lot_id")
+
+
+def fetch_minute_counts(cur, since, until):
+    cur.execute(MINUTE_COUNTS_SQL, {"arrivals": ARRIVALS, "departures": DEPARTURES, "since": since, "until": until})
+    counts = pd.DataFrame(cur.fetchall(), columns=["lot_id", "spot_type", "minute", "entries", "exits"])
+    counts["lot_id"] = counts["lot_id"].astype(str)
+    return counts
+
+
+# 1-minute rows per lot with end-of-minute occupancy (carry-in + running net change), total and per type
+def minute_occupancy(counts, carry):
+    counts = counts[counts["spot_type"].isin(SPOT_TYPES)].copy()
+    if counts.empty:
+        return pd.DataFrame({"lot_id": pd.Series(dtype=object), "minute": pd.Series(dtype="datetime64[ns]"),
+                             **{column: pd.Series(dtype=np.int64) for column in ["entries", "exits"] + OCCUPIED_COLUMNS}})
+    counts["minute"] = pd.to_datetime(counts["minute"]).astype("datetime64[ns]")
+    counts["net"] = counts["entries"] - counts["exits"]
+    net = counts.pivot_table(index=["lot_id", "minute"], columns="spot_type", values="net",
+                             aggfunc="sum", fill_value=0)
+    net = net.reindex(columns=list(SPOT_TYPES), fill_value=0)
+    minutes = counts.groupby(["lot_id", "minute"])[["entries", "exits"]].sum()
+
+    running = net.groupby(level="lot_id").cumsum()
+    start = carry.reindex(running.index.get_level_values("lot_id")).fillna(0)
+    for spot_type, name in SPOT_TYPES.items():
+        minutes[f"occupied_{name}_spots"] = (running[spot_type].to_numpy()
+                                             + start[f"occupied_{name}_spots"].to_numpy()).astype(np.int64)
+    minutes["occupied_spots"] = minutes[OCCUPIED_COLUMNS[1:]].sum(axis=1)
+    return minutes.reset_index()
+
+
+# 1m / 15m / 30m / 1h rollup rows from the minute frame: summed flows, end-of-bucket and peak occupancy
+def build_rollups(minutes):
+    frames = []
+    for label, freq in BUCKETS.items():
+        frame = minutes.assign(bucket_start=minutes["minute"].dt.floor(freq))
+        grouped = frame.groupby(["lot_id", "bucket_start"], sort=True).agg(
+            entries=("entries", "sum"), exits=("exits", "sum"),
+            **{column: (column, "last") for column in OCCUPIED_COLUMNS},
+            peak_occupied_spots=("occupied_spots", "max"),
+        ).reset_index()
+        grouped["bucket_size"] = label
+        frames.append(grouped[ROLLUP_COLUMNS])
+    return pd.concat(frames, ignore_index=True)
+
+
+# lot_history snapshot for every lot at every 15-minute boundary T in (since, until],
+# from the occupancy of all events before T
+def build_snapshots(minutes, carry, lots, since, until):
+    boundaries = pd.date_range(pd.Timestamp(since).floor(SNAPSHOT_FREQ) + pd.Timedelta(SNAPSHOT_FREQ),
+                               pd.Timestamp(until), freq=SNAPSHOT_FREQ)
+    if len(boundaries) == 0 or lots.empty:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+    grid = pd.DataFrame({
+        "lot_id": np.repeat(lots["lot_id"].to_numpy(), len(boundaries)),
+        "history_timestamp": np.tile(boundaries.to_numpy(), len(lots)),
+    }).sort_values("history_timestamp")
+    grid["history_timestamp"] = grid["history_timestamp"].astype("datetime64[ns]")
+    latest = minutes[["lot_id", "minute"] + OCCUPIED_COLUMNS].sort_values("minute")
+    grid["lot_id"] = grid["lot_id"].astype(str)
+    latest["lot_id"] = latest["lot_id"].astype(str)
+    # Minute m covers [m, m + 1min), so it counts for boundaries strictly after m
+    snapshots = pd.merge_asof(grid, latest, left_on="history_timestamp", right_on="minute", by="lot_id",
+                              allow_exact_matches=False)
+    before = carry.reindex(snapshots["lot_id"]).fillna(0)
+    for column in OCCUPIED_COLUMNS:
+        snapshots[column] = (snapshots[column].fillna(pd.Series(before[column].to_numpy(), index=snapshots.index))
+                             .astype(np.int64))
+
+    snapshots = snapshots.merge(lots, on="lot_id")
+    snapshots["available_spots"] = snapshots["total_spots"] - snapshots["occupied_spots"]
+    for name in SPOT_TYPES.values():
+        snapshots[f"available_{name}_spots"] = snapshots[f"total_{name}_spots"] - snapshots[f"occupied_{name}_spots"]
+    snapshots["created_by"] = CREATED_BY
+    snapshots["updated_by"] = CREATED_BY
+    return snapshots[HISTORY_COLUMNS]
+
+
+def _records(frame):
+    return [tuple(v.item() if hasattr(v, "item") else v for v in row)
+            for row in frame.itertuples(index=False, name=None)]
+
+
+# One transaction per chunk: rollups, snapshots and the watermark move together,
+# so an interrupted run resumes from the last committed chunk
+def roll_up_chunk(conn, lots, since, until, commit_watermark):
+    with conn.cursor() as cur:
+        carry = read_carry_in(cur)
+        counts = fetch_minute_counts(cur, since, until)
+        minutes = minute_occupancy(counts, carry)
+        rollups = build_rollups(minutes)
+        snapshots = build_snapshots(minutes, carry, lots, since, until)
+
+        if not rollups.empty:
+            execute_values(cur, UPSERT_ROLLUPS_SQL, _records(rollups), page_size=1000)
+        if not snapshots.empty:
+            execute_values(cur, f"INSERT INTO park_smart.lot_history ({', '.join(HISTORY_COLUMNS)}) VALUES %s",
+                           _records(snapshots), page_size=1000)
+        write_watermark(cur, until, commit_watermark)
+    conn.commit()
+    return int(counts["entries"].sum() + counts["exits"].sum()), len(rollups), len(snapshots)
+
+
+def rebuild(conn):
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM park_smart.lot_occupancy_rollup WHERE true")
+        cur.execute("DELETE FROM park_smart.lot_history WHERE created_by = %s", (CREATED_BY,))
+        cur.execute("DELETE FROM park_smart.rollup_watermark WHERE job = %s", (JOB_NAME,))
+    conn.commit()
+    print("🧹 Cleared rollups, rollup lot_history snapshots and the watermark")
+
+
+# Drop rollups and snapshots from the REWIND_FREQ boundary before `late_event` on and move the
+# watermark back, so those buckets are rebuilt from the events with the occupancy carried in from before it
+def rewind(conn, late_event, commit_watermark):
+    start = pd.Timestamp(late_event).floor(REWIND_FREQ).to_pydatetime()
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM park_smart.lot_occupancy_rollup WHERE bucket_start >= %s", (start,))
+        cur.execute("DELETE FROM park_smart.lot_history WHERE created_by = %s AND history_timestamp >= %s",
+                    (CREATED_BY, start))
+        write_watermark(cur, start - timedelta(microseconds=1), commit_watermark)
+    conn.commit()
+    print(f"⏪ Late events from {late_event}: rebuilding rollups from {start}")
+    return start - timedelta(microseconds=1)
+
+
+# Roll up everything between the watermark and `until` (default: newest event, at most
+# `lag` before now so events of the current minute are not skipped) in `chunk` steps.
+# Events committed since the previous run with an event time behind the watermark first
+# rewind the rollups to just before them.
+def run_rollups(conn, until=None, chunk=timedelta(hours=24), lag=timedelta(minutes=1)):
+    start = time.time()
+    with conn.cursor() as cur:
+        since, previous_commit_watermark = read_watermark(cur)
+        commit_watermark = read_commit_timestamp(cur)
+        late_event = None
+        if since is not None and previous_commit_watermark is not None:
+            late_event = earliest_late_event(cur, previous_commit_watermark, since)
+        cur.execute("SELECT min(event_timestamp), max(event_timestamp) FROM park_smart.sensor_logs")
+        first_event, last_event = cur.fetchone()
+        lots = load_lots(cur)
+    conn.commit()
+
+    if last_event is None:
+        print("[INFO] No sensor logs to roll up")
+        return
+    if late_event is not None:
+        since = rewind(conn, late_event, previous_commit_watermark)
+    if since is None:
+        since = first_event - timedelta(microseconds=1)
+    if until is None:
+        until = min(last_event, datetime.now() - lag)
+    if until <= since:
+        print(f"✅ Rollups already up to date (watermark {since})")
+        return
+
+    events = rollup_rows = snapshot_rows = 0
+    while since < until:
+        chunk_end = min(since + chunk, until)
+        chunk_events, chunk_rollups, chunk_snapshots = roll_up_chunk(conn, lots, since, chunk_end, commit_watermark)
+        events += chunk_events
+        rollup_rows += chunk_rollups
+        snapshot_rows += chunk_snapshots
+        print(f"[INFO] {since} → {chunk_end}: {chunk_events} events, {chunk_rollups} rollup rows, "
+              f"{chunk_snapshots} lot_history rows")
+        since = chunk_end
+
+    print(f"✅ Rolled up {events} events into {rollup_rows} rollup rows and {snapshot_rows} lot_history "
+          f"snapshots in {time.time() - start:.1f}s (watermark {until})")
+
+
+# Pre-aggregated occupancy (with the lot name) for historical queries instead of scanning sensor_logs
+def read_rollups(conn, bucket_size="15m", start=None, end=None, lot_ids=None):
+    if bucket_size not in BUCKETS:
+        raise ValueError(f"Unknown bucket size: {bucket_size}")
+    query = f"""
+        SELECT {', '.join(f'r.{column}' for column in ROLLUP_COLUMNS)}, l.name
+        FROM park_smart.lot_occupancy_rollup r
+        JOIN park_smart.lot l ON l.id = r.lot_id
+        WHERE r.bucket_size = %s
+    """
+    params = [bucket_size]
+    if start is not None:
+        query += " AND r.bucket_start >= %s"
+        params.append(start)
+    if end is not None:
+        query += " AND r.bucket_start < %s"
+        params.append(end)
+    if lot_ids:
+        query += " AND r.lot_id = ANY(%s::UUID[])"
+        params.append(list(lot_ids))
+    query += " ORDER BY r.lot_id, r.bucket_start"
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        rollups = pd.DataFrame(cur.fetchall(), columns=ROLLUP_COLUMNS + ["name"])
+    rollups["lot_id"] = rollups["lot_id"].astype(str)
+    return rollups
+
+
+# Rollup rows in the occupancy_by_bucket layout (lot_id, name, timestamp, entry, exit, net_change, occupancy)
+def occupancy_frame(rollups):
+    return pd.DataFrame({
+        "lot_id": rollups["lot_id"],
+        "name": rollups["name"],
+        "timestamp": pd.to_datetime(rollups["bucket_start"]),
+        "entry": rollups["entries"].astype(np.int32),
+        "exit": rollups["exits"].astype(np.int32),
+        "net_change": (rollups["entries"] - rollups["exits"]).astype(np.int32),
+        "occupancy": rollups["occupied_spots"].astype(np.int64),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain per-lot occupancy rollups and lot_history snapshots")
+    parser.add_argument("--until", help="Roll up events up to this timestamp (YYYY-MM-DD HH:MM, default: latest)")
+    parser.add_argument("--chunk-hours", type=float, default=24, help="Hours of events per transaction")
+    parser.add_argument("--lag-seconds", type=int, default=60, help="Leave the most recent events for the next run")
+    parser.add_argument("--rebuild", action="store_true", help="Drop existing rollups and start from the first event")
+    parser.add_argument("--headless", action="store_true", help="Fail instead of prompting for credentials")
+    args = parser.parse_args()
+
+    conn = get_connection(headless=args.headless)
+    try:
+        if args.rebuild:
+            rebuild(conn)
+        run_rollups(conn,
+                    until=datetime.strptime(args.until, "%Y-%m-%d %H:%M") if args.until else None,
+                    chunk=timedelta(hours=args.chunk_hours),
+                    lag=timedelta(seconds=args.lag_seconds))
+    finally:
+        conn.close()
@@ -0,0 +1,140 @@
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+
+FEATURES = ['lot_id_encoded', 'weekday_encoded', 'hour', 'minute']
+LATENCY_CALLS = 20
+
+
+# Mean occupancy per lot and time-of-week slot, falling back to the lot's time-of-day mean
+# and then the overall mean for slots not seen in training
+class SeasonalBaseline:
+    def fit(self, X, y):
+        frame = X[FEATURES].assign(occupancy=np.asarray(y))
+        self.by_slot = frame.groupby(FEATURES)['occupancy'].mean()
+        self.by_time = frame.groupby(['lot_id_encoded', 'hour', 'minute'])['occupancy'].mean()
+        self.overall = float(frame['occupancy'].mean())
+        return self
+
+    def predict(self, X):
+        slot = self.by_slot.reindex(pd.MultiIndex.from_frame(X[FEATURES])).to_numpy()
+        by_time = self.by_time.reindex(pd.MultiIndex.from_frame(X[['lot_id_encoded', 'hour', 'minute']])).to_numpy()
+        return np.where(np.isnan(slot), np.where(np.isnan(by_time), self.overall, by_time), slot)
+
+
+# name -> factory(n_jobs); lot and weekday codes are categorical for the gradient boosting models
+CANDIDATES = {
+    'rf_100': lambda n_jobs: RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs),
+    'rf_50_depth12': lambda n_jobs: RandomForestRegressor(n_estimators=50, max_depth=12, random_state=42,
+                                                          n_jobs=n_jobs),
+    'hgb_100': lambda n_jobs: HistGradientBoostingRegressor(max_iter=100, categorical_features=[0, 1],
+                                                            random_state=42),
+    'hgb_300_lr05': lambda n_jobs: HistGradientBoostingRegressor(max_iter=300, learning_rate=0.05,
+                                                                 categorical_features=[0, 1], random_state=42),
+    'seasonal_baseline': lambda n_jobs: SeasonalBaseline(),
+}
+
+
+# Expanding-window splits over whole buckets: each fold trains on everything before its test period
+def time_ordered_splits(timestamps, n_splits=3):
+    timestamps = timestamps.to_numpy()
+    buckets = np.unique(timestamps)
+    fold_size = len(buckets) // (n_splits + 1)
+    if fold_size == 0:
+        raise ValueError(f"Not enough time buckets ({len(buckets)}) for {n_splits} time-ordered splits")
+    for i in range(1, n_splits + 1):
+        test_start = buckets[i * fold_size]
+        test_end = buckets[(i + 1) * fold_size] if i < n_splits else None
+        train = timestamps < test_start
+        test = timestamps >= test_start
+        if test_end is not None:
+            test &= timestamps < test_end
+        yield train, test
+
+
+def _evaluate(name, fold, X_train, y_train, X_test, y_test, model_jobs=-1):
+    model = CANDIDATES[name](model_jobs)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    batch_seconds = time.perf_counter() - start
+
+    # Single-query latency, as the prediction service sees it on a cache miss
+    row = X_test.iloc[:1]
+    calls = []
+    for _ in range(LATENCY_CALLS):
+        start = time.perf_counter()
+        model.predict(row)
+        calls.append(time.perf_counter() - start)
+
+    return {
+        'model': name,
+        'fold': fold,
+        'train_rows': len(X_train),
+        'test_rows': len(X_test),
+        'fit_seconds': fit_seconds,
+        'batch_predict_us_per_row': batch_seconds / len(X_test) * 1e6,
+        'single_predict_ms': float(np.median(calls)) * 1e3,
+        'model_bytes': len(pickle.dumps(model)),
+        'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+    }
+
+
+# Every (candidate, fold) pair is an independent job spread across `n_jobs` processes.
+# When jobs run side by side each model fits single-threaded, so the cores are not oversubscribed
+# (joblib also caps the OpenMP threads of the gradient boosting models per worker); with n_jobs=1
+# the jobs run one after another and each model may use every core.
+def run_benchmark(df_model, candidates=None, n_splits=3, n_jobs=-1):
+    candidates = list(candidates or CANDIDATES)
+    unknown = set(candidates) - set(CANDIDATES)
+    if unknown:
+        raise ValueError(f"Unknown candidates: {', '.join(sorted(unknown))}")
+
+    X = df_model[FEATURES].reset_index(drop=True)
+    y = df_model['occupancy'].reset_index(drop=True)
+    timestamps = df_model['timestamp'].reset_index(drop=True)
+    splits = list(time_ordered_splits(timestamps, n_splits))
+    model_jobs = 1 if effective_n_jobs(n_jobs) > 1 else -1
+
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate)(name, fold, X[train], y[train], X[test], y[test], model_jobs)
+        for name in candidates
+        for fold, (train, test) in enumerate(splits)
+    )
+    per_fold = pd.DataFrame(results)
+    summary = (per_fold.groupby('model', sort=False)
+               .agg(rmse=('rmse', 'mean'), fit_seconds=('fit_seconds', 'mean'),
+                    batch_predict_us_per_row=('batch_predict_us_per_row', 'mean'),
+                    single_predict_ms=('single_predict_ms', 'median'), model_bytes=('model_bytes', 'max'))
+               .reset_index())
+    return summary, per_fold
+
+
+# Cheapest to serve among the models within the accuracy target
+def pick_model(summary, target_rmse):
+    eligible = summary[summary['rmse'] <= target_rmse]
+    if eligible.empty:
+        return None
+    return eligible.sort_values(['single_predict_ms', 'model_bytes', 'fit_seconds']).iloc[0]['model']
+
+
+def print_benchmark(summary, target_rmse=None):
+    print("\n🏁 Model benchmark (time-ordered splits):")
+    print(f"  {'model':<18} {'rmse':>8} {'fit s':>8} {'µs/row':>8} {'1-row ms':>9} {'size KB':>10}")
+    for row in summary.itertuples(index=False):
+        print(f"  {row.model:<18} {row.rmse:>8.2f} {row.fit_seconds:>8.2f} {row.batch_predict_us_per_row:>8.2f} "
+              f"{row.single_predict_ms:>9.2f} {row.model_bytes / 1024:>10.0f}")
+    if target_rmse is not None:
+        choice = pick_model(summary, target_rmse)
+        if choice is None:
+            print(f"\n❌ No candidate reaches RMSE {target_rmse:.2f}")
+        else:
+            print(f"\n✅ Cheapest model within RMSE {target_rmse:.2f}: {choice}")
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# Both event vocabularies: the parksmart logs use entry/exit, the v2 seeder OCCUPIED/VACANT
+EVENT_DELTAS = {'entry': 1, 'occupied': 1, 'exit': -1, 'vacant': -1}
+SPOT_COLUMNS = ['lot_id', 'sensor_id', 'spot_type']
+
+
+# +1 for an arrival, -1 for a departure, 0 for anything else
+def event_deltas(event_type):
+    if isinstance(event_type.dtype, pd.CategoricalDtype):
+        # Map the (few) categories rather than every row
+        codes = event_type.cat.codes.to_numpy()
+        lookup = np.array([EVENT_DELTAS.get(str(c).lower(), 0) for c in event_type.cat.categories] + [0], dtype=np.int32)
+        return pd.Series(lookup[codes], index=event_type.index)
+    return event_type.astype(str).str.lower().map(EVENT_DELTAS).fillna(0).astype(np.int32)
+
+
+# lot_id / sensor_id / spot_type from spot_seed.csv (columns by position: the seed header is not reliable)
+def load_spots(path):
+    spots = pd.read_csv(path, header=None, skiprows=1, usecols=[2, 3, 6], names=['lot_id', 'sensor_id', 'spot_type'],
+                        dtype=str)
+    spots['spot_type'] = spots['spot_type'].astype('category')
+    return spots[SPOT_COLUMNS]
+
+
+# Join each event to its spot's type (and lot, when the logs do not carry one)
+def attach_spots(df, spots):
+    columns = ['sensor_id', 'spot_type'] + (['lot_id'] if 'lot_id' not in df.columns else [])
+    sensor_ids = df['sensor_id'].astype(str)
+    lookup = spots.drop_duplicates('sensor_id').set_index('sensor_id')[columns[1:]]
+    joined = lookup.reindex(sensor_ids.to_numpy())
+    df = df.copy()
+    for column in columns[1:]:
+        df[column] = joined[column].to_numpy()
+    return df
+
+
+# Occupancy per group at the end of each `freq` bucket, from one sort + groupby-cumsum.
+# Returns one row per (group, bucket) with entry/exit counts, net_change and occupancy.
+# With dense=True every group gets every bucket in the covered range (occupancy carried forward),
+# which gives exact per-minute occupancy with freq='1min'.
+def occupancy_by_bucket(df, by=('lot_id',), freq='1min', dense=False, timestamp_column='timestamp'):
+    by = list(by)
+    delta = event_deltas(df['event_type'])
+    frame = df[by].copy()
+    frame[timestamp_column] = df['event_timestamp'].dt.floor(freq)
+    frame['entry'] = (delta > 0).astype(np.int32)
+    frame['exit'] = (delta < 0).astype(np.int32)
+    frame['net_change'] = delta.astype(np.int32)
+
+    grouped = (frame.groupby(by + [timestamp_column], observed=True, sort=True)[['entry', 'exit', 'net_change']]
+               .sum().reset_index())
+    grouped['occupancy'] = grouped.groupby(by, observed=True)['net_change'].cumsum()
+    if not dense or grouped.empty:
+        return grouped
+
+    buckets = pd.date_range(grouped[timestamp_column].min(), grouped[timestamp_column].max(), freq=freq)
+    groups = grouped[by].drop_duplicates()
+    full_index = pd.MultiIndex.from_arrays(
+        [np.repeat(groups[column].to_numpy(), len(buckets)) for column in by]
+        + [np.tile(buckets.to_numpy(), len(groups))],
+        names=by + [timestamp_column],
+    )
+    dense_frame = grouped.set_index(by + [timestamp_column]).reindex(full_index)
+    dense_frame[['entry', 'exit', 'net_change']] = dense_frame[['entry', 'exit', 'net_change']].fillna(0).astype(np.int32)
+    dense_frame['occupancy'] = (dense_frame.groupby(level=by, observed=True)['occupancy'].ffill()
+                                .fillna(0).astype(np.int64))
+    return dense_frame.reset_index()
@@ -0,0 +1,83 @@
+import json
+
+import pandas as pd
+
+WEEKDAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+# All report insights from one occupancy frame (timestamp, lot_id, name, weekday, hour, date,
+# entry, exit, occupancy), using a single lot/weekday x hour cube and a single date/bucket flow table
+def compute_insights(df_occupancy):
+    # 1. Peak occupancy hour per lot/weekday: mean occupancy cube, argmax across the hour axis
+    cube = df_occupancy.pivot_table(index=['lot_id', 'name', 'weekday'], columns='hour', values='occupancy',
+                                    aggfunc='mean', observed=True)
+    peaks = cube.idxmax(axis=1).rename('peak_hour').reset_index()
+    peaks['peak_occupancy'] = cube.max(axis=1).to_numpy()
+    peaks['weekday_order'] = peaks['weekday'].map({day: i for i, day in enumerate(WEEKDAY_ORDER)})
+    peaks = peaks.sort_values(['lot_id', 'weekday_order']).drop(columns='weekday_order')
+
+    # 2. Highest occupancy moment
+    max_row = df_occupancy.loc[df_occupancy['occupancy'].idxmax()]
+    highest = {
+        'lot_id': max_row['lot_id'],
+        'name': max_row['name'],
+        'timestamp': max_row['timestamp'],
+        'occupancy': max_row['occupancy'],
+    }
+
+    # 3. Busiest incoming/outgoing bucket per day, from one flow table
+    flows = df_occupancy.groupby(['date', 'timestamp'], observed=True)[['entry', 'exit']].sum()
+    busiest = flows.groupby(level='date').idxmax()
+    traffic = pd.DataFrame({
+        'date': busiest.index,
+        'busiest_incoming': [ts for _, ts in busiest['entry']],
+        'busiest_outgoing': [ts for _, ts in busiest['exit']],
+    })
+
+    return {'peak_hours': peaks, 'highest_occupancy': highest, 'busiest_traffic': traffic}
+
+
+def print_insights(insights):
+    print("\n📈 Peak Occupancy Hours per Lot/Weekday:")
+    for row in insights['peak_hours'].itertuples(index=False):
+        print(f"  Lot {row.name} ({row.lot_id}), {row.weekday}: {int(row.peak_hour)}:00")
+
+    highest = insights['highest_occupancy']
+    print(f"\n🚗 Highest Occupancy: {highest['occupancy']} at {highest['timestamp']} in Lot {highest['name']}")
+
+    print("\n🔼 Busiest 30-min Incoming Traffic:")
+    for row in insights['busiest_traffic'].itertuples(index=False):
+        print(f"  {row.date}: {row.busiest_incoming.time()}")
+
+    print("\n🔽 Busiest 30-min Outgoing Traffic:")
+    for row in insights['busiest_traffic'].itertuples(index=False):
+        print(f"  {row.date}: {row.busiest_outgoing.time()}")
+
+
+def _jsonable(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+# Machine-readable output: one JSON document, or (for .parquet) one table per section
+# written next to each other as <stem>.<section>.parquet
+def save_insights(insights, path):
+    if path.endswith('.parquet'):
+        stem = path[:-len('.parquet')]
+        insights['peak_hours'].to_parquet(f"{stem}.peak_hours.parquet", index=False)
+        pd.DataFrame([insights['highest_occupancy']]).to_parquet(f"{stem}.highest_occupancy.parquet", index=False)
+        insights['busiest_traffic'].to_parquet(f"{stem}.busiest_traffic.parquet", index=False)
+        return
+
+    document = {
+        'peak_hours': [{k: _jsonable(v) for k, v in row.items()}
+                       for row in insights['peak_hours'].to_dict(orient='records')],
+        'highest_occupancy': {k: _jsonable(v) for k, v in insights['highest_occupancy'].items()},
+        'busiest_traffic': [{k: _jsonable(v) for k, v in row.items()}
+                            for row in insights['busiest_traffic'].to_dict(orient='records')],
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
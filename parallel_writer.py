@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+
+SERIALIZATION_FAILURE = "40001"
+
+
+# Spreads INSERT batches across N autocommit connections, one per worker thread.
+# submit() blocks once max_pending batches are queued or in flight (backpressure),
+# batches that hit a CockroachDB serialization failure (40001) are retried with
+# jittered exponential backoff, and close() prints a throughput report.
+class ParallelWriter:
+    def __init__(self, connect, workers=4, max_pending=None, max_retries=5, backoff=0.05):
+        self.connect = connect
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="writer")
+        self.slots = threading.BoundedSemaphore(max_pending or workers * 2)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections = []
+        self.errors = []
+        self.rows = 0
+        self.batches = 0
+        self.retries = 0
+        self.start = time.time()
+
+    def __enter__(self):
+        return self
+
+    # While an exception is already unwinding, worker errors are only printed so they do not replace it
+    def __exit__(self, exc_type, exc, tb):
+        self.close(report=exc_type is None, raise_errors=exc_type is None)
+
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.connect()
+            conn.autocommit = True
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def _write(self, statement, template, rows):
+        conn = self._connection()
+        for attempt in range(self.max_retries + 1):
+            try:
+                with conn.cursor() as cur:
+                    args_str = b",".join(cur.mogrify(template, row) for row in rows)
+                    cur.execute(statement + args_str)
+                break
+            except psycopg2.Error as e:
+                if e.pgcode != SERIALIZATION_FAILURE or attempt == self.max_retries:
+                    raise
+                with self.lock:
+                    self.retries += 1
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+        with self.lock:
+            self.rows += len(rows)
+            self.batches += 1
+
+    def _done(self, future):
+        self.slots.release()
+        if future.exception() is not None:
+            with self.lock:
+                self.errors.append(future.exception())
+
+    # statement is the INSERT prefix ending in "VALUES ", template the per-row placeholder
+    def submit(self, statement, template, rows):
+        if self.errors:
+            raise self.errors[0]
+        if isinstance(statement, str):
+            statement = statement.encode()
+        self.slots.acquire()
+        self.executor.submit(self._write, statement, template, rows).add_done_callback(self._done)
+
+    def close(self, report=True, raise_errors=True):
+        self.executor.shutdown(wait=True)
+        for conn in self.connections:
+            conn.close()
+        if self.errors:
+            if raise_errors:
+                raise self.errors[0]
+            for error in self.errors:
+                print(f"[WARN] Writer batch failed: {error!r}")
+        if report:
+            self.report()
+
+    def report(self):
+        elapsed = time.time() - self.start
+        rate = self.rows / elapsed if elapsed else 0.0
+        print(f"📈 Throughput: {self.rows} rows in {self.batches} batches over {elapsed:.2f}s "
+              f"({rate:,.0f} rows/s, {self.workers} connections, {self.retries} retries)")
@@ -174,3 +174,29 @@ CREATE TABLE park_smart.lot_history (
 );
 CREATE INDEX idx_lot_history_lot_id ON park_smart.lot_history (lot_id);
 CREATE INDEX idx_lot_history_history_timestamp ON park_smart.lot_history (history_timestamp);
+
+-- Lot Occupancy Rollup Table (maintained by lot_rollups.py from sensor_logs)
+-- One row per lot, bucket size ('1m', '15m', '30m', '1h') and bucket; occupied_* is the occupancy at the end of the bucket
+CREATE TABLE park_smart.lot_occupancy_rollup (
+    lot_id UUID NOT NULL REFERENCES park_smart.lot(id),
+    bucket_size STRING NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    entries INT NOT NULL,
+    exits INT NOT NULL,
+    occupied_spots INT NOT NULL,
+    occupied_regular_spots INT NOT NULL,
+    occupied_ada_spots INT NOT NULL,
+    occupied_ev_spots INT NOT NULL,
+    peak_occupied_spots INT NOT NULL,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    PRIMARY KEY (lot_id, bucket_size, bucket_start)
+);
+CREATE INDEX idx_lot_occupancy_rollup_bucket ON park_smart.lot_occupancy_rollup (bucket_size, bucket_start);
+
+-- Rollup Watermark Table (last sensor_logs event_timestamp each rollup job has processed)
+CREATE TABLE park_smart.rollup_watermark (
+    job STRING PRIMARY KEY,
+    watermark TIMESTAMP NOT NULL,
+    commit_watermark DECIMAL,  -- cluster_logical_timestamp() the run that wrote `watermark` read at
+    updated_at TIMESTAMP DEFAULT current_timestamp
+);
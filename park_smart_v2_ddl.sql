@@ -0,0 +1,217 @@
+-- Revised ParkSmart schema for the hot query paths (CockroachDB)
+-- Same tables and columns as park_smar_ddl.sql, plus:
+--   * sensor_logs keyed on a hash-sharded (event_timestamp, id) primary key, so time-ordered inserts
+--     and "latest N events" reads are spread over shards instead of one hot range at the index tail
+--   * sensor_logs.lot_id denormalized from sensor -> spot -> lot, so lot/time queries skip the joins
+--   * composite (sensor_id, time) and (lot_id, time) indexes with STORING clauses that cover the
+--     dashboard, extractor and rollup queries
+-- query_benchmark.py creates this schema, backfills it from park_smart and compares query plans.
+
+-- Switch to the target database
+USE social_elves;
+
+-- Create schema if not exists
+CREATE SCHEMA IF NOT EXISTS park_smart_v2;
+
+-- Office Table
+CREATE TABLE park_smart_v2.office (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    office_id STRING NOT NULL,
+    name STRING NOT NULL,
+    address STRING,
+    status STRING,
+    status_description STRING,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_office_office_id ON park_smart_v2.office (office_id);
+
+-- Block Table
+CREATE TABLE park_smart_v2.block (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    block_id STRING NOT NULL,
+    name STRING NOT NULL,
+    office_id UUID NOT NULL REFERENCES park_smart_v2.office(id),
+    status STRING,
+    status_description STRING,
+    total_workstations INT,
+    nearest_lots STRING,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_block_block_id ON park_smart_v2.block (block_id);
+CREATE INDEX idx_block_office_id ON park_smart_v2.block (office_id);
+
+-- Lot Table
+CREATE TABLE park_smart_v2.lot (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    lot_id STRING NOT NULL,
+    office_id UUID NOT NULL REFERENCES park_smart_v2.office(id),
+    name STRING NOT NULL,
+    location STRING,
+    status STRING,
+    status_description STRING,
+    total_spots INT,
+    total_regular_spots INT,
+    total_ada_spots INT,
+    total_ev_spots INT,
+    available_spots INT,
+    available_regular_spots INT,
+    available_ada_spots INT,
+    available_ev_spots INT,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_lot_lot_id ON park_smart_v2.lot (lot_id);
+CREATE INDEX idx_lot_office_id ON park_smart_v2.lot (office_id);
+
+-- Spot Table
+CREATE TABLE park_smart_v2.spot (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    spot_id STRING NOT NULL,
+    lot_id UUID NOT NULL REFERENCES park_smart_v2.lot(id),
+    sensor_id UUID,
+    status STRING,
+    status_description STRING,
+    type STRING,
+    row_number INT,
+    position_number INT,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_spot_spot_id ON park_smart_v2.spot (spot_id);
+CREATE INDEX idx_spot_lot_id ON park_smart_v2.spot (lot_id) STORING (type, status);
+CREATE INDEX idx_spot_sensor_id ON park_smart_v2.spot (sensor_id) STORING (lot_id, type);
+
+-- Sensor Table
+CREATE TABLE park_smart_v2.sensor (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    sensor_id STRING NOT NULL,
+    spot_id UUID NOT NULL REFERENCES park_smart_v2.spot(id),
+    status STRING,
+    status_description STRING,
+    type STRING,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_sensor_sensor_id ON park_smart_v2.sensor (sensor_id);
+CREATE INDEX idx_sensor_spot_id ON park_smart_v2.sensor (spot_id);
+
+-- Sensor Logs Table
+-- lot_id is denormalized (sensor -> spot -> lot) and must be set by writers
+CREATE TABLE park_smart_v2.sensor_logs (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    event_timestamp TIMESTAMP NOT NULL,
+    event_type STRING NOT NULL,
+    sensor_id UUID NOT NULL REFERENCES park_smart_v2.sensor(id),
+    lot_id UUID NOT NULL REFERENCES park_smart_v2.lot(id),
+    parking_tag STRING,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING,
+    PRIMARY KEY (event_timestamp, id) USING HASH WITH (bucket_count = 16)
+);
+CREATE INDEX idx_sensor_logs_sensor_time ON park_smart_v2.sensor_logs (sensor_id, event_timestamp DESC)
+    STORING (event_type, lot_id);
+CREATE INDEX idx_sensor_logs_lot_time ON park_smart_v2.sensor_logs (lot_id, event_timestamp DESC)
+    STORING (sensor_id, event_type);
+
+-- Employee Table
+CREATE TABLE park_smart_v2.employee (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    employee_id STRING NOT NULL,
+    name STRING NOT NULL,
+    office_id UUID NOT NULL REFERENCES park_smart_v2.office(id),
+    block_id UUID REFERENCES park_smart_v2.block(id),
+    status STRING,
+    start_date DATE,
+    end_date DATE,
+    type STRING,
+    last_parked_lot UUID REFERENCES park_smart_v2.lot(id),
+    preferred_lots STRING,
+    parking_tag STRING UNIQUE,
+    password STRING,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_employee_employee_id ON park_smart_v2.employee (employee_id);
+CREATE INDEX idx_employee_office_id ON park_smart_v2.employee (office_id);
+CREATE INDEX idx_employee_block_id ON park_smart_v2.employee (block_id);
+CREATE INDEX idx_employee_last_parked_lot ON park_smart_v2.employee (last_parked_lot);
+
+-- Employee Parking History Table
+CREATE TABLE park_smart_v2.employee_parking_history (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    employee_id UUID NOT NULL REFERENCES park_smart_v2.employee(id),
+    event_timestamp TIMESTAMP NOT NULL,
+    event_type STRING NOT NULL,
+    lot_id UUID REFERENCES park_smart_v2.lot(id),
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_eph_employee_time ON park_smart_v2.employee_parking_history (employee_id, event_timestamp DESC)
+    STORING (event_type, lot_id);
+CREATE INDEX idx_eph_lot_time ON park_smart_v2.employee_parking_history (lot_id, event_timestamp DESC)
+    STORING (employee_id, event_type);
+
+-- Lot History Table
+CREATE TABLE park_smart_v2.lot_history (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    lot_id UUID NOT NULL REFERENCES park_smart_v2.lot(id),
+    history_timestamp TIMESTAMP NOT NULL,
+    total_spots INT,
+    total_regular_spots INT,
+    total_ada_spots INT,
+    total_ev_spots INT,
+    available_spots INT,
+    available_regular_spots INT,
+    available_ada_spots INT,
+    available_ev_spots INT,
+    created_at TIMESTAMP DEFAULT current_timestamp,
+    created_by STRING,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    updated_by STRING
+);
+CREATE INDEX idx_lot_history_lot_time ON park_smart_v2.lot_history (lot_id, history_timestamp DESC)
+    STORING (total_spots, available_spots, available_regular_spots, available_ada_spots, available_ev_spots);
+
+-- Lot Occupancy Rollup Table (maintained by lot_rollups.py from sensor_logs)
+CREATE TABLE park_smart_v2.lot_occupancy_rollup (
+    lot_id UUID NOT NULL REFERENCES park_smart_v2.lot(id),
+    bucket_size STRING NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    entries INT NOT NULL,
+    exits INT NOT NULL,
+    occupied_spots INT NOT NULL,
+    occupied_regular_spots INT NOT NULL,
+    occupied_ada_spots INT NOT NULL,
+    occupied_ev_spots INT NOT NULL,
+    peak_occupied_spots INT NOT NULL,
+    updated_at TIMESTAMP DEFAULT current_timestamp,
+    PRIMARY KEY (lot_id, bucket_size, bucket_start)
+);
+CREATE INDEX idx_lot_occupancy_rollup_bucket ON park_smart_v2.lot_occupancy_rollup (bucket_size, bucket_start)
+    STORING (occupied_spots, peak_occupied_spots);
+
+-- Rollup Watermark Table
+CREATE TABLE park_smart_v2.rollup_watermark (
+    job STRING PRIMARY KEY,
+    watermark TIMESTAMP NOT NULL,
+    commit_watermark DECIMAL,  -- cluster_logical_timestamp() the run that wrote `watermark` read at
+    updated_at TIMESTAMP DEFAULT current_timestamp
+);
@@ -0,0 +1,208 @@
+import argparse
+import csv
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import joblib
+import numpy as np
+import pandas as pd
+
+MODEL_FILE = "availability_model.joblib"
+FEATURES = ['lot_id_encoded', 'weekday_encoded', 'hour', 'minute']
+TIMESTAMP_FORMATS = ["%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S"]
+
+
+def parse_timestamp(value):
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid timestamp {value!r}, expected a 'YYYY-MM-DD HH:MM' string")
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid timestamp '{value}', expected YYYY-MM-DD HH:MM")
+
+
+# Loads the model written by analyze_sensor_logs.py once (tree arrays memory-mapped)
+# and answers batches of (lot, timestamp) queries. Results are cached per
+# (lot, weekday, hour, minute) in an LRU, and only cache misses reach the model,
+# in a single predict call per batch.
+class OccupancyPredictor:
+    def __init__(self, model_file=MODEL_FILE, cache_size=100_000):
+        start = time.time()
+        self.model, lot_id_map, self.weekday_map = joblib.load(model_file, mmap_mode='r')
+        # Accept lot ids as given on the command line / in JSON as well as their trained type
+        self.lot_id_map = {str(lot_id): code for lot_id, code in lot_id_map.items()}
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        print(f"✅ Loaded {model_file} in {time.time() - start:.2f}s "
+              f"({len(self.lot_id_map)} lots, {len(self.weekday_map)} weekdays)")
+
+    def _key(self, lot_id, timestamp):
+        return str(lot_id), timestamp.strftime('%A'), timestamp.hour, timestamp.minute
+
+    def predict_many(self, queries):
+        keys = [self._key(lot_id, timestamp) for lot_id, timestamp in queries]
+        results = [None] * len(keys)
+        errors = [None] * len(keys)
+        missing = {}
+
+        with self.lock:
+            for i, key in enumerate(keys):
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                    results[i] = self.cache[key]
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+            self.misses += len(missing)
+
+        rows, row_keys = [], []
+        for key, positions in missing.items():
+            lot, weekday, hour, minute = key
+            encoded_lot = self.lot_id_map.get(lot)
+            encoded_weekday = self.weekday_map.get(weekday)
+            if encoded_lot is None:
+                error = f"Lot ID {lot} not found in training data."
+            elif encoded_weekday is None:
+                error = f"Weekday '{weekday}' not found in training data."
+            else:
+                rows.append((encoded_lot, encoded_weekday, hour, minute))
+                row_keys.append(key)
+                continue
+            for i in positions:
+                errors[i] = error
+
+        if rows:
+            predictions = self.model.predict(pd.DataFrame(rows, columns=FEATURES))
+            with self.lock:
+                for key, value in zip(row_keys, np.asarray(predictions).tolist()):
+                    self.cache[key] = value
+                    for i in missing[key]:
+                        results[i] = value
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+        return results, errors
+
+    def predict(self, lot_id, timestamp):
+        results, errors = self.predict_many([(lot_id, timestamp)])
+        if errors[0]:
+            raise KeyError(errors[0])
+        return results[0]
+
+
+def run_batch(predictor, input_file, output_file):
+    reader = csv.DictReader(input_file)
+    queries = [(row['lot_id'], parse_timestamp(row['timestamp'])) for row in reader]
+    start = time.time()
+    results, errors = predictor.predict_many(queries)
+    elapsed = time.time() - start
+
+    writer = csv.writer(output_file)
+    writer.writerow(['lot_id', 'timestamp', 'predicted_occupancy', 'error'])
+    for (lot_id, timestamp), result, error in zip(queries, results, errors):
+        writer.writerow([lot_id, timestamp, '' if result is None else f"{result:.2f}", error or ''])
+    print(f"🔮 Predicted {len(queries)} queries in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+def make_handler(predictor):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _answer(self, items):
+            try:
+                queries = [(item['lot_id'], parse_timestamp(item['timestamp'])) for item in items]
+            except (KeyError, TypeError, ValueError) as e:
+                self._send(400, {'error': f"Bad query: {e}"})
+                return
+            results, errors = predictor.predict_many(queries)
+            self._send(200, {'predictions': [
+                {'lot_id': item['lot_id'], 'timestamp': item['timestamp'], 'predicted_occupancy': result, 'error': error}
+                for item, result, error in zip(items, results, errors)
+            ]})
+
+        # GET /predict?lot_id=1000&timestamp=2025-06-02+09:00  |  GET /health
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                self._send(200, {'status': 'ok', 'cache_size': len(predictor.cache),
+                                 'hits': predictor.hits, 'misses': predictor.misses})
+            elif url.path == "/predict":
+                params = parse_qs(url.query)
+                self._answer([{'lot_id': params.get('lot_id', [None])[0],
+                               'timestamp': params.get('timestamp', [None])[0]}])
+            else:
+                self._send(404, {'error': 'Not found'})
+
+        # POST /predict with {"queries": [{"lot_id": ..., "timestamp": "YYYY-MM-DD HH:MM"}, ...]}
+        def do_POST(self):
+            if urlparse(self.path).path != "/predict":
+                self._send(404, {'error': 'Not found'})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("expected a JSON object")
+                items = body['queries']
+            except (ValueError, KeyError) as e:
+                self._send(400, {'error': f"Bad request body: {e}"})
+                return
+            self._answer(items)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return PredictionHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Occupancy predictions from the cached availability model")
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--cache-size", type=int, default=100_000, help="LRU entries keyed on (lot, weekday, hour, minute)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Predict a CSV of lot_id,timestamp rows")
+    batch.add_argument("--input", help="Input CSV (default: stdin)")
+    batch.add_argument("--output", help="Output CSV (default: stdout)")
+
+    serve = subparsers.add_parser("serve", help="Serve predictions over a local HTTP API")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+
+    args = parser.parse_args()
+    predictor = OccupancyPredictor(args.model, cache_size=args.cache_size)
+
+    if args.command == "batch":
+        input_file = open(args.input, newline='') if args.input else sys.stdin
+        output_file = open(args.output, 'w', newline='') if args.output else sys.stdout
+        try:
+            run_batch(predictor, input_file, output_file)
+        finally:
+            if args.input:
+                input_file.close()
+            if args.output:
+                output_file.close()
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(predictor))
+        print(f"🚀 Serving predictions on http://{args.host}:{args.port}/predict")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
@@ -0,0 +1,259 @@
+import argparse
+import re
+import statistics
+import time
+from datetime import timedelta
+
+import psycopg2
+
+OLD_SCHEMA = "park_smart"
+NEW_SCHEMA = "park_smart_v2"
+DDL_FILE = "park_smart_v2_ddl.sql"
+
+# Copy order follows the foreign keys; sensor_logs is copied day by day with its lot_id filled in
+BACKFILL_TABLES = ["office", "block", "lot", "spot", "sensor", "employee", "employee_parking_history",
+                   "lot_history", "lot_occupancy_rollup", "rollup_watermark"]
+BACKFILL_SENSOR_LOGS = f"""
+    INSERT INTO {NEW_SCHEMA}.sensor_logs (id, event_timestamp, event_type, sensor_id, lot_id, parking_tag,
+                                          created_at, created_by, updated_at, updated_by)
+    SELECT l.id, l.event_timestamp, l.event_type, l.sensor_id, sp.lot_id, l.parking_tag,
+           l.created_at, l.created_by, l.updated_at, l.updated_by
+    FROM {OLD_SCHEMA}.sensor_logs l
+    JOIN {OLD_SCHEMA}.sensor s ON s.id = l.sensor_id
+    JOIN {OLD_SCHEMA}.spot sp ON sp.id = s.spot_id
+    WHERE l.event_timestamp >= %s AND l.event_timestamp < %s
+"""
+
+# name -> (query on the original schema, same result on the revised schema)
+QUERIES = {
+    # Dashboard: latest events
+    "latest_logs": (
+        f"""SELECT id, sensor_id, event_type, event_timestamp FROM {OLD_SCHEMA}.sensor_logs
+            ORDER BY event_timestamp DESC LIMIT 10""",
+        f"""SELECT id, sensor_id, event_type, event_timestamp FROM {NEW_SCHEMA}.sensor_logs
+            ORDER BY event_timestamp DESC LIMIT 10""",
+    ),
+    # Extractor: time-range export with lot names
+    "range_export": (
+        f"""SELECT sp.lot_id, lo.name, l.sensor_id, l.event_type, l.event_timestamp
+            FROM {OLD_SCHEMA}.sensor_logs l
+            JOIN {OLD_SCHEMA}.sensor s ON s.id = l.sensor_id
+            JOIN {OLD_SCHEMA}.spot sp ON sp.id = s.spot_id
+            JOIN {OLD_SCHEMA}.lot lo ON lo.id = sp.lot_id
+            WHERE l.event_timestamp >= %(start)s AND l.event_timestamp < %(end)s
+            ORDER BY l.event_timestamp""",
+        f"""SELECT l.lot_id, lo.name, l.sensor_id, l.event_type, l.event_timestamp
+            FROM {NEW_SCHEMA}.sensor_logs l
+            JOIN {NEW_SCHEMA}.lot lo ON lo.id = l.lot_id
+            WHERE l.event_timestamp >= %(start)s AND l.event_timestamp < %(end)s
+            ORDER BY l.event_timestamp""",
+    ),
+    # Recent history of one sensor
+    "sensor_recent": (
+        f"""SELECT event_type, event_timestamp FROM {OLD_SCHEMA}.sensor_logs
+            WHERE sensor_id = %(sensor_id)s ORDER BY event_timestamp DESC LIMIT 50""",
+        f"""SELECT event_type, event_timestamp FROM {NEW_SCHEMA}.sensor_logs
+            WHERE sensor_id = %(sensor_id)s ORDER BY event_timestamp DESC LIMIT 50""",
+    ),
+    # One lot over a time window
+    "lot_window": (
+        f"""SELECT l.sensor_id, l.event_type, l.event_timestamp
+            FROM {OLD_SCHEMA}.sensor_logs l
+            JOIN {OLD_SCHEMA}.sensor s ON s.id = l.sensor_id
+            JOIN {OLD_SCHEMA}.spot sp ON sp.id = s.spot_id
+            WHERE sp.lot_id = %(lot_id)s AND l.event_timestamp >= %(start)s AND l.event_timestamp < %(end)s
+            ORDER BY l.event_timestamp DESC""",
+        f"""SELECT sensor_id, event_type, event_timestamp FROM {NEW_SCHEMA}.sensor_logs
+            WHERE lot_id = %(lot_id)s AND event_timestamp >= %(start)s AND event_timestamp < %(end)s
+            ORDER BY event_timestamp DESC""",
+    ),
+    # Event counts per lot over a time window
+    "lot_counts": (
+        f"""SELECT sp.lot_id, count(*)
+            FROM {OLD_SCHEMA}.sensor_logs l
+            JOIN {OLD_SCHEMA}.sensor s ON s.id = l.sensor_id
+            JOIN {OLD_SCHEMA}.spot sp ON sp.id = s.spot_id
+            WHERE l.event_timestamp >= %(start)s AND l.event_timestamp < %(end)s
+            GROUP BY sp.lot_id""",
+        f"""SELECT lot_id, count(*) FROM {NEW_SCHEMA}.sensor_logs
+            WHERE event_timestamp >= %(start)s AND event_timestamp < %(end)s
+            GROUP BY lot_id""",
+    ),
+    # Availability history of one lot
+    "lot_history": (
+        f"""SELECT history_timestamp, available_spots FROM {OLD_SCHEMA}.lot_history
+            WHERE lot_id = %(lot_id)s ORDER BY history_timestamp DESC LIMIT 96""",
+        f"""SELECT history_timestamp, available_spots FROM {NEW_SCHEMA}.lot_history
+            WHERE lot_id = %(lot_id)s ORDER BY history_timestamp DESC LIMIT 96""",
+    ),
+}
+
+EXECUTION_TIME = re.compile(r"execution time:\s*([\d.]+)\s*(µs|us|ms|s)\b", re.IGNORECASE)
+UNIT_MS = {"µs": 0.001, "us": 0.001, "ms": 1.0, "s": 1000.0}
+
+
+def read_db_credentials(path, headless=False):
+    try:
+        with open(path, 'r') as f:
+            lines = f.readlines()
+            user = lines[0].split(':')[1].strip()
+            password = lines[1].split(':')[1].strip()
+            return user, password
+    except FileNotFoundError:
+        if headless:
+            raise RuntimeError("[ERROR] Missing secrets/pwd.txt in headless mode")
+        print("Password file not found. Please enter manually.")
+        user = input("Enter DB user: ")
+        password = input("Enter DB password: ")
+        return user, password
+
+
+# A local instance is reached with --dsn (e.g. postgresql://root@localhost:26257/social_elves?sslmode=disable)
+def get_connection(dsn=None, headless=False):
+    if dsn:
+        return psycopg2.connect(dsn)
+    user, password = read_db_credentials("secrets/pwd.txt", headless=headless)
+    return psycopg2.connect(
+        dbname="social_elves",
+        user=user,
+        password=password,
+        host="social-elves-11376.j77.aws-us-west-2.cockroachlabs.cloud",
+        port=26257,
+        sslmode="require"
+    )
+
+
+def ddl_statements(path):
+    with open(path) as f:
+        text = "\n".join(line for line in f if not line.lstrip().startswith("--"))
+    return [statement.strip() for statement in text.split(";")
+            if statement.strip() and not statement.strip().upper().startswith("USE ")]
+
+
+def create_schema(conn, path=DDL_FILE):
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {NEW_SCHEMA} CASCADE")
+        for statement in ddl_statements(path):
+            cur.execute(statement)
+    print(f"✅ Created {NEW_SCHEMA} from {path}")
+
+
+def backfill(conn):
+    start = time.time()
+    with conn.cursor() as cur:
+        for table in BACKFILL_TABLES:
+            cur.execute(f"INSERT INTO {NEW_SCHEMA}.{table} SELECT * FROM {OLD_SCHEMA}.{table}")
+            print(f"[INFO] {table}: {cur.rowcount} rows")
+
+        cur.execute(f"SELECT min(event_timestamp), max(event_timestamp) FROM {OLD_SCHEMA}.sensor_logs")
+        first, last = cur.fetchone()
+        copied = 0
+        day = None if first is None else first.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day is not None and day <= last:
+            cur.execute(BACKFILL_SENSOR_LOGS, (day, day + timedelta(days=1)))
+            copied += cur.rowcount
+            day += timedelta(days=1)
+        print(f"[INFO] sensor_logs: {copied} rows")
+
+        for table in BACKFILL_TABLES + ["sensor_logs"]:
+            cur.execute(f"ANALYZE {NEW_SCHEMA}.{table}")
+    print(f"✅ Backfilled {NEW_SCHEMA} in {time.time() - start:.1f}s")
+
+
+# A recent sensor / lot and a time window ending at the newest event, shared by both schemas
+def sample_params(conn, window):
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            SELECT l.sensor_id, sp.lot_id, l.event_timestamp
+            FROM {OLD_SCHEMA}.sensor_logs l
+            JOIN {OLD_SCHEMA}.sensor s ON s.id = l.sensor_id
+            JOIN {OLD_SCHEMA}.spot sp ON sp.id = s.spot_id
+            ORDER BY l.event_timestamp DESC LIMIT 1
+        """)
+        row = cur.fetchone()
+    if row is None:
+        raise RuntimeError(f"[ERROR] {OLD_SCHEMA}.sensor_logs is empty, seed it first")
+    sensor_id, lot_id, end = row
+    return {"sensor_id": sensor_id, "lot_id": lot_id, "start": end - window, "end": end + timedelta(microseconds=1)}
+
+
+def explain_analyze(cur, query, params):
+    cur.execute("EXPLAIN ANALYZE " + query, params)
+    plan = "\n".join(str(row[0]) for row in cur.fetchall())
+    match = EXECUTION_TIME.search(plan)
+    execution_ms = float(match.group(1)) * UNIT_MS[match.group(2)] if match else None
+    return plan, execution_ms
+
+
+# Median client-side latency over `runs` executions, after one warm-up
+def time_query(cur, query, params, runs):
+    cur.execute(query, params)
+    cur.fetchall()
+    timings = []
+    rows = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        cur.execute(query, params)
+        rows = len(cur.fetchall())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), rows
+
+
+def run_benchmark(conn, params, runs=5, names=None, plans_out=None):
+    results = []
+    plans = []
+    with conn.cursor() as cur:
+        for name in names or QUERIES:
+            row = {"query": name}
+            for label, query in zip(("old", "new"), QUERIES[name]):
+                plan, execution_ms = explain_analyze(cur, query, params)
+                median_ms, rows = time_query(cur, query, params, runs)
+                row.update({f"{label}_ms": median_ms, f"{label}_exec_ms": execution_ms, f"{label}_rows": rows})
+                plans.append(f"=== {name} ({label} schema) ===\n{cur.mogrify(query, params).decode()}\n\n{plan}\n")
+            results.append(row)
+
+    if plans_out:
+        with open(plans_out, "w") as f:
+            f.write("\n".join(plans))
+    return results
+
+
+def print_results(results):
+    def fmt(value):
+        return "-" if value is None else f"{value:.1f}"
+
+    print(f"\n⏱️  Median latency in ms (old {OLD_SCHEMA} vs new {NEW_SCHEMA}; exec = EXPLAIN ANALYZE execution time)")
+    print(f"  {'query':<14} {'old':>9} {'new':>9} {'speedup':>8} {'old exec':>9} {'new exec':>9} {'rows':>8}")
+    for row in results:
+        speedup = row["old_ms"] / row["new_ms"] if row["new_ms"] else float("inf")
+        rows = str(row["old_rows"]) if row["old_rows"] == row["new_rows"] else f"{row['old_rows']}≠{row['new_rows']}"
+        print(f"  {row['query']:<14} {row['old_ms']:>9.1f} {row['new_ms']:>9.1f} {speedup:>7.1f}x "
+              f"{fmt(row['old_exec_ms']):>9} {fmt(row['new_exec_ms']):>9} {rows:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"Compare hot query plans on {OLD_SCHEMA} and {NEW_SCHEMA}")
+    parser.add_argument("--dsn", help="Connection string for a local CockroachDB (default: the cloud cluster)")
+    parser.add_argument("--setup", action="store_true", help=f"(Re)create {NEW_SCHEMA} from {DDL_FILE}")
+    parser.add_argument("--backfill", action="store_true", help=f"Copy the seeded data from {OLD_SCHEMA}")
+    parser.add_argument("--queries", nargs="+", choices=list(QUERIES), help="Queries to run (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Timed executions per query and schema")
+    parser.add_argument("--window-hours", type=float, default=24, help="Time window for the range queries")
+    parser.add_argument("--plans-out", default="query_plans.txt", help="Write the EXPLAIN ANALYZE plans here")
+    parser.add_argument("--headless", action="store_true", help="Fail instead of prompting for credentials")
+    args = parser.parse_args()
+
+    conn = get_connection(args.dsn, headless=args.headless)
+    conn.autocommit = True
+    try:
+        if args.setup:
+            create_schema(conn)
+        if args.backfill:
+            backfill(conn)
+        params = sample_params(conn, timedelta(hours=args.window_hours))
+        print(f"[INFO] sensor {params['sensor_id']}, lot {params['lot_id']}, window {params['start']} → {params['end']}")
+        results = run_benchmark(conn, params, runs=args.runs, names=args.queries, plans_out=args.plans_out)
+        print_results(results)
+        print(f"\n✅ Plans saved to {args.plans_out}")
+    finally:
+        conn.close()
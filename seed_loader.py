@@ -0,0 +1,183 @@
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+
+from bulk_loader import SEED_FILES, source_key
+from columnar_io import CATEGORICAL
+from seed_sinks import AUDIT_COLUMNS, SEED_HEADERS
+
+# Parsed seed files are cached next to them as Arrow IPC files and memory-mapped on later runs
+CACHE_DIR = ".cache"
+# Bump when the column types below change, so existing caches are re-parsed
+CACHE_VERSION = "2"
+
+# Primary keys are 16-byte values; foreign keys (few distinct values) are codes into a 16-byte dictionary
+UUID_TYPE = pa.binary(16)
+UUID_CODES = pa.dictionary(pa.int32(), UUID_TYPE)
+
+# Column types per seed file; anything not listed is kept as a string.
+# The audit columns are the same in every row of a run and are not loaded.
+SEED_COLUMN_TYPES = {
+    "office": {"id": UUID_TYPE, "status": CATEGORICAL},
+    "block": {"id": UUID_TYPE, "office_id": UUID_CODES, "status": CATEGORICAL, "total_workstations": pa.int32()},
+    "lot": {"id": UUID_TYPE, "office_id": UUID_CODES, "location": CATEGORICAL, "status": CATEGORICAL,
+            "total_spots": pa.int32(), "total_regular_spots": pa.int32(), "total_ada_spots": pa.int32(),
+            "total_ev_spots": pa.int32(), "available_spots": pa.int32(), "available_regular_spots": pa.int32(),
+            "available_ada_spots": pa.int32(), "available_ev_spots": pa.int32()},
+    "spot": {"id": UUID_TYPE, "lot_id": UUID_CODES, "sensor_id": UUID_TYPE, "status": CATEGORICAL,
+             "status_description": CATEGORICAL, "type": CATEGORICAL,
+             "row_number": pa.int32(), "position_number": pa.int32()},
+    "sensor": {"id": UUID_TYPE, "spot_id": UUID_TYPE, "status": CATEGORICAL,
+               "status_description": CATEGORICAL, "type": CATEGORICAL},
+    "employee": {"id": UUID_TYPE, "office_id": UUID_CODES, "block_id": UUID_CODES, "status": CATEGORICAL,
+                 "start_date": pa.date32(), "end_date": pa.date32(), "type": CATEGORICAL,
+                 "last_parked_lot": UUID_CODES, "password": CATEGORICAL},
+}
+
+# ASCII -> hex digit value (255 for anything else)
+HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+HEX_VALUES[np.frombuffer(b"0123456789", np.uint8)] = np.arange(10)
+HEX_VALUES[np.frombuffer(b"abcdef", np.uint8)] = np.arange(10, 16)
+HEX_VALUES[np.frombuffer(b"ABCDEF", np.uint8)] = np.arange(10, 16)
+
+
+# Canonical UUID strings -> binary(16), decoding all rows at once; empty strings become nulls
+def uuid_array(strings):
+    strings = pc.if_else(pc.equal(strings, ""), pa.scalar(None, pa.string()), strings)
+    if isinstance(strings, pa.ChunkedArray):
+        strings = strings.combine_chunks()
+    digits = pc.replace_substring(strings.fill_null("0" * 32), "-", "")
+    if len(digits) and pc.any(pc.not_equal(pc.binary_length(digits), 32)).as_py():
+        raise ValueError("Malformed UUID in seed file")
+    offsets = np.frombuffer(digits.buffers()[1], np.int32, count=len(digits) + 1, offset=digits.offset * 4)
+    nibbles = HEX_VALUES[np.frombuffer(digits.buffers()[2], np.uint8)[offsets[0]:offsets[-1]]]
+    if (nibbles == 255).any():
+        raise ValueError("Malformed UUID in seed file")
+    nibbles = nibbles.reshape(-1, 2)
+    raw = (nibbles[:, 0] << 4) | nibbles[:, 1]
+    values = pa.FixedSizeBinaryArray.from_buffers(UUID_TYPE, len(digits), [None, pa.py_buffer(raw)])
+    if strings.null_count:
+        values = pc.if_else(strings.is_valid(), values, pa.scalar(None, UUID_TYPE))
+    return values
+
+
+# binary(16) Arrow values -> canonical UUID strings, '' for nulls
+def uuid_strings(values):
+    raw = np.frombuffer(values.buffers()[1], np.uint8, count=len(values) * 16, offset=values.offset * 16).tobytes()
+    valid = values.is_valid().to_pylist() if values.null_count else None
+    h = raw.hex()
+    result = [f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+              for i in range(0, len(h), 32)]
+    if valid is not None:
+        result = [value if ok else "" for value, ok in zip(result, valid)]
+    return result
+
+
+# One seed file as typed columns (an Arrow table with one chunk per column)
+class SeedTable:
+    def __init__(self, name, data, path=None, from_cache=False):
+        self.name = name
+        self.data = data
+        self.path = path
+        self.from_cache = from_cache
+
+    def __len__(self):
+        return self.data.num_rows
+
+    def column(self, name):
+        column = self.data.column(name)
+        return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+    # Dictionary columns as (int32 codes, distinct values as strings)
+    def codes(self, name):
+        column = self.column(name)
+        if not pa.types.is_dictionary(column.type):
+            raise TypeError(f"{self.name}.{name} is not dictionary-encoded")
+        dictionary = column.dictionary
+        values = uuid_strings(dictionary) if dictionary.type == UUID_TYPE else dictionary.to_pylist()
+        return column.indices.to_numpy(zero_copy_only=False), values
+
+    # Any column as Python strings; dictionary columns share one str object per distinct value
+    def strings(self, name):
+        column = self.column(name)
+        if pa.types.is_dictionary(column.type):
+            codes, values = self.codes(name)
+            values = [value or "" for value in values]
+            return [values[code] if code >= 0 else "" for code in codes.tolist()]
+        if column.type == UUID_TYPE:
+            return uuid_strings(column)
+        return [value if value is not None else "" for value in pc.cast(column, pa.string()).to_pylist()]
+
+
+def _source_key(path):
+    key = source_key(path)
+    return {b"cache_version": CACHE_VERSION.encode(), b"source_size": str(key["size"]).encode(),
+            b"source_mtime_ns": str(key["mtime_ns"]).encode()}
+
+
+# Seed CSV -> typed Arrow table. Columns are taken by position (older seed files have no usable header).
+def parse_seed_csv(path, table):
+    headers = SEED_HEADERS[table]
+    types = SEED_COLUMN_TYPES.get(table, {})
+    columns = [column for column in headers if column not in AUDIT_COLUMNS]
+    read_types = {column: pa.string() if column_type in (UUID_TYPE, UUID_CODES) else column_type
+                  for column, column_type in types.items()}
+    read_types.update({column: pa.string() for column in columns if column not in types})
+    data = pacsv.read_csv(path,
+                          read_options=pacsv.ReadOptions(skip_rows=1, column_names=headers),
+                          convert_options=pacsv.ConvertOptions(include_columns=columns, column_types=read_types,
+                                                               strings_can_be_null=False))
+    arrays = []
+    for column in columns:
+        values = data.column(column)
+        if types.get(column) == UUID_TYPE:
+            values = uuid_array(values)
+        elif types.get(column) == UUID_CODES:
+            encoded = pc.dictionary_encode(pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.string()), values)
+                                           .combine_chunks())
+            values = pa.DictionaryArray.from_arrays(encoded.indices, uuid_array(encoded.dictionary))
+        arrays.append(values)
+    return pa.table(arrays, names=columns).unify_dictionaries().combine_chunks()
+
+
+def _read_cache(cache_path, key):
+    try:
+        with ipc.open_file(pa.memory_map(cache_path)) as reader:
+            if reader.schema.metadata != key:
+                return None
+            return reader.read_all()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+
+
+def _write_cache(cache_path, data, key):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    data = data.replace_schema_metadata(key)
+    tmp_path = cache_path + ".tmp"
+    with ipc.new_file(tmp_path, data.schema) as writer:
+        writer.write_table(data)
+    os.replace(tmp_path, cache_path)
+
+
+# Typed columns of one seed file. The parsed form is cached in <seed_dir>/.cache/<file>.arrow,
+# keyed by the CSV's size and mtime, and memory-mapped instead of re-parsed while the CSV is unchanged.
+def load_seed_table(seed_dir, table, cache=True):
+    path = os.path.join(seed_dir, SEED_FILES[table])
+    cache_path = os.path.join(seed_dir, CACHE_DIR, SEED_FILES[table][:-len(".csv")] + ".arrow")
+    key = _source_key(path)
+    if cache:
+        data = _read_cache(cache_path, key)
+        if data is not None:
+            return SeedTable(table, data, path, from_cache=True)
+    data = parse_seed_csv(path, table)
+    if cache:
+        _write_cache(cache_path, data, key)
+    return SeedTable(table, data, path)
+
+
+def load_seed_tables(seed_dir, tables, cache=True):
+    return {table: load_seed_table(seed_dir, table, cache=cache) for table in tables}
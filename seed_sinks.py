@@ -0,0 +1,43 @@
+import csv
+import os
+
+from bulk_loader import SEED_FILES, SEED_HEADERS
+
+AUDIT_COLUMNS = ["created_at", "created_by", "updated_at", "updated_by"]
+BASE_TABLES = ["office", "lot", "block", "spot", "sensor", "employee"]
+LOG_TABLES = ["sensor_logs", "employee_parking_history"]
+
+
+# Values of the trailing audit columns (AUDIT_COLUMNS order), the same for every row of a run
+def audit_values(now):
+    return [now, 'system', now, 'system']
+
+
+# Writes rows to a seed CSV as they are produced. Rows hold only the varying columns;
+# the constant trailing columns are kept once here and added while each chunk is written.
+class CsvSink:
+    def __init__(self, path, headers, constants=()):
+        self.path = path
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+        self.constants = list(constants)
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_rows(self, rows):
+        constants = self.constants
+        self.writer.writerows(row + constants for row in rows)
+        self.rows_written += len(rows)
+
+    def close(self):
+        self.file.close()
+
+
+def seed_csv_sink(seed_dir, table, now):
+    return CsvSink(os.path.join(seed_dir, SEED_FILES[table]), SEED_HEADERS[table], audit_values(now))
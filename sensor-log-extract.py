@@ -1,6 +1,11 @@
 import psycopg2
-import pandas as pd
+import argparse
+import csv
 import os
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from columnar_io import ColumnarWriter
 
 # Load credentials from local file
 def load_credentials(path):
@@ -15,22 +20,33 @@ def load_credentials(path):
         password = input("Enter DB password: ")
         return user, password
 
-# File path to your credentials
-CRED_PATH = r'C:\Users\sunda\Downloads\ID\Tech\CockroachDB\pwd.txt'
-user, password = load_credentials(CRED_PATH)
-
-# Connect to CockroachDB
-conn = psycopg2.connect(
-    dbname="defaultdb",
-    user=user,
-    password=password,
-    host="social-elves-11376.j77.aws-us-west-2.cockroachlabs.cloud",
-    port=26257,
-    sslmode="require"
-)
+# High-water mark: the CockroachDB commit timestamp (HLC decimal) the last export read at.
+# Rows are picked up by when they were committed, so late or backfilled events with an older
+# event_timestamp are still exported. Older watermark files hold an event_timestamp instead.
+def read_watermark(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        value = f.read().strip()
+    if not value:
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return datetime.fromisoformat(value)
+
+def write_watermark(path, watermark):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(str(watermark))
+    os.replace(tmp_path, path)
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value) if value else None
 
 # Query sensor logs with sensor and lot info (optional join)
-query = """
+EXPORT_COLUMNS = ["lot_id", "name", "sensor_id", "event_type", "event_timestamp", "event_date", "weekday", "hour", "minute"]
+QUERY = """
 SELECT
     s.lot_id,
     l.name,
@@ -46,16 +62,113 @@ FROM
 JOIN
     parksmart.sensors s ON sl.sensor_id = s.sensor_id
 JOIN
-    parksmart.lots l ON s.lot_id = l.lot_id;
+    parksmart.lots l ON s.lot_id = l.lot_id
+{where_clause}
+ORDER BY event_timestamp;
 """
 
-# Read data into DataFrame
-df = pd.read_sql_query(query, conn)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream sensor logs with sensor and lot info to CSV, Parquet or Arrow")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv",
+                        help="CSV file, or a Parquet / Arrow IPC dataset partitioned by event_date and lot_id")
+    parser.add_argument("--output", help="Output file (csv) or dataset directory (default: sensor_logs_export[.csv])")
+    parser.add_argument("--start", type=parse_timestamp, help="Only events at or after this time (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--end", type=parse_timestamp, help="Only events before this time (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--since-last", action="store_true",
+                        help="Only export events committed since the last export and append them")
+    parser.add_argument("--watermark-file", default="sensor_logs_export.watermark")
+    parser.add_argument("--fetch-size", type=int, default=10000, help="Rows fetched per round trip")
+    args = parser.parse_args(argv)
+    # The watermark means "everything committed up to here was exported", which a bounded range cannot promise
+    if args.since_last and (args.start is not None or args.end is not None):
+        parser.error("--since-last cannot be combined with --start / --end")
+    if args.output is None:
+        args.output = "sensor_logs_export.csv" if args.format == "csv" else "sensor_logs_export"
+    return args
+
+# Time-range filters: WHERE clause and its parameters
+def build_filters(watermark, start=None, end=None):
+    conditions = []
+    params = []
+    if isinstance(watermark, Decimal):
+        conditions.append("sl.crdb_internal_mvcc_timestamp > %s")
+        params.append(watermark)
+        print(f"Exporting sensor logs committed after {watermark}")
+    elif watermark is not None:
+        conditions.append("event_timestamp > %s")
+        params.append(watermark)
+        print(f"Exporting sensor logs after {watermark}")
+    if start is not None:
+        conditions.append("event_timestamp >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append("event_timestamp < %s")
+        params.append(end)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where_clause, params
+
+# Stream rows through a server-side cursor and write them as they arrive.
+# The export runs in one transaction; every row it can see was committed at or before
+# its read timestamp and any later commit gets a higher one, so that is the next watermark.
+# Returns (rows written, whether they were appended to an earlier export).
+def export(conn, args):
+    watermark = read_watermark(args.watermark_file) if args.since_last else None
+    where_clause, params = build_filters(watermark, args.start, args.end)
+    # Without a watermark nothing is known to be exported yet, so even --since-last starts a fresh output
+    append = watermark is not None and os.path.exists(args.output)
+    row_count = 0
+    with conn.cursor() as cur:
+        cur.execute("SELECT cluster_logical_timestamp()")
+        read_timestamp = cur.fetchone()[0]
+    with conn.cursor(name="sensor_log_export") as cur:
+        cur.itersize = args.fetch_size
+        cur.execute(QUERY.format(where_clause=where_clause), params)
+        if args.format == "csv":
+            with open(args.output, 'a' if append else 'w', newline='') as f:
+                writer = csv.writer(f)
+                if not append:
+                    writer.writerow(EXPORT_COLUMNS)
+                for row in cur:
+                    writer.writerow(row)
+                    row_count += 1
+                    if row_count % args.fetch_size == 0:
+                        print(f"  ➤ {row_count} rows written")
+        else:
+            # Incremental runs add new partition files; a full export replaces the dataset
+            with ColumnarWriter(args.output, EXPORT_COLUMNS, fmt=args.format, append=append) as writer:
+                while True:
+                    rows = cur.fetchmany(args.fetch_size)
+                    if not rows:
+                        break
+                    writer.write_rows([(*row[:6], int(row[6]), int(row[7]), int(row[8])) for row in rows])
+                    row_count += len(rows)
+                    print(f"  ➤ {row_count} rows written")
+
+    # A full or incremental export covers everything committed up to the read timestamp; a bounded range does not
+    if args.start is None and args.end is None:
+        write_watermark(args.watermark_file, read_timestamp)
+    conn.commit()
+    return row_count, append
+
+# File path to your credentials
+CRED_PATH = r'C:\Users\sunda\Downloads\ID\Tech\CockroachDB\pwd.txt'
+
+if __name__ == "__main__":
+    args = parse_args()
+    user, password = load_credentials(CRED_PATH)
+
+    # Connect to CockroachDB
+    conn = psycopg2.connect(
+        dbname="defaultdb",
+        user=user,
+        password=password,
+        host="social-elves-11376.j77.aws-us-west-2.cockroachlabs.cloud",
+        port=26257,
+        sslmode="require"
+    )
 
-# Save to CSV
-output_file = "sensor_logs_export.csv"
-df.to_csv(output_file, index=False)
-print(f"Sensor logs exported to {output_file}")
+    row_count, append = export(conn, args)
+    print(f"Sensor logs exported to {args.output} ({row_count} rows{', appended' if append else ''})")
 
-# Close DB connection
-conn.close()
+    # Close DB connection
+    conn.close()
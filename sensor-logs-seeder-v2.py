@@ -1,9 +1,12 @@
 import psycopg2
-import random
-import uuid
 from datetime import datetime, timedelta
 import os
 
+import numpy as np
+
+from event_generator import generate_day, split_batch, batch_rows
+from parallel_writer import ParallelWriter
+
 # -----------------------
 # Credential Handling
 # -----------------------
@@ -62,10 +65,8 @@ occupancy_by_day = {
 creds_file = os.path.join(os.path.dirname(__file__), "secrets", "pwd.txt")
 user, password = read_credentials(creds_file)
 
-# Connect to CockroachDB
-print("\n🔌 Connecting to CockroachDB...")
-try:
-    conn = psycopg2.connect(
+def connect():
+    return psycopg2.connect(
         dbname="defaultdb",
         user=user,
         password=password,
@@ -73,6 +74,11 @@ try:
         port=26257,
         sslmode="require"
     )
+
+# Connect to CockroachDB
+print("\n🔌 Connecting to CockroachDB...")
+try:
+    conn = connect()
     conn.autocommit = True
     cur = conn.cursor()
     print("✅ Connected to CockroachDB.\n")
@@ -92,45 +98,31 @@ all_days = [start_date + timedelta(days=i) for i in range((end_date - start_date
 work_days = [d for d in all_days if d.weekday() < 5]
 print(f"✅ {len(work_days)} workdays detected.\n")
 
-# Generate logs
-print("🧠 Generating sensor logs...")
-events = []
-
-for day in work_days:
-    weekday = day.weekday()
-    occupancy_rate = occupancy_by_day.get(weekday, 0.0)
-    occupied_sensors = random.sample(sensor_ids, int(len(sensor_ids) * occupancy_rate))
-
-    for sensor_id in occupied_sensors:
-        # Morning entry: 8:30–10:30
-        entry_time = datetime.combine(day, datetime.min.time()) + timedelta(hours=8, minutes=30) + timedelta(minutes=random.randint(0, 120))
-        events.append((str(uuid.uuid4()), sensor_id, "entry", entry_time))
-
-        # Optional lunch exit/entry
-        if random.random() < 0.3:
-            exit_lunch = datetime.combine(day, datetime.min.time()) + timedelta(hours=12) + timedelta(minutes=random.randint(0, 30))
-            reentry_lunch = exit_lunch + timedelta(minutes=random.randint(30, 60))
-            events.append((str(uuid.uuid4()), sensor_id, "exit", exit_lunch))
-            events.append((str(uuid.uuid4()), sensor_id, "entry", reentry_lunch))
+# Generate logs one day at a time as columnar NumPy batches and
+# insert them in parallel over a pool of connections
+print("🧠 Generating and inserting sensor logs...")
+rng = np.random.default_rng()
+sensor_id_array = np.asarray(sensor_ids)
+batch_size = 1000
+writer_count = 4  # parallel connections
+total_events = 0
 
-        # Evening exit: 4:30–5:30
-        exit_time = datetime.combine(day, datetime.min.time()) + timedelta(hours=16, minutes=30) + timedelta(minutes=random.randint(0, 60))
-        events.append((str(uuid.uuid4()), sensor_id, "exit", exit_time))
+with ParallelWriter(connect, workers=writer_count) as writer:
+    for day in work_days:
+        weekday = day.weekday()
+        occupancy_rate = occupancy_by_day.get(weekday, 0.0)
+        day_batch = generate_day(sensor_id_array, day, occupancy_rate, rng)
 
-    print(f"   ➤ {day.strftime('%A %Y-%m-%d')} | Occupancy: {int(occupancy_rate * 100)}% | Events: {len(occupied_sensors) * 2}–{len(occupied_sensors) * 3}")
+        for batch in split_batch(day_batch, batch_size):
+            writer.submit(
+                "INSERT INTO parksmart.sensorlogs (id, sensor_id, event_type, event_timestamp) VALUES ",
+                "(%s, %s, %s, %s)", batch_rows(batch)
+            )
 
-print(f"\n📊 Total sensor events to insert: {len(events)}\n")
+        total_events += len(day_batch.ids)
+        print(f"   ➤ {day.strftime('%A %Y-%m-%d')} | Occupancy: {int(occupancy_rate * 100)}% | Events: {len(day_batch.ids)}")
 
-# Insert logs in batches
-print("💾 Inserting sensor logs...")
-batch_size = 1000
-for i in range(0, len(events), batch_size):
-    batch = events[i:i + batch_size]
-    args_str = b",".join(cur.mogrify("(%s, %s, %s, %s)", event) for event in batch)
-    cur.execute(
-        b"INSERT INTO parksmart.sensorlogs (id, sensor_id, event_type, event_timestamp) VALUES " + args_str
-    )
-    print(f"   ➤ Inserted batch {i // batch_size + 1} ({len(batch)} records)")
+print(f"\n📊 Total sensor events inserted: {total_events}\n")
 
 # Cleanup
 cur.close()
@@ -0,0 +1,76 @@
+import random
+from array import array
+
+
+# Per-lot spot index, built once from spot_seed.csv rows.
+# Each lot maps to a compact array of positions into the shared sensor list,
+# so picking a spot for an event is O(1) instead of a scan over every spot.
+class SpotIndex:
+    def __init__(self, spot_rows=()):
+        self.sensor_ids = []
+        self.by_lot = {}
+        self.extend(spot_rows)
+
+    # Add spot rows (e.g. one generated chunk at a time)
+    def extend(self, spot_rows):
+        for row in spot_rows:
+            lot_id, sensor_id = row[2], row[3]
+            self.by_lot.setdefault(lot_id, array('I')).append(len(self.sensor_ids))
+            self.sensor_ids.append(sensor_id)
+
+    # From the typed spot table of seed_loader: the lot column is already dictionary-encoded,
+    # so each row costs one list append, and sensor ids are decoded in one pass
+    @classmethod
+    def from_seed_table(cls, spots):
+        index = cls()
+        lot_codes, lot_ids = spots.codes("lot_id")
+        index.sensor_ids = spots.strings("sensor_id")
+        for pos, code in enumerate(lot_codes.tolist()):
+            index.by_lot.setdefault(lot_ids[code], array('I')).append(pos)
+        return index
+
+    def __len__(self):
+        return len(self.sensor_ids)
+
+    def spot_count(self, lot_id):
+        return len(self.by_lot.get(lot_id, ()))
+
+
+# Free-spot pool on top of a SpotIndex.
+# Each lot keeps an array of free positions; acquire swap-removes a random entry
+# and release appends it back, so both are O(1) and a sensor is never handed out
+# twice while it is occupied.
+class SpotPool:
+    def __init__(self, spot_index):
+        self.index = spot_index
+        self.free = {lot_id: array('I', positions) for lot_id, positions in spot_index.by_lot.items()}
+        self.occupied = bytearray(len(spot_index))
+
+    def acquire(self, lot_id, rng=random):
+        free = self.free.get(lot_id)
+        if not free:
+            return None
+        i = int(rng.random() * len(free))
+        pos = free[i]
+        last = free.pop()
+        if i < len(free):
+            free[i] = last
+        self.occupied[pos] = 1
+        return pos
+
+    # Try each lot in order, spilling over to the next one when a lot is full
+    def acquire_first(self, lot_ids, rng=random):
+        for lot_id in lot_ids:
+            pos = self.acquire(lot_id, rng)
+            if pos is not None:
+                return lot_id, pos
+        return None
+
+    def release(self, lot_id, pos):
+        if not self.occupied[pos]:
+            raise ValueError(f"Spot position {pos} in lot {lot_id} is not occupied")
+        self.occupied[pos] = 0
+        self.free[lot_id].append(pos)
+
+    def sensor_id(self, pos):
+        return self.index.sensor_ids[pos]
@@ -1,8 +1,10 @@
 import streamlit as st
-import pandas as pd
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 import time
-from datetime import datetime
+from contextlib import contextmanager
+
+from change_feed import open_change_feed, highlight_changes
 
 def read_db_credentials(path):
     try:
@@ -17,10 +19,13 @@ def read_db_credentials(path):
         password = input("Enter DB password: ")
         return user, password
 
-# Connect to DB
-def get_connection():
+REFRESH_INTERVAL = 3  # seconds
+FEED_MODE = "auto"  # 'changefeed', 'polling' or 'auto' (changefeed when the server is CockroachDB)
+
+@st.cache_resource
+def get_db_params():
     user, password = read_db_credentials("secrets/pwd.txt")
-    return psycopg2.connect(
+    return dict(
         dbname="defaultdb",
         user=user,
         password=password,
@@ -29,35 +34,34 @@ def get_connection():
         sslmode="require"
     )
 
-def load_lot_data():
-    conn = get_connection()
-    query = "SELECT lot_id, name, available_spots, available_regular_spots, available_ev_spots, available_ada_spots FROM parksmart.lots ORDER BY lot_id"
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+# Dedicated connection, used by the long-running changefeed streams
+def open_connection():
+    return psycopg2.connect(**get_db_params())
 
-def load_recent_sensor_logs(limit=10):
-    conn = get_connection()
-    query = f"""
-        SELECT sensor_id, event_type, event_timestamp 
-        FROM parksmart.sensorlogs 
-        ORDER BY event_timestamp DESC 
-        LIMIT {limit}
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+# One connection pool per server process, shared by every dashboard session
+@st.cache_resource
+def get_connection_pool():
+    return ThreadedConnectionPool(1, 5, **get_db_params())
 
-# Highlight changes between DataFrames
-def highlight_diff(df, prev_df):
-    if prev_df is None:
-        return pd.DataFrame("", index=df.index, columns=df.columns)
-    diffs = df != prev_df
-    styles = pd.DataFrame("", index=df.index, columns=df.columns)
-    for col in df.columns:
-        if col in diffs:
-            styles[col] = diffs[col].apply(lambda changed: "background-color: yellow" if changed else "")
-    return styles
+@contextmanager
+def get_connection():
+    pool = get_connection_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        conn.autocommit = True
+        yield conn
+    except psycopg2.OperationalError:
+        broken = True
+        raise
+    finally:
+        pool.putconn(conn, close=broken)
+
+# One change feed per server process; sessions read snapshots of its shared state,
+# so N open dashboards cost one refresh per interval
+@st.cache_resource
+def get_change_feed():
+    return open_change_feed(open_connection, get_connection, mode=FEED_MODE, interval=REFRESH_INTERVAL)
 
 st.set_page_config(page_title="Live Parking Monitor", layout="wide")
 st.title("🚗 Live Parking Simulation Dashboard")
@@ -65,20 +69,20 @@ st.title("🚗 Live Parking Simulation Dashboard")
 lot_placeholder = st.empty()
 sensor_placeholder = st.empty()
 
-prev_df = None
-refresh_interval = 3  # seconds
+prev_version = None
 
 while True:
     try:
-        df = load_lot_data()
-        style_df = df.style.apply(highlight_diff, prev_df=prev_df, axis=None)
-        lot_placeholder.dataframe(style_df, use_container_width=True, height=600)
-        prev_df = df.copy()
-
-        sensor_logs = load_recent_sensor_logs()
-        sensor_placeholder.dataframe(sensor_logs, use_container_width=True)
+        feed = get_change_feed()
+        feed.refresh()
+        lots, sensor_logs, changed, version = feed.snapshot(prev_version)
+        if version != prev_version:
+            style_df = lots.style.apply(highlight_changes, changed=changed, axis=None)
+            lot_placeholder.dataframe(style_df, use_container_width=True, height=600)
+            sensor_placeholder.dataframe(sensor_logs.drop(columns=['id']), use_container_width=True)
+            prev_version = version
 
-        time.sleep(refresh_interval)
+        time.sleep(REFRESH_INTERVAL)
     except Exception as e:
         st.error(f"Error: {e}")
         break
@@ -0,0 +1,74 @@
+import uuid
+
+import pytest
+
+from base_generator import BLOCKS, LOTS, RNG_BLOCK_SIZE, BaseGenerator, employee_code, seeded_uuid4, scoped_rng
+
+EMPLOYEES = 2 * RNG_BLOCK_SIZE + 500
+SPOTS = 300
+
+
+def generate(**kwargs):
+    generator = BaseGenerator(**kwargs)
+    tables = {}
+    for table, rows in generator.iter_tables(employee_count=EMPLOYEES, spot_count=SPOTS):
+        tables.setdefault(table, []).extend(rows)
+    return tables
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return generate(seed=7, workers=1)
+
+
+def test_same_seed_same_rows_for_any_workers_and_chunk_size(tables):
+    assert generate(seed=7, workers=2, chunk_size=RNG_BLOCK_SIZE) == tables
+
+
+def test_different_seed_different_rows(tables):
+    other = generate(seed=8, workers=1)
+    assert other["office"][0][0] != tables["office"][0][0]
+    assert other["employee"][0] != tables["employee"][0]
+
+
+def test_unseeded_runs_differ():
+    assert BaseGenerator().seed != BaseGenerator().seed
+
+
+def test_row_counts_and_keys(tables):
+    assert len(tables["office"]) == 1
+    assert len(tables["lot"]) == len(LOTS)
+    assert len(tables["block"]) == len(BLOCKS)
+    assert len(tables["spot"]) == len(tables["sensor"]) == SPOTS
+    assert len(tables["employee"]) == EMPLOYEES
+    for table, rows in tables.items():
+        ids = [row[0] for row in rows]
+        assert len(set(ids)) == len(ids), table
+        assert all(uuid.UUID(value).version == 4 for value in ids)
+
+
+def test_foreign_keys_point_at_generated_rows(tables):
+    office_id = tables["office"][0][0]
+    lot_ids = {row[0] for row in tables["lot"]}
+    block_ids = {row[0] for row in tables["block"]}
+    spots = {row[0]: row for row in tables["spot"]}
+    assert {row[2] for row in tables["lot"]} == {office_id}
+    assert {row[2] for row in tables["spot"]} <= lot_ids
+    for sensor in tables["sensor"]:
+        assert spots[sensor[2]][3] == sensor[0]
+    assert {row[4] for row in tables["employee"]} <= block_ids
+    assert {row[9] for row in tables["employee"]} <= lot_ids
+    employee_codes = [row[1] for row in tables["employee"]]
+    assert len(set(employee_codes)) == len(employee_codes)
+
+
+def test_seeded_uuid4_is_a_stable_v4_uuid():
+    value = seeded_uuid4(scoped_rng(1, "x"))
+    assert value == seeded_uuid4(scoped_rng(1, "x"))
+    parsed = uuid.UUID(value)
+    assert parsed.version == 4 and parsed.variant == uuid.RFC_4122
+
+
+def test_employee_codes_are_distinct():
+    codes = {employee_code(index, 12345) for index in range(50_000)}
+    assert len(codes) == 50_000
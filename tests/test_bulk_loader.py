@@ -0,0 +1,91 @@
+import csv
+import os
+import sqlite3
+
+import pytest
+
+from bulk_loader import SEED_HEADERS, BulkLoader, chunked, source_key
+
+TABLE = "sensor_logs"
+COLUMNS = SEED_HEADERS[TABLE]
+
+
+def write_seed(path, count, prefix="row"):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(count):
+            writer.writerow([f"{prefix}-{i}", "2024-06-03 09:00:00", "OCCUPIED", f"sensor-{i}", "",
+                             "2024-06-03 00:00:00", "system", "2024-06-03 00:00:00", "system"])
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    # Columns in a different order than the seed files: rows must be written by name
+    conn.execute(f"CREATE TABLE {TABLE} ({', '.join(reversed(COLUMNS))})")
+    yield conn
+    conn.close()
+
+
+def loaded_ids(conn):
+    return [row[0] for row in conn.execute(f"SELECT id FROM {TABLE} ORDER BY rowid")]
+
+
+def make_loader(conn, tmp_path):
+    return BulkLoader(conn, schema=None, batch_size=10, checkpoint_path=str(tmp_path / "checkpoint.json"))
+
+
+def test_chunked():
+    assert [len(chunk) for chunk in chunked(range(25), 10)] == [10, 10, 5]
+
+
+def test_load_writes_columns_by_name(conn, tmp_path):
+    path = tmp_path / "seed.csv"
+    write_seed(path, 25)
+    assert make_loader(conn, tmp_path).load_csv(TABLE, str(path)) == 25
+    row = conn.execute(f"SELECT id, event_type, created_by FROM {TABLE} LIMIT 1").fetchone()
+    assert row == ("row-0", "OCCUPIED", "system")
+
+
+def test_resume_skips_committed_chunks(conn, tmp_path):
+    path = tmp_path / "seed.csv"
+    write_seed(path, 45)
+    loader = make_loader(conn, tmp_path)
+
+    # Fail part-way through the fourth chunk: the first three stay committed
+    def failing_rows():
+        for i, row in enumerate(csv.reader(open(path, newline=''))):
+            if i == 35:
+                raise ConnectionError("dropped")
+            if i:
+                yield row
+
+    with pytest.raises(ConnectionError):
+        loader.load(TABLE, failing_rows(), source=source_key(str(path)))
+    assert len(loaded_ids(conn)) == 30
+
+    # A fresh loader picks the count up from the checkpoint file
+    assert make_loader(conn, tmp_path).load_csv(TABLE, str(path)) == 15
+    assert loaded_ids(conn) == [f"row-{i}" for i in range(45)]
+
+
+def test_regenerated_file_starts_over(conn, tmp_path):
+    path = tmp_path / "seed.csv"
+    write_seed(path, 20)
+    make_loader(conn, tmp_path).load_csv(TABLE, str(path))
+
+    write_seed(path, 20, prefix="new")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+    conn.execute(f"DELETE FROM {TABLE}")
+    assert make_loader(conn, tmp_path).load_csv(TABLE, str(path)) == 20
+    assert loaded_ids(conn) == [f"new-{i}" for i in range(20)]
+
+
+def test_old_integer_checkpoints_start_over_for_a_known_source(conn, tmp_path):
+    path = tmp_path / "seed.csv"
+    write_seed(path, 20)
+    loader = make_loader(conn, tmp_path)
+    loader.checkpoint[TABLE] = 10
+    assert loader.load_csv(TABLE, str(path)) == 20
+    assert loader.checkpoint[TABLE] == {"rows": 20, "source": source_key(str(path))}
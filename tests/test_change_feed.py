@@ -0,0 +1,128 @@
+import queue
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import change_feed
+from change_feed import HIGHLIGHT, LOG_COLUMNS, LOT_COLUMNS, ChangeFeed, PollingChangeFeed, _ChangefeedSink, \
+    highlight_changes
+
+READ_SQL = pd.read_sql
+
+
+# SQLite stand-in for the parksmart schema; the queries only differ in their placeholder style
+@pytest.fixture
+def db(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("ATTACH ':memory:' AS parksmart")
+    conn.execute(f"CREATE TABLE parksmart.lots ({', '.join(LOT_COLUMNS)})")
+    conn.execute("CREATE TABLE parksmart.sensorlogs (id TEXT, sensor_id TEXT, event_type TEXT, event_timestamp TEXT)")
+    monkeypatch.setattr(change_feed.pd, "read_sql",
+                        lambda sql, conn, params=None: READ_SQL(sql.replace("%s", "?"), conn, params=params))
+    return conn
+
+
+def add_logs(conn, rows):
+    conn.executemany("INSERT INTO parksmart.sensorlogs VALUES (?, ?, 'entry', ?)",
+                     [(log_id, f"sensor-{log_id}", ts) for log_id, ts in rows])
+
+
+def lot_frame(rows):
+    return pd.DataFrame(rows, columns=LOT_COLUMNS)
+
+
+def test_change_feed_is_abstract():
+    with pytest.raises(TypeError):
+        ChangeFeed()
+
+
+def test_polling_cursor_has_no_duplicates_or_gaps_on_equal_timestamps(db):
+    feed = PollingChangeFeed(lambda: db, interval=0, log_limit=3)
+    add_logs(db, [("a", "2025-03-03 08:00:00"), ("c", "2025-03-03 08:00:01"), ("b", "2025-03-03 08:00:01")])
+    _, first = feed.fetch()
+    assert first["id"].tolist() == ["c", "b", "a"]
+
+    # Same timestamp as the cursor row, on both sides of its id
+    add_logs(db, [("d", "2025-03-03 08:00:01"), ("bb", "2025-03-03 08:00:01"), ("e", "2025-03-03 08:00:02")])
+    _, second = feed.fetch()
+    assert second["id"].tolist() == ["e", "d"]
+
+    _, third = feed.fetch()
+    assert third.empty
+    assert feed.log_cursor == ("2025-03-03 08:00:02", "e")
+
+
+def test_refresh_keeps_the_newest_logs_without_duplicates(db):
+    feed = PollingChangeFeed(lambda: db, interval=0, log_limit=4)
+    db.execute("INSERT INTO parksmart.lots VALUES ('lot-1', 'Lot A', 10, 8, 1, 1)")
+    for second in range(6):
+        add_logs(db, [(f"{second}-{i}", f"2025-03-03 08:00:{second:02d}") for i in range(2)])
+        feed.refresh()
+    assert feed.logs["id"].tolist() == ["5-1", "5-0", "4-1", "4-0"]
+    assert feed.version == 6
+
+
+def test_apply_lots_masks_only_changed_cells():
+    feed = PollingChangeFeed(None)
+    first = feed._apply_lots(lot_frame([["lot-1", "Lot A", 10, 8, 1, 1], ["lot-2", "Lot B", 5, 5, 0, 0]]))
+    assert first.to_numpy().all() and sorted(first.index) == ["lot-1", "lot-2"]
+
+    assert feed._apply_lots(lot_frame([["lot-1", "Lot A", 10, 8, 1, 1]])) is None
+    assert feed._apply_lots(lot_frame([])) is None
+
+    # Duplicate rows: the last one wins
+    changed = feed._apply_lots(lot_frame([["lot-2", "Lot B", 4, 4, 0, 0], ["lot-2", "Lot B", 3, 3, 0, 0],
+                                          ["lot-3", "Lot C", 7, 7, 0, 0]]))
+    assert changed.index.tolist() == ["lot-2", "lot-3"]
+    assert changed.loc["lot-2"].to_dict() == {"name": False, "available_spots": True,
+                                              "available_regular_spots": True, "available_ev_spots": False,
+                                              "available_ada_spots": False}
+    assert changed.loc["lot-3"].all()
+    assert feed.lots.loc["lot-2", "available_spots"] == 3
+    assert feed.lots.index.tolist() == ["lot-1", "lot-2", "lot-3"]
+
+
+def test_snapshot_merges_changes_since_a_version():
+    class StaticFeed(ChangeFeed):
+        def __init__(self, batches):
+            super().__init__(interval=0)
+            self.batches = iter(batches)
+
+        def fetch(self):
+            return lot_frame(next(self.batches)), pd.DataFrame(columns=LOG_COLUMNS)
+
+    feed = StaticFeed([[["lot-1", "Lot A", 10, 8, 1, 1]], [["lot-1", "Lot A", 9, 7, 1, 1]],
+                       [["lot-1", "Lot A", 9, 7, 0, 1]]])
+    for _ in range(3):
+        feed.refresh()
+    _, _, changed, version = feed.snapshot(since_version=1)
+    assert version == 3
+    assert changed.loc["lot-1"].tolist() == [False, True, True, True, False]
+    assert feed.snapshot()[2] is None
+
+
+def test_changefeed_sink_parses_rows_across_writes():
+    rows = queue.Queue()
+    sink = _ChangefeedSink(rows)
+    sink.write(b'parksmart.lots\t["lot-1"]\t{"after": {"lot_id": "lot-1", "available_spots": 7}}\nparks')
+    sink.write('mart.sensorlogs\t["x"]\t{"after": {"id": "x", "sensor_id": "s\\\\\\\\1"}}\n')
+    sink.write('\t\t\\N\n')  # resolved timestamp
+    sink.write('parksmart.lots\t["lot-2"]\t{"after": null}\n')  # delete
+    sink.write('parksmart.lots\t["lot-3"]\t{"after": {"lot_id": "lot-3"}}')  # incomplete line
+
+    parsed = [rows.get_nowait() for _ in range(rows.qsize())]
+    assert parsed == [("parksmart.lots", {"lot_id": "lot-1", "available_spots": 7}),
+                      ("parksmart.sensorlogs", {"id": "x", "sensor_id": "s\\1"})]
+    assert sink.buffer.startswith("parksmart.lots\t[\"lot-3\"]")
+
+
+def test_highlight_changes_styles_only_changed_cells():
+    lots = lot_frame([["lot-1", "Lot A", 10, 8, 1, 1], ["lot-2", "Lot B", 5, 5, 0, 0]]).set_index("lot_id")
+    assert (highlight_changes(lots, None) == "").all().all()
+
+    changed = pd.DataFrame({"available_spots": [True, True], "name": [False, True]}, index=["lot-2", "gone"])
+    styles = highlight_changes(lots, changed)
+    assert styles.loc["lot-2", "available_spots"] == HIGHLIGHT
+    assert (styles.drop(index="lot-2") == "").all().all()
+    assert styles.loc["lot-2"].tolist().count(HIGHLIGHT) == 1
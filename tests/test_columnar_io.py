@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from columnar_io import ColumnarWriter, read_sensor_logs
+
+COLUMNS = ["lot_id", "name", "sensor_id", "event_type", "event_timestamp", "event_date", "weekday", "hour", "minute"]
+
+
+def export_rows(day, count):
+    return [(lot_id, f"Lot {lot_id}", f"s{i}", "entry", datetime(2024, 6, day, 9, i % 60), f"2024-06-{day:02d}", 1, 9, i % 60)
+            for i in range(count) for lot_id in (1, 2)]
+
+
+def write(root, rows, **kwargs):
+    with ColumnarWriter(str(root), COLUMNS, flush_rows=7, **kwargs) as writer:
+        writer.write_rows(rows)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_full_export_replaces_the_dataset(tmp_path, fmt):
+    root = tmp_path / "export"
+    write(root, export_rows(3, 10), fmt=fmt)
+    write(root, export_rows(3, 10), fmt=fmt)
+    df = read_sensor_logs(str(root))
+    assert len(df) == 20
+    assert sorted(df["lot_id"].unique()) == [1, 2]
+    assert [path.name for path in tmp_path.iterdir()] == ["export"]
+
+
+def test_append_adds_partitions(tmp_path):
+    root = tmp_path / "export"
+    write(root, export_rows(3, 10))
+    write(root, export_rows(4, 5), append=True)
+    df = read_sensor_logs(str(root))
+    assert len(df) == 30
+    assert len(read_sensor_logs(str(root), start_date="2024-06-04")) == 10
+
+
+def test_failed_run_keeps_previous_dataset(tmp_path):
+    root = tmp_path / "export"
+    write(root, export_rows(3, 10))
+    with pytest.raises(RuntimeError):
+        with ColumnarWriter(str(root), COLUMNS, flush_rows=7) as writer:
+            writer.write_rows(export_rows(4, 10))
+            raise RuntimeError("interrupted")
+    assert len(read_sensor_logs(str(root))) == 20
+    assert [path.name for path in tmp_path.iterdir()] == ["export"]
+
+
+def test_constant_columns(tmp_path):
+    root = tmp_path / "export"
+    write(root, export_rows(3, 2), constants={"created_by": "system"})
+    df = read_sensor_logs(str(root), columns=["sensor_id", "created_by"])
+    assert list(df["created_by"].astype(str).unique()) == ["system"]
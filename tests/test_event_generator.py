@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from event_generator import EventBatch, batch_rows, generate_day, random_uuids, split_batch
+
+SENSORS = np.array([f"sensor-{i}" for i in range(500)])
+
+
+def test_random_uuids_are_version_4():
+    ids = random_uuids(np.random.default_rng(0), 1000)
+    assert len(set(ids.tolist())) == 1000
+    for value in ids[:50]:
+        assert len(value) == 36
+        assert value[14] == "4"
+        assert value[19] in "89ab"
+
+
+def test_generate_day_visits_are_well_formed():
+    day = date(2024, 6, 3)
+    batch = generate_day(SENSORS, day, 0.8, np.random.default_rng(1))
+    n = len(batch.ids)
+    assert all(len(column) == n for column in batch)
+    assert len(set(batch.ids.tolist())) == n
+
+    # One first entry and one final exit per occupied sensor
+    assert (batch.event_types == "entry").sum() == (batch.event_types == "exit").sum()
+    assert len(set(batch.sensor_ids.tolist())) == int(len(SENSORS) * 0.8)
+
+    # Everything happens on the day, and each sensor alternates entry / exit in time order
+    days = batch.event_timestamps.astype("datetime64[D]")
+    assert (days == np.datetime64(day)).all()
+    order = np.lexsort((batch.event_timestamps, batch.sensor_ids))
+    for sensor in np.unique(batch.sensor_ids):
+        events = batch.event_types[order][batch.sensor_ids[order] == sensor].tolist()
+        assert events[0] == "entry" and events[-1] == "exit"
+        assert events == ["entry", "exit"] * (len(events) // 2)
+
+
+def test_generate_day_accepts_datetime_and_zero_occupancy():
+    batch = generate_day(SENSORS, datetime(2024, 6, 7), 0.0, np.random.default_rng(2))
+    assert len(batch.ids) == 0
+
+
+def test_split_batch_and_batch_rows():
+    batch = generate_day(SENSORS, date(2024, 6, 4), 0.5, np.random.default_rng(3))
+    parts = list(split_batch(batch, 100))
+    assert all(isinstance(part, EventBatch) for part in parts)
+    assert sum(len(part.ids) for part in parts) == len(batch.ids)
+    assert max(len(part.ids) for part in parts) == 100
+
+    rows = batch_rows(parts[0])
+    event_id, sensor_id, event_type, timestamp = rows[0]
+    assert isinstance(event_id, str) and isinstance(sensor_id, str)
+    assert event_type in ("entry", "exit")
+    assert isinstance(timestamp, datetime)
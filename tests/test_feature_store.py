@@ -0,0 +1,77 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from feature_store import FeatureStore, train_incremental
+
+
+def sensor_logs(seed=0, count=4000, days=6):
+    rng = np.random.default_rng(seed)
+    lots = rng.integers(1000, 1004, size=count)
+    df = pd.DataFrame({
+        'lot_id': lots,
+        'name': [f"Lot {lot}" for lot in lots],
+        'event_type': rng.choice(['entry', 'exit'], size=count),
+        'event_timestamp': pd.Timestamp('2024-06-03') + pd.to_timedelta(rng.integers(0, days * 86400, size=count), unit='s'),
+    })
+    return df.sort_values('event_timestamp', ignore_index=True)
+
+
+def stored_features(path):
+    store = FeatureStore(str(path))
+    try:
+        return store.features().sort_values(['lot_id', 'timestamp'], ignore_index=True)
+    finally:
+        store.close()
+
+
+# Split points inside 30-minute buckets, so later updates add to partly covered buckets
+@pytest.mark.parametrize('splits', [['2024-06-05 10:17:31'], ['2024-06-04 00:00:00', '2024-06-06 13:44:02', '2024-06-08 23:59:00']])
+def test_incremental_updates_match_a_full_recompute(tmp_path, splits):
+    df = sensor_logs()
+
+    full = FeatureStore(str(tmp_path / "full.sqlite"))
+    full.update(df)
+    full.close()
+
+    incremental = FeatureStore(str(tmp_path / "incremental.sqlite"))
+    previous = None
+    for split in [pd.Timestamp(split) for split in splits] + [None]:
+        chunk = df if split is None else df[df['event_timestamp'] <= split]
+        if previous is not None:
+            chunk = chunk[chunk['event_timestamp'] > previous]
+        incremental.update(chunk)
+        previous = incremental.watermark
+    assert incremental.watermark == df['event_timestamp'].max()
+    incremental.close()
+
+    tm.assert_frame_equal(stored_features(tmp_path / "incremental.sqlite"), stored_features(tmp_path / "full.sqlite"))
+
+
+def test_encodings_keep_existing_codes(tmp_path):
+    store = FeatureStore(str(tmp_path / "store.sqlite"))
+    assert store.extend_encoding('weekday', ['Tuesday', 'Monday']) == {'Monday': 0, 'Tuesday': 1}
+    assert store.extend_encoding('weekday', ['Friday', 'Monday']) == {'Monday': 0, 'Tuesday': 1, 'Friday': 2}
+    store.close()
+
+
+def test_train_incremental_extends_the_forest(tmp_path, capsys):
+    df = sensor_logs(1)
+    paths = {name: str(tmp_path / name) for name in ("first.csv", "all.csv", "store.sqlite", "model.joblib")}
+    df[df['event_timestamp'] < pd.Timestamp('2024-06-06')].to_csv(paths["first.csv"], index=False)
+    df.to_csv(paths["all.csv"], index=False)
+    kwargs = dict(store_path=paths["store.sqlite"], model_file=paths["model.joblib"], trees_per_run=3, max_trees=5)
+
+    train_incremental(paths["first.csv"], **kwargs)
+    model, lot_id_map, weekday_map = joblib.load(paths["model.joblib"])
+    assert len(model.estimators_) == 3
+    assert sorted(lot_id_map) == [1000, 1001, 1002, 1003]
+
+    train_incremental(paths["all.csv"], **kwargs)
+    model, _, _ = joblib.load(paths["model.joblib"])
+    assert len(model.estimators_) == 5
+
+    train_incremental(paths["all.csv"], **kwargs)
+    assert "model unchanged" in capsys.readouterr().out
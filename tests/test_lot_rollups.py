@@ -0,0 +1,262 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import lot_rollups
+from lot_rollups import OCCUPIED_COLUMNS, ROLLUP_COLUMNS, build_rollups, build_snapshots, minute_occupancy
+
+T0 = datetime(2025, 3, 3, 8, 0)
+COUNT_COLUMNS = ["lot_id", "spot_type", "minute", "entries", "exits"]
+LOTS = pd.DataFrame({"lot_id": ["L1", "L2"], "total_spots": [10, 6], "total_regular_spots": [8, 6],
+                     "total_ada_spots": [1, 0], "total_ev_spots": [1, 0]})
+
+
+def no_carry():
+    return pd.DataFrame(columns=["lot_id"] + OCCUPIED_COLUMNS).set_index("lot_id")
+
+
+def counts(rows):
+    return pd.DataFrame(rows, columns=COUNT_COLUMNS)
+
+
+def at(minutes):
+    return T0 + timedelta(minutes=minutes)
+
+
+def test_minute_occupancy_adds_the_carry_in_per_spot_type():
+    carry = pd.DataFrame({"lot_id": ["L1"], "occupied_spots": [3], "occupied_regular_spots": [2],
+                          "occupied_ada_spots": [0], "occupied_ev_spots": [1]}).set_index("lot_id")
+    minutes = minute_occupancy(counts([
+        ["L1", "REGULAR", at(0), 2, 0],
+        ["L1", "EV", at(0), 0, 1],
+        ["L1", "REGULAR", at(3), 1, 2],
+        ["L2", "ADA", at(1), 1, 0],
+        ["L2", "UNKNOWN", at(1), 5, 0],  # not a spot type: ignored
+    ]), carry)
+
+    assert minutes[["lot_id", "minute", "entries", "exits"]].values.tolist() == [
+        ["L1", pd.Timestamp(at(0)), 2, 1], ["L1", pd.Timestamp(at(3)), 1, 2], ["L2", pd.Timestamp(at(1)), 1, 0]]
+    assert minutes["occupied_regular_spots"].tolist() == [4, 3, 0]
+    assert minutes["occupied_ev_spots"].tolist() == [0, 0, 0]
+    assert minutes["occupied_ada_spots"].tolist() == [0, 0, 1]
+    assert minutes["occupied_spots"].tolist() == [4, 3, 1]
+
+
+def test_minute_occupancy_without_events():
+    minutes = minute_occupancy(counts([["L1", "OTHER", at(0), 1, 0]]), no_carry())
+    assert minutes.empty
+    assert set(["lot_id", "minute", "entries", "exits"] + OCCUPIED_COLUMNS) <= set(minutes.columns)
+
+
+def test_build_rollups_sums_flows_and_keeps_end_and_peak_occupancy():
+    minutes = minute_occupancy(counts([
+        ["L1", "REGULAR", at(1), 3, 0],
+        ["L1", "REGULAR", at(14), 0, 2],
+        ["L1", "REGULAR", at(16), 1, 0],
+        ["L1", "REGULAR", at(40), 0, 1],
+    ]), no_carry())
+    rollups = build_rollups(minutes)
+    assert list(rollups.columns) == ROLLUP_COLUMNS
+    assert rollups.groupby("bucket_size").size().to_dict() == {"1m": 4, "15m": 3, "30m": 2, "1h": 1}
+
+    by_size = {size: frame.set_index("bucket_start") for size, frame in rollups.groupby("bucket_size")}
+    assert by_size["15m"][["entries", "exits", "occupied_spots", "peak_occupied_spots"]].values.tolist() == [
+        [3, 2, 1, 3], [1, 0, 2, 2], [0, 1, 1, 1]]
+    assert by_size["30m"].loc[pd.Timestamp(at(0)), ["entries", "exits", "occupied_spots", "peak_occupied_spots"]
+                              ].tolist() == [4, 2, 2, 3]
+    assert by_size["1h"].iloc[0][["entries", "exits", "occupied_spots", "peak_occupied_spots"]].tolist() == [4, 3, 1, 3]
+
+
+def test_build_snapshots_counts_events_strictly_before_each_boundary():
+    carry = pd.DataFrame({"lot_id": ["L2"], "occupied_spots": [2], "occupied_regular_spots": [2],
+                          "occupied_ada_spots": [0], "occupied_ev_spots": [0]}).set_index("lot_id")
+    minutes = minute_occupancy(counts([
+        ["L1", "REGULAR", at(5), 2, 0],
+        ["L1", "EV", at(15), 1, 0],  # at the 8:15 boundary: only counts from 8:30 on
+    ]), carry)
+    snapshots = build_snapshots(minutes, carry, LOTS, at(0), at(30))
+
+    assert list(snapshots.columns) == lot_rollups.HISTORY_COLUMNS
+    snapshots = snapshots.set_index(["lot_id", "history_timestamp"]).sort_index()
+    assert snapshots.index.get_level_values("history_timestamp").unique().tolist() == [
+        pd.Timestamp(at(15)), pd.Timestamp(at(30))]
+    assert snapshots.loc[("L1", at(15)), ["available_spots", "available_regular_spots", "available_ev_spots"]
+                         ].tolist() == [8, 6, 1]
+    assert snapshots.loc[("L1", at(30)), ["available_spots", "available_regular_spots", "available_ev_spots"]
+                         ].tolist() == [7, 6, 0]
+    # No events: the carried-in occupancy holds
+    assert snapshots.loc[("L2", at(30)), "available_spots"] == 4
+    assert (snapshots["created_by"] == lot_rollups.CREATED_BY).all()
+
+    assert build_snapshots(minutes, carry, LOTS, at(1), at(14)).empty
+
+
+# In-memory park_smart tables behind a cursor that answers the queries lot_rollups issues
+class FakeRollupDB:
+    def __init__(self, lots):
+        self.lots = lots
+        self.events = []  # (lot_id, spot_type, event_type, event_timestamp, commit timestamp)
+        self.rollups = {}
+        self.history = []
+        self.watermark = None
+        self.clock = Decimal(1000)
+
+    def add(self, lot_id, spot_type, event_type, event_timestamp):
+        self.clock += 1
+        self.events.append((lot_id, spot_type, event_type, event_timestamp, self.clock))
+
+    def cursor(self):
+        return FakeRollupCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollup_frame(self):
+        frame = pd.DataFrame(list(self.rollups.values()), columns=ROLLUP_COLUMNS)
+        return frame.sort_values(["bucket_size", "lot_id", "bucket_start"], ignore_index=True)
+
+
+class FakeRollupCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+    def execute(self, sql, params=None):
+        db = self.db
+        sql = " ".join(sql.split())
+        if sql.startswith("SELECT watermark, commit_watermark"):
+            self.result = [db.watermark] if db.watermark else []
+        elif sql.startswith("UPSERT INTO park_smart.rollup_watermark"):
+            db.watermark = params[1:]
+        elif "cluster_logical_timestamp()" in sql:
+            self.result = [(db.clock,)]
+        elif "crdb_internal_mvcc_timestamp > %s" in sql:
+            late = [ts for *_, ts, commit in db.events if commit > params[0] and ts <= params[1]]
+            self.result = [(min(late, default=None),)]
+        elif sql.startswith("SELECT min(event_timestamp), max(event_timestamp)"):
+            stamps = [event[3] for event in db.events]
+            self.result = [(min(stamps, default=None), max(stamps, default=None))]
+        elif sql.startswith("SELECT id, total_spots"):
+            self.result = db.lots.values.tolist()
+        elif sql.startswith("SELECT DISTINCT ON (lot_id)"):
+            latest = {}
+            for row in sorted(db.rollups.values(), key=lambda row: row["bucket_start"]):
+                if row["bucket_size"] == "1m":
+                    latest[row["lot_id"]] = [row["lot_id"]] + [row[column] for column in OCCUPIED_COLUMNS]
+            self.result = list(latest.values())
+        elif "date_trunc('minute', l.event_timestamp)" in sql:
+            grouped = {}
+            for lot_id, spot_type, event_type, ts, _ in db.events:
+                if params["since"] < ts <= params["until"]:
+                    key = (lot_id, spot_type.upper(), ts.replace(second=0, microsecond=0))
+                    flows = grouped.setdefault(key, [0, 0])
+                    flows[0] += event_type.upper() in params["arrivals"]
+                    flows[1] += event_type.upper() in params["departures"]
+            self.result = [list(key) + flows for key, flows in grouped.items()]
+        elif sql.startswith("DELETE FROM park_smart.lot_occupancy_rollup WHERE bucket_start >= %s"):
+            db.rollups = {key: row for key, row in db.rollups.items() if row["bucket_start"] < params[0]}
+        elif sql.startswith("DELETE FROM park_smart.lot_history"):
+            db.history = [row for row in db.history if row[1] < params[1]]
+        else:
+            raise AssertionError(f"Unexpected SQL: {sql}")
+
+
+# execute_values stand-in applying the rollup upsert and lot_history insert to the fake tables
+def fake_execute_values(cur, sql, records, page_size=None):
+    db = cur.db
+    if "lot_history" in sql:
+        db.history.extend(records)
+        return
+    for record in records:
+        row = dict(zip(ROLLUP_COLUMNS, record))
+        key = (row["lot_id"], row["bucket_size"], row["bucket_start"])
+        old = db.rollups.get(key)
+        if old is not None:
+            row["entries"] += old["entries"]
+            row["exits"] += old["exits"]
+            row["peak_occupied_spots"] = max(row["peak_occupied_spots"], old["peak_occupied_spots"])
+        db.rollups[key] = row
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(lot_rollups, "execute_values", fake_execute_values)
+    db = FakeRollupDB(LOTS)
+    rng = np.random.default_rng(5)
+    parked = {"L1": [], "L2": []}
+    for second in np.sort(rng.integers(0, 10 * 3600, size=600)).tolist():
+        lot_id = rng.choice(["L1", "L2"])
+        ts = T0 + timedelta(seconds=second)
+        if parked[lot_id] and rng.random() < 0.5:
+            db.add(lot_id, parked[lot_id].pop(), "EXIT", ts)
+        else:
+            spot_type = rng.choice(["REGULAR", "ADA", "EV"], p=[0.8, 0.1, 0.1])
+            parked[lot_id].append(spot_type)
+            db.add(lot_id, spot_type, "ENTRY", ts)
+    return db
+
+
+# What a single pass over every event produces
+def full_recompute(db):
+    fresh = FakeRollupDB(db.lots)
+    fresh.events = list(db.events)
+    cur = fresh.cursor()
+    everything = lot_rollups.fetch_minute_counts(cur, datetime.min, datetime.max)
+    return build_rollups(minute_occupancy(everything, no_carry())).sort_values(
+        ["bucket_size", "lot_id", "bucket_start"], ignore_index=True)
+
+
+def assert_rollups_match(db):
+    got = db.rollup_frame()
+    expected = full_recompute(db)
+    assert len(got) == len(expected)
+    for column in ROLLUP_COLUMNS:
+        assert [value.item() if hasattr(value, "item") else value for value in got[column]] == \
+               [value.item() if hasattr(value, "item") else value for value in expected[column]], column
+
+
+def test_run_rollups_rebuilds_buckets_after_a_late_event(db, capsys):
+    until = T0 + timedelta(hours=10)
+    lot_rollups.run_rollups(db, until=until, chunk=timedelta(hours=3, minutes=7))
+    assert db.watermark == (until, Decimal(1600))
+    assert_rollups_match(db)
+    snapshots = len(db.history)
+    assert snapshots == len(LOTS) * 41  # every 15 minutes from 8:00 to 18:00
+
+    # Committed after the run, but timed in the middle of the rolled-up range
+    late = T0 + timedelta(hours=4, minutes=20, seconds=5)
+    db.add("L1", "EV", "ENTRY", late)
+    untouched = {key: dict(row) for key, row in db.rollups.items() if row["bucket_start"] < T0 + timedelta(hours=4)}
+
+    lot_rollups.run_rollups(db, until=until, chunk=timedelta(hours=3, minutes=7))
+    assert "Late events from 2025-03-03 12:20:05" in capsys.readouterr().out
+    assert_rollups_match(db)
+    assert {key: row for key, row in db.rollups.items() if row["bucket_start"] < T0 + timedelta(hours=4)} == untouched
+    assert len(db.history) == snapshots
+    assert len({(row[0], row[1]) for row in db.history}) == snapshots
+    # Snapshots from the rewound boundary on match a single run over all events
+    fresh = FakeRollupDB(db.lots)
+    fresh.events = list(db.events)
+    lot_rollups.run_rollups(fresh, until=until)
+    assert sorted(db.history) == sorted(fresh.history)
+
+    # Nothing new since: the next run is a no-op
+    before = dict(db.rollups)
+    lot_rollups.run_rollups(db, until=until)
+    assert "already up to date" in capsys.readouterr().out
+    assert db.rollups == before
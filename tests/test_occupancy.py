@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from occupancy import attach_spots, event_deltas, occupancy_by_bucket
+
+
+def sensor_logs(seed=0, count=2000):
+    rng = np.random.default_rng(seed)
+    lots = rng.integers(1, 5, size=count)
+    df = pd.DataFrame({
+        'lot_id': lots,
+        'name': [f"Lot {lot}" for lot in lots],
+        'sensor_id': rng.integers(1, 50, size=count).astype(str),
+        'event_type': rng.choice(['entry', 'exit'], size=count),
+        'event_timestamp': pd.Timestamp('2024-06-03 06:00') + pd.to_timedelta(rng.integers(0, 12 * 3600, size=count), unit='s'),
+    })
+    return df.sort_values('event_timestamp', ignore_index=True)
+
+
+# The per-lot filter + cumsum loop analyze_sensor_logs.py used before occupancy_by_bucket
+def old_loop(df, freq='30Min'):
+    df = df.copy()
+    df['timestamp'] = df['event_timestamp']
+    df.set_index('timestamp', inplace=True)
+    grouped = df.groupby([pd.Grouper(freq=freq), 'lot_id', 'name', 'event_type'], observed=True).size().unstack(fill_value=0).reset_index()
+    grouped['entry'] = grouped.get('entry', 0)
+    grouped['exit'] = grouped.get('exit', 0)
+    grouped['net_change'] = grouped['entry'] - grouped['exit']
+    occupancy_dfs = []
+    for lot_id in grouped['lot_id'].unique():
+        lot_df = grouped[grouped['lot_id'] == lot_id].copy()
+        lot_df.sort_values('timestamp', inplace=True)
+        lot_df['occupancy'] = lot_df['net_change'].cumsum()
+        occupancy_dfs.append(lot_df)
+    return pd.concat(occupancy_dfs)
+
+
+def comparable(df):
+    columns = ['lot_id', 'name', 'timestamp', 'entry', 'exit', 'net_change', 'occupancy']
+    df = df[columns].sort_values(['lot_id', 'timestamp'], ignore_index=True)
+    df.columns.name = None
+    return df.astype({'entry': np.int64, 'exit': np.int64, 'net_change': np.int64, 'occupancy': np.int64})
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_matches_the_old_per_lot_loop(seed):
+    df = sensor_logs(seed)
+    result = occupancy_by_bucket(df, by=('lot_id', 'name'), freq='30Min')
+    tm.assert_frame_equal(comparable(result), comparable(old_loop(df)))
+
+
+def test_dense_minutes_carry_occupancy_forward():
+    df = pd.DataFrame({
+        'lot_id': [1, 1, 1, 2],
+        'event_type': ['entry', 'entry', 'exit', 'OCCUPIED'],
+        'event_timestamp': pd.to_datetime(['2024-06-03 09:00:10', '2024-06-03 09:00:50',
+                                           '2024-06-03 09:03:00', '2024-06-03 09:01:00']),
+    })
+    result = occupancy_by_bucket(df, freq='1min', dense=True)
+    lot1 = result[result['lot_id'] == 1]
+    lot2 = result[result['lot_id'] == 2]
+    assert lot1['occupancy'].tolist() == [2, 2, 2, 1]
+    assert lot1['entry'].tolist() == [2, 0, 0, 0]
+    assert lot2['occupancy'].tolist() == [0, 1, 1, 1]
+    assert len(result) == 8
+
+
+def test_event_deltas_both_vocabularies_and_categoricals():
+    events = pd.Series(['entry', 'EXIT', 'OCCUPIED', 'vacant', 'unknown'])
+    expected = [1, -1, 1, -1, 0]
+    assert event_deltas(events).tolist() == expected
+    assert event_deltas(events.astype('category')).tolist() == expected
+
+
+def test_attach_spots_adds_type_and_missing_lot():
+    spots = pd.DataFrame({'lot_id': ['L1', 'L2'], 'sensor_id': ['s1', 's2'], 'spot_type': ['EV', 'ADA']})
+    logs = pd.DataFrame({'sensor_id': ['s2', 's1', 's3']})
+    joined = attach_spots(logs, spots)
+    assert joined['lot_id'].tolist()[:2] == ['L2', 'L1']
+    assert joined['spot_type'].tolist()[:2] == ['ADA', 'EV']
+    assert joined['spot_type'].isna().tolist()[2]
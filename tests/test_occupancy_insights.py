@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from occupancy import occupancy_by_bucket
+from occupancy_insights import compute_insights, save_insights
+
+
+def occupancy_frame(seed=0, count=3000):
+    rng = np.random.default_rng(seed)
+    lots = rng.integers(1, 4, size=count)
+    logs = pd.DataFrame({
+        'lot_id': lots,
+        'name': [f"Lot {lot}" for lot in lots],
+        'event_type': rng.choice(['entry', 'exit'], size=count),
+        'event_timestamp': pd.Timestamp('2024-06-03') + pd.to_timedelta(rng.integers(0, 9 * 86400, size=count), unit='s'),
+    })
+    df = occupancy_by_bucket(logs, by=('lot_id', 'name'), freq='30Min')
+    df['weekday'] = df['timestamp'].dt.day_name()
+    df['hour'] = df['timestamp'].dt.hour
+    df['date'] = df['timestamp'].dt.date
+    return df
+
+
+def test_peak_hours_match_per_lot_weekday_means():
+    df = occupancy_frame()
+    peaks = compute_insights(df)['peak_hours']
+    assert len(peaks) == len(df[['lot_id', 'weekday']].drop_duplicates())
+    for row in peaks.itertuples(index=False):
+        df_sub = df[(df['lot_id'] == row.lot_id) & (df['weekday'] == row.weekday)]
+        avg_by_hour = df_sub.groupby('hour')['occupancy'].mean()
+        assert row.peak_hour == avg_by_hour.idxmax()
+        assert row.peak_occupancy == avg_by_hour.max()
+    # Lots in id order, weekdays in calendar order
+    first_lot = peaks[peaks['lot_id'] == peaks['lot_id'].iloc[0]]
+    assert first_lot['weekday'].tolist()[:2] == ['Monday', 'Tuesday']
+
+
+def test_highest_occupancy_and_busiest_buckets():
+    df = occupancy_frame(1)
+    insights = compute_insights(df)
+    assert insights['highest_occupancy']['occupancy'] == df['occupancy'].max()
+
+    traffic = insights['busiest_traffic'].set_index('date')
+    assert len(traffic) == df['date'].nunique()
+    for direction, column in (('entry', 'busiest_incoming'), ('exit', 'busiest_outgoing')):
+        counts = df.groupby(['date', 'timestamp'])[direction].sum()
+        for date, (_, ts) in counts.groupby('date').idxmax().items():
+            assert traffic.loc[date, column] == ts
+
+
+def test_save_insights_json_and_parquet(tmp_path):
+    insights = compute_insights(occupancy_frame(2))
+    json_path = tmp_path / "insights.json"
+    save_insights(insights, str(json_path))
+    document = json.loads(json_path.read_text())
+    assert len(document['peak_hours']) == len(insights['peak_hours'])
+    assert document['highest_occupancy']['occupancy'] == int(insights['highest_occupancy']['occupancy'])
+
+    save_insights(insights, str(tmp_path / "insights.parquet"))
+    peaks = pd.read_parquet(tmp_path / "insights.peak_hours.parquet")
+    assert len(peaks) == len(insights['peak_hours'])
+    assert (tmp_path / "insights.busiest_traffic.parquet").exists()
@@ -0,0 +1,115 @@
+import threading
+
+import psycopg2
+import pytest
+
+from parallel_writer import ParallelWriter
+
+
+class SerializationFailure(psycopg2.Error):
+    pgcode = "40001"
+
+
+class UniqueViolation(psycopg2.Error):
+    pgcode = "23505"
+
+
+# Records executed statements; fails the first `failures` executes with `error`
+class FakeConnection:
+    def __init__(self, log, failures=0, error=SerializationFailure):
+        self.log = log
+        self.failures = failures
+        self.error = error
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, template, row):
+        return (template % tuple(repr(value) for value in row)).encode()
+
+    def execute(self, statement):
+        if self.conn.failures:
+            self.conn.failures -= 1
+            raise self.conn.error("failed")
+        self.conn.log.append(statement)
+
+
+def make_connect(log, **kwargs):
+    connections = []
+    lock = threading.Lock()
+
+    def connect():
+        conn = FakeConnection(log, **kwargs)
+        with lock:
+            connections.append(conn)
+        return conn
+    return connect, connections
+
+
+def test_writes_every_batch_and_closes_connections(capsys):
+    log = []
+    connect, connections = make_connect(log)
+    with ParallelWriter(connect, workers=3, max_pending=2) as writer:
+        for batch in range(10):
+            writer.submit("INSERT INTO t VALUES ", "(%s, %s)", [(batch, i) for i in range(5)])
+
+    assert writer.rows == 50 and writer.batches == 10
+    assert len(log) == 10
+    assert all(statement.startswith(b"INSERT INTO t VALUES (") for statement in log)
+    assert 1 <= len(connections) <= 3
+    assert all(conn.autocommit and conn.closed for conn in connections)
+    assert "50 rows in 10 batches" in capsys.readouterr().out
+
+
+def test_serialization_failures_are_retried():
+    log = []
+    connect, _ = make_connect(log, failures=2)
+    with ParallelWriter(connect, workers=1, backoff=0) as writer:
+        writer.submit("INSERT INTO t VALUES ", "(%s)", [(1,), (2,)])
+
+    assert writer.retries == 2
+    assert writer.rows == 2 and len(log) == 1
+
+
+def test_other_errors_are_raised_on_close():
+    connect, _ = make_connect([], failures=1, error=UniqueViolation)
+    writer = ParallelWriter(connect, workers=1, backoff=0)
+    writer.submit("INSERT INTO t VALUES ", "(%s)", [(1,)])
+    with pytest.raises(UniqueViolation):
+        writer.close()
+    assert writer.retries == 0 and writer.rows == 0
+
+
+def test_retries_give_up_after_max_retries():
+    connect, _ = make_connect([], failures=10)
+    writer = ParallelWriter(connect, workers=1, max_retries=2, backoff=0)
+    writer.submit("INSERT INTO t VALUES ", "(%s)", [(1,)])
+    with pytest.raises(SerializationFailure):
+        writer.close()
+    assert writer.retries == 2
+
+
+def test_worker_errors_do_not_hide_the_exception_being_raised(capsys):
+    connect, _ = make_connect([], failures=1, error=UniqueViolation)
+    with pytest.raises(KeyError):
+        with ParallelWriter(connect, workers=1, backoff=0) as writer:
+            writer.submit("INSERT INTO t VALUES ", "(%s)", [(1,)])
+            writer.executor.shutdown(wait=True)
+            raise KeyError("caller")
+    assert "[WARN] Writer batch failed: UniqueViolation" in capsys.readouterr().out
@@ -0,0 +1,98 @@
+import json
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from predict_service import FEATURES, OccupancyPredictor, make_handler, parse_timestamp
+
+
+@pytest.mark.parametrize("value", ["2025-06-02 09:00", "2025-06-02 09:00:00", " 2025-06-02T09:00 "])
+def test_parse_timestamp_formats(value):
+    assert parse_timestamp(value) == datetime(2025, 6, 2, 9, 0)
+
+
+@pytest.mark.parametrize("value", [None, 20250602, "tomorrow"])
+def test_parse_timestamp_rejects_non_strings_and_bad_formats(value):
+    with pytest.raises(ValueError):
+        parse_timestamp(value)
+
+
+@pytest.fixture
+def predictor(tmp_path):
+    # Occupancy = lot code * 100 + hour, so predictions are easy to check
+    rows = [(lot, weekday, hour, minute) for lot in range(2) for weekday in range(5)
+            for hour in range(24) for minute in (0, 30)]
+    X = pd.DataFrame(rows, columns=FEATURES)
+    model = DecisionTreeRegressor().fit(X, X['lot_id_encoded'] * 100 + X['hour'])
+    weekdays = {day: i for i, day in enumerate(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])}
+    model_file = tmp_path / "model.joblib"
+    joblib.dump((model, {1000: 0, 1001: 1}, weekdays), model_file)
+    return OccupancyPredictor(str(model_file), cache_size=2)
+
+
+def test_predict_many_caches_and_reports_unknowns(predictor):
+    monday_nine = datetime(2025, 6, 2, 9, 0)
+    results, errors = predictor.predict_many([("1001", monday_nine), (1001, monday_nine),
+                                              ("9999", monday_nine), ("1000", datetime(2025, 6, 7, 9, 0))])
+    assert results[:2] == [109.0, 109.0]
+    assert errors[2] == "Lot ID 9999 not found in training data."
+    assert "Saturday" in errors[3]
+    assert predictor.misses == 3
+    assert predictor.predict("1001", monday_nine) == 109.0
+    assert predictor.hits == 1
+    assert len(predictor.cache) <= 2
+
+
+@pytest.fixture
+def server(predictor):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(predictor))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body):
+    request = Request(url + "/predict", data=json.dumps(body).encode(), headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(request) as response:
+            return response.status, json.load(response)
+    except HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_http_predictions(server):
+    status, body = post(server, {"queries": [{"lot_id": 1000, "timestamp": "2025-06-02 10:30"}]})
+    assert status == 200
+    assert body["predictions"][0]["predicted_occupancy"] == 10.0
+    with urlopen(server + "/predict?lot_id=1001&timestamp=2025-06-02+08:00") as response:
+        assert json.load(response)["predictions"][0]["predicted_occupancy"] == 108.0
+
+
+@pytest.mark.parametrize("query", [{"lot_id": 1000}, {"lot_id": 1000, "timestamp": None},
+                                   {"lot_id": 1000, "timestamp": 1717318800}, "not a query"])
+def test_bad_queries_get_400(server, query):
+    status, body = post(server, {"queries": [query]})
+    assert status == 400
+    assert body["error"].startswith("Bad query")
+
+
+@pytest.mark.parametrize("body", [[{"lot_id": 1000, "timestamp": "2025-06-02 10:30"}], "x", 5, None, {}])
+def test_bad_bodies_get_400(server, body):
+    status, response = post(server, body)
+    assert status == 400
+    assert response["error"].startswith("Bad request body")
+
+
+def test_missing_get_timestamp_gets_400(server):
+    with pytest.raises(HTTPError) as excinfo:
+        urlopen(server + "/predict?lot_id=1000")
+    assert excinfo.value.code == 400
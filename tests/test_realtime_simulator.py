@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import enhanced_realtime_simulator as simulator
+from enhanced_realtime_simulator import (ARRIVAL, DEPARTURE, EventQueue, LotState, SimulationClock, flush_tick,
+                                         partition_lots)
+
+START = datetime(2025, 3, 3, 8, 0)
+
+
+class FakeConnection:
+    encoding = "UTF8"
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, template, args):
+        return (template.decode() % tuple(repr(value) for value in args)).encode()
+
+    def execute(self, sql, params=None):
+        self.connection.statements.append((sql, params))
+
+
+def test_flush_tick_writes_one_insert_and_net_deltas_per_lot():
+    conn = FakeConnection()
+    events = [
+        ("lot-1", "s1", "regular", "entry", START),
+        ("lot-1", "s2", "regular", "entry", START + timedelta(seconds=5)),
+        ("lot-1", "s1", "regular", "exit", START + timedelta(seconds=9)),
+        ("lot-1", "s3", "ev", "entry", START + timedelta(seconds=12)),
+        ("lot-2", "s4", "ada", "exit", START + timedelta(seconds=20)),
+    ]
+    flush_tick(conn, events)
+
+    assert conn.commits == 1
+    (insert, _), *updates = conn.statements
+    assert insert.count(b"'s") == len(events) and b"INSERT INTO parksmart.sensorlogs" in insert
+    assert [params for _, params in updates] == [
+        {"regular": -1, "ev": -1, "ada": 0, "lot_id": "lot-1"},
+        {"regular": 0, "ev": 0, "ada": 1, "lot_id": "lot-2"},
+    ]
+
+
+def test_flush_tick_skips_empty_ticks():
+    conn = FakeConnection()
+    flush_tick(conn, [])
+    assert conn.statements == [] and conn.commits == 0
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(simulator.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(simulator.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_scaled_clock_sleeps_simulated_time_over_speed(fake_time):
+    clock = SimulationClock(START, "scaled", speed=30.0)
+    clock.wait_until(START + timedelta(minutes=1))
+    assert fake_time.sleeps == [pytest.approx(2.0)]
+
+    # Already behind schedule: no sleep
+    fake_time.now += 10
+    clock.wait_until(START + timedelta(minutes=2))
+    assert len(fake_time.sleeps) == 1
+    assert clock.elapsed() == pytest.approx(12.0)
+
+
+def test_realtime_and_fast_clocks(fake_time):
+    SimulationClock(START, "realtime", speed=30.0).wait_until(START + timedelta(seconds=3))
+    SimulationClock(START, "fast").wait_until(START + timedelta(hours=1))
+    assert fake_time.sleeps == [pytest.approx(3.0)]
+    with pytest.raises(ValueError):
+        SimulationClock(START, "slow")
+
+
+def test_event_queue_pops_in_time_order_up_to_the_window():
+    queue = EventQueue()
+    queue.schedule(START + timedelta(seconds=30), DEPARTURE, "lot-1", 4)
+    queue.schedule(START + timedelta(seconds=10), ARRIVAL, "lot-2")
+    queue.schedule(START + timedelta(seconds=10), DEPARTURE, "lot-1", {"unorderable": True})
+    queue.schedule(START + timedelta(seconds=60), ARRIVAL, "lot-3")
+
+    popped = list(queue.pop_until(START + timedelta(seconds=30)))
+    # Equal times keep their scheduling order; the window end is exclusive
+    assert [(kind, lot_id) for _, kind, lot_id, _ in popped] == [(ARRIVAL, "lot-2"), (DEPARTURE, "lot-1")]
+    assert len(queue) == 2
+    assert [event[0] for event in queue.pop_until(START + timedelta(hours=1))] == [
+        START + timedelta(seconds=30), START + timedelta(seconds=60)]
+
+
+def test_partition_lots_balances_sensors():
+    sizes = {"A": 90, "B": 60, "C": 50, "D": 40, "E": 30, "F": 10}
+    sensors_by_lot = {lot_id: [f"{lot_id}{i}" for i in range(size)] for lot_id, size in sizes.items()}
+    lot_info = dict.fromkeys(list(sizes) + ["no-sensors"], {})
+
+    partitions = partition_lots(lot_info, sensors_by_lot, 3)
+    assert sorted(lot_id for bucket in partitions for lot_id in bucket) == sorted(sizes)
+    loads = [sum(sizes[lot_id] for lot_id in bucket) for bucket in partitions]
+    assert max(loads) - min(loads) <= max(sizes.values()) - min(sizes.values())
+    assert sorted(loads) == [90, 90, 100]
+
+    # Never more shards than lots
+    assert len(partition_lots(lot_info, sensors_by_lot, 10)) == len(sizes)
+
+
+def test_lot_state_parks_and_releases_each_sensor_once():
+    info = {"total_ev_spots": 2, "total_ada_spots": 1}
+    state = LotState("lot-1", [f"s{i}" for i in range(6)], info)
+    assert state.totals == {"regular": 3, "ev": 2, "ada": 1}
+
+    taken = [state.park("ev") for _ in range(2)]
+    assert sorted(taken) == [0, 1] and state.park("ev") is None
+    assert state.leave(taken[0]) == "ev" and state.available("ev") == 1
+    with pytest.raises(ValueError):
+        state.leave(taken[0])
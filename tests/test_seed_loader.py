@@ -0,0 +1,103 @@
+import csv
+import os
+import shutil
+
+import pyarrow as pa
+import pytest
+
+from base_generator import BaseGenerator
+from seed_loader import UUID_CODES, UUID_TYPE, load_seed_table, load_seed_tables, uuid_array, uuid_strings
+from seed_sinks import AUDIT_COLUMNS, BASE_TABLES, SEED_FILES, SEED_HEADERS, seed_csv_sink
+
+TABLES = ["lot", "block", "spot", "employee"]
+
+
+@pytest.fixture(scope="module")
+def seed_dir(tmp_path_factory):
+    seed_dir = str(tmp_path_factory.mktemp("seed_files"))
+    generator = BaseGenerator(seed=3, workers=1)
+    sinks = {table: seed_csv_sink(seed_dir, table, generator.now) for table in BASE_TABLES}
+    for table, rows in generator.iter_tables(employee_count=200, spot_count=120):
+        sinks[table].write_rows(rows)
+    for sink in sinks.values():
+        sink.close()
+    return seed_dir
+
+
+def csv_columns(seed_dir, table):
+    with open(os.path.join(seed_dir, SEED_FILES[table]), newline='') as f:
+        rows = list(csv.reader(f))[1:]
+    return {column: [row[i] for row in rows] for i, column in enumerate(SEED_HEADERS[table])}
+
+
+@pytest.mark.parametrize("table", TABLES)
+def test_strings_round_trip_the_csv(seed_dir, table):
+    seed = load_seed_table(seed_dir, table, cache=False)
+    expected = csv_columns(seed_dir, table)
+    assert len(seed) == len(expected["id"])
+    for column in SEED_HEADERS[table]:
+        if column in AUDIT_COLUMNS:
+            assert column not in seed.data.column_names
+            continue
+        values = seed.strings(column)
+        assert [str(value) for value in values] == expected[column], column
+
+
+def test_typed_columns(seed_dir):
+    spot = load_seed_table(seed_dir, "spot", cache=False)
+    assert spot.data.schema.field("id").type == UUID_TYPE
+    assert spot.data.schema.field("lot_id").type == UUID_CODES
+    assert spot.data.schema.field("row_number").type == pa.int32()
+    codes, lot_ids = spot.codes("lot_id")
+    assert len(codes) == len(spot) and len(set(lot_ids)) == len(lot_ids)
+    with pytest.raises(TypeError):
+        spot.codes("id")
+
+
+def test_cache_is_reused_until_the_csv_changes(seed_dir, tmp_path):
+    seed_dir = shutil.copytree(seed_dir, tmp_path / "seeds")
+    first = load_seed_tables(seed_dir, TABLES)
+    assert not any(seed.from_cache for seed in first.values())
+    assert os.path.exists(os.path.join(seed_dir, ".cache", "spot_seed.arrow"))
+
+    second = load_seed_tables(seed_dir, TABLES)
+    assert all(seed.from_cache for seed in second.values())
+    assert second["spot"].data.equals(first["spot"].data)
+
+    # Rewrite the block file without its last row and a newer mtime: the cache is stale
+    path = os.path.join(seed_dir, SEED_FILES["block"])
+    with open(path, newline='') as f:
+        lines = f.readlines()
+    with open(path, 'w', newline='') as f:
+        f.writelines(lines[:-1])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    block = load_seed_table(seed_dir, "block")
+    assert not block.from_cache
+    assert len(block) == len(first["block"]) - 1
+    assert load_seed_table(seed_dir, "block").from_cache
+
+
+def test_uuid_conversions():
+    values = ["0d1f6c4e-8b8f-4f8e-9a5b-1c2d3e4f5a6b", "", "FFFFFFFF-FFFF-4FFF-BFFF-FFFFFFFFFFFF"]
+    binary = uuid_array(pa.array(values))
+    assert binary.type == UUID_TYPE and binary.null_count == 1
+    assert uuid_strings(binary) == [values[0], "", values[2].lower()]
+    with pytest.raises(ValueError):
+        uuid_array(pa.array(["not-a-uuid"]))
+    with pytest.raises(ValueError):
+        uuid_array(pa.array(["0d1f6c4e-8b8f-4f8e-9a5b-1c2d3e4f5a6g"]))
+
+
+def test_log_inputs_match_the_generated_chunks(seed_dir):
+    from base_tables_seeder_v2 import LogInputs
+
+    from_files = LogInputs.from_seed_files(seed_dir)
+    from_chunks = LogInputs()
+    for table, rows in BaseGenerator(seed=3, workers=1).iter_tables(employee_count=200, spot_count=120):
+        from_chunks.add_chunk(table, rows)
+    # Parking history references employee.id, not the employee code
+    assert from_files.employee_ids == from_chunks.employee_ids == csv_columns(seed_dir, "employee")["id"]
+    assert from_files.employee_blocks == from_chunks.employee_blocks
+    assert from_files.lot_id_map == from_chunks.lot_id_map
+    assert from_files.nearest_lots_by_block == from_chunks.nearest_lots_by_block
@@ -0,0 +1,89 @@
+import csv
+import os
+import re
+from datetime import datetime
+
+import pytest
+
+from base_generator import BaseGenerator
+from seed_sinks import AUDIT_COLUMNS, BASE_TABLES, LOG_TABLES, SEED_FILES, SEED_HEADERS, audit_values, seed_csv_sink
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+NOW = datetime(2025, 1, 1)
+
+
+# table -> [(column, definition)] from park_smar_ddl.sql
+def ddl_columns(path=os.path.join(ROOT, "park_smar_ddl.sql")):
+    tables = {}
+    for table, body in re.findall(r"CREATE TABLE park_smart\.(\w+) \((.*?)\n\);", open(path).read(), re.S):
+        columns = []
+        for line in body.splitlines():
+            line = line.split("--")[0].strip().rstrip(",")
+            if line and not line.startswith("PRIMARY KEY"):
+                name, definition = line.split(None, 1)
+                columns.append((name, definition))
+        tables[table] = columns
+    return tables
+
+
+DDL = ddl_columns()
+
+
+@pytest.mark.parametrize("table", BASE_TABLES + LOG_TABLES)
+def test_headers_are_ddl_columns(table):
+    columns = [name for name, _ in DDL[table]]
+    assert set(SEED_HEADERS[table]) <= set(columns)
+    required = [name for name, definition in DDL[table] if "NOT NULL" in definition and "DEFAULT" not in definition]
+    assert set(required) <= set(SEED_HEADERS[table])
+    # The audit columns trail every seed row, in the DDL's order
+    assert SEED_HEADERS[table][-len(AUDIT_COLUMNS):] == AUDIT_COLUMNS
+    assert [name for name in columns if name in AUDIT_COLUMNS] == AUDIT_COLUMNS
+
+
+@pytest.mark.parametrize("table", BASE_TABLES + LOG_TABLES)
+def test_audit_values_match_column_types(table):
+    values = dict(zip(AUDIT_COLUMNS, audit_values(NOW)))
+    definitions = dict(DDL[table])
+    for column, value in values.items():
+        if definitions[column].startswith("TIMESTAMP"):
+            assert value == NOW
+        else:
+            assert value == "system"
+
+
+def test_generated_rows_fill_the_headers():
+    generator = BaseGenerator(seed=1, workers=1)
+    seen = set()
+    for table, rows in generator.iter_tables(employee_count=100, spot_count=50):
+        seen.add(table)
+        assert {len(row) for row in rows} == {len(SEED_HEADERS[table]) - len(AUDIT_COLUMNS)}, table
+    assert seen == set(BASE_TABLES)
+
+
+def test_block_rows_carry_a_name():
+    generator = BaseGenerator(seed=1)
+    generator.lot_rows()
+    row = dict(zip(SEED_HEADERS["block"], generator.block_rows()[0]))
+    assert row["block_id"] == "A" and row["name"] == "Block A"
+    assert row["office_id"] == generator.office_id
+    assert row["nearest_lots"].count(",") == 1
+
+
+def test_csv_sink_appends_audit_columns(tmp_path):
+    with seed_csv_sink(str(tmp_path), "sensor", NOW) as sink:
+        sink.write_rows([["s1", "SENSOR-s1", "p1", "ACTIVE", "", "ULTRASONIC"]])
+    with open(tmp_path / SEED_FILES["sensor"], newline='') as f:
+        header, row = list(csv.reader(f))
+    assert header == SEED_HEADERS["sensor"]
+    assert dict(zip(header, row))["created_by"] == "system"
+    assert dict(zip(header, row))["updated_at"] == str(NOW)
+
+
+@pytest.mark.parametrize("table", ["office", "lot", "block", "spot", "sensor"])
+def test_committed_seed_files_match_headers(table):
+    with open(os.path.join(ROOT, "seed_files", SEED_FILES[table]), newline='') as f:
+        reader = csv.reader(f)
+        assert next(reader) == SEED_HEADERS[table]
+        for row in reader:
+            assert len(row) == len(SEED_HEADERS[table])
+            assert row[-3] == row[-1] == "system"
@@ -0,0 +1,133 @@
+import csv
+import importlib.util
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+spec = importlib.util.spec_from_file_location("sensor_log_extract", os.path.join(ROOT, "sensor-log-extract.py"))
+extract = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(extract)
+
+
+# Sensor logs with their commit timestamps; the export cursor applies the watermark filter
+class FakeConnection:
+    def __init__(self):
+        self.rows = []  # (commit timestamp, export row)
+        self.clock = Decimal("100.0000000001")
+        self.queries = []
+        self.commits = 0
+
+    def add(self, event_timestamp, sensor_id="s1"):
+        self.clock += 1
+        self.rows.append((self.clock, ("lot-1", "Lot A", sensor_id, "entry", event_timestamp,
+                                       event_timestamp.date(), 1, event_timestamp.hour, event_timestamp.minute)))
+
+    def cursor(self, name=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return iter(self.result)
+
+    def execute(self, query, params=None):
+        if "cluster_logical_timestamp" in query:
+            self.result = [(self.conn.clock,)]
+            return
+        self.conn.queries.append((query, params))
+        rows = self.conn.rows
+        if "crdb_internal_mvcc_timestamp > %s" in query:
+            rows = [(commit, row) for commit, row in rows if commit > params[0]]
+        self.result = sorted((row for _, row in rows), key=lambda row: row[4])
+
+    def fetchone(self):
+        return self.result[0]
+
+
+def csv_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return ["--output", str(tmp_path / "export.csv"), "--watermark-file", str(tmp_path / "export.watermark")]
+
+
+def test_since_last_exports_late_events_once(paths):
+    conn = FakeConnection()
+    conn.add(datetime(2025, 3, 3, 9, 0))
+    conn.add(datetime(2025, 3, 3, 10, 0))
+    args = extract.parse_args(paths + ["--since-last"])
+    assert extract.export(conn, args) == (2, False)
+    assert extract.read_watermark(args.watermark_file) == conn.clock
+
+    # A late event (older event_timestamp, newer commit) is still picked up, and nothing is repeated
+    conn.add(datetime(2025, 3, 3, 8, 30), sensor_id="late")
+    conn.add(datetime(2025, 3, 3, 11, 0))
+    assert extract.export(conn, args) == (2, True)
+    assert extract.export(conn, args) == (0, True)
+
+    rows = csv_rows(args.output)
+    assert rows[0] == extract.EXPORT_COLUMNS
+    assert [row[4] for row in rows[1:]] == ["2025-03-03 09:00:00", "2025-03-03 10:00:00",
+                                            "2025-03-03 08:30:00", "2025-03-03 11:00:00"]
+
+
+def test_first_since_last_run_replaces_an_existing_output(paths):
+    args = extract.parse_args(paths + ["--since-last"])
+    with open(args.output, "w") as f:
+        f.write("stale,export\n")
+    conn = FakeConnection()
+    conn.add(datetime(2025, 3, 3, 9, 0))
+    assert extract.export(conn, args) == (1, False)
+    rows = csv_rows(args.output)
+    assert rows[0] == extract.EXPORT_COLUMNS and len(rows) == 2
+
+
+def test_bounded_export_leaves_the_watermark_alone(paths):
+    conn = FakeConnection()
+    conn.add(datetime(2025, 3, 3, 9, 0))
+    args = extract.parse_args(paths + ["--start", "2025-03-03"])
+    assert extract.export(conn, args) == (1, False)
+    assert not os.path.exists(args.watermark_file)
+
+    # An unbounded full export does record it
+    extract.export(conn, extract.parse_args(paths))
+    assert extract.read_watermark(args.watermark_file) == conn.clock
+
+
+@pytest.mark.parametrize("bound", [["--start", "2025-03-03"], ["--end", "2025-03-04"]])
+def test_since_last_rejects_a_bounded_range(paths, bound):
+    with pytest.raises(SystemExit):
+        extract.parse_args(paths + ["--since-last"] + bound)
+
+
+def test_filters(tmp_path):
+    assert extract.build_filters(None) == ("", [])
+    where, params = extract.build_filters(Decimal("5.1"), end=datetime(2025, 3, 4))
+    assert where == "WHERE sl.crdb_internal_mvcc_timestamp > %s AND event_timestamp < %s"
+    assert params == [Decimal("5.1"), datetime(2025, 3, 4)]
+
+    # Watermark files written before commit timestamps were used hold an event_timestamp
+    path = str(tmp_path / "legacy.watermark")
+    extract.write_watermark(path, datetime(2025, 3, 3, 9, 0))
+    watermark = extract.read_watermark(path)
+    assert extract.build_filters(watermark)[0] == "WHERE event_timestamp > %s"
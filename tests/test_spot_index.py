@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from spot_index import SpotIndex, SpotPool
+
+
+# (id, spot_id, lot_id, sensor_id) spot rows: lot A has 3 spots, lot B 2, lot C 1
+def spot_rows():
+    rows = []
+    for lot_id, count in (("A", 3), ("B", 2), ("C", 1)):
+        for i in range(count):
+            rows.append([f"spot-{lot_id}{i}", f"{lot_id}-{i + 1}", lot_id, f"sensor-{lot_id}{i}"])
+    return rows
+
+
+@pytest.fixture
+def pool():
+    return SpotPool(SpotIndex(spot_rows()))
+
+
+def test_index_groups_positions_by_lot():
+    index = SpotIndex(spot_rows()[:2])
+    index.extend(spot_rows()[2:])
+    assert len(index) == 6
+    assert [index.spot_count(lot_id) for lot_id in "ABCX"] == [3, 2, 1, 0]
+    assert [index.sensor_ids[pos] for pos in index.by_lot["B"]] == ["sensor-B0", "sensor-B1"]
+
+
+def test_acquire_release_round_trip(pool):
+    pos = pool.acquire("A", random.Random(1))
+    assert pool.sensor_id(pos).startswith("sensor-A")
+    assert len(pool.free["A"]) == 2
+
+    pool.release("A", pos)
+    assert len(pool.free["A"]) == 3
+    assert sorted(pool.free["A"]) == list(pool.index.by_lot["A"])
+    with pytest.raises(ValueError):
+        pool.release("A", pos)
+
+
+def test_full_lot_spills_over_in_order(pool):
+    rng = random.Random(2)
+    taken = [pool.acquire_first(["B", "C", "A"], rng) for _ in range(4)]
+    assert [lot_id for lot_id, _ in taken] == ["B", "B", "C", "A"]
+    assert pool.acquire("C", rng) is None
+
+
+def test_all_lots_full_returns_none(pool):
+    rng = random.Random(3)
+    for _ in range(6):
+        assert pool.acquire_first(["A", "B", "C"], rng) is not None
+    assert pool.acquire_first(["A", "B", "C"], rng) is None
+    assert pool.acquire("unknown", rng) is None
+
+
+def test_spot_never_handed_out_twice_while_held(pool):
+    rng = random.Random(4)
+    held = {}
+    for step in range(2000):
+        if held and (len(held) == len(pool.index) or rng.random() < 0.4):
+            pos = rng.choice(sorted(held))
+            pool.release(held.pop(pos), pos)
+            continue
+        allocation = pool.acquire_first(rng.sample("ABC", 3), rng)
+        assert allocation is not None
+        lot_id, pos = allocation
+        assert pos not in held
+        assert pos in pool.index.by_lot[lot_id]
+        held[pos] = lot_id
+    assert sum(len(free) for free in pool.free.values()) + len(held) == len(pool.index)
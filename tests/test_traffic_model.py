@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from traffic_model import (MINUTES_PER_DAY, SECONDS_PER_DAY, TimeCurve, TrafficModel, fit_traffic_model,
+                           load_traffic_model)
+
+
+def test_sample_visits_leave_after_the_minimum_stay():
+    model = TrafficModel.default()
+    arrivals, departures = model.sample_visits(0, 20_000, rng=np.random.default_rng(0))
+    assert arrivals.dtype == np.int64 and departures.dtype == np.int64
+    assert (departures > arrivals).all()
+    assert ((arrivals >= 0) & (departures <= SECONDS_PER_DAY)).all()
+    # Only visits that arrive within the minimum stay of midnight can be cut short
+    in_day = arrivals < SECONDS_PER_DAY - model.min_stay_minutes * 60
+    assert in_day.mean() > 0.99
+    assert (departures[in_day] - arrivals[in_day] >= model.min_stay_minutes * 60).all()
+    # The built-in curves peak at 8:45 and around 17:00
+    assert abs(np.median(arrivals) / 60 - 8.75 * 60) < 45
+    assert abs(np.median(departures) / 60 - 17 * 60) < 60
+
+
+def test_sample_visits_per_group():
+    late = TimeCurve.mixture([("13:00", 5, 1.0)])
+    model = TrafficModel({(None, None): TimeCurve.mixture([("08:00", 5, 1.0)]), (None, "B"): late},
+                         {(None, None): TimeCurve.uniform()}, min_stay_minutes=30)
+    groups = np.array(["A", "B"] * 500)
+    arrivals, departures = model.sample_visits(2, len(groups), groups=groups, rng=np.random.default_rng(1))
+    assert abs(np.mean(arrivals[groups == "A"]) / 3600 - 8) < 0.1
+    assert abs(np.mean(arrivals[groups == "B"]) / 3600 - 13) < 0.1
+    assert (departures - arrivals >= 30 * 60).all()
+
+
+def test_arrival_volume_follows_the_curve():
+    model = TrafficModel.default()
+    curve = model.arrival_curve()
+    per_day = 5000
+    rng = np.random.default_rng(2)
+    start = datetime(2025, 3, 3, 7, 0)
+    windows = [(start, start + timedelta(hours=3)), (start + timedelta(hours=13), start + timedelta(hours=15))]
+    for window_start, window_end in windows:
+        counts = [len(model.arrival_times(window_start, window_end, per_day, rng=rng)) for _ in range(20)]
+        expected = per_day * (curve.cumulative(window_end.hour * 3600) - curve.cumulative(window_start.hour * 3600))
+        assert abs(np.mean(counts) - expected) < 4 * np.sqrt(expected / 20) + 1
+
+    # Sorted, inside the window, and spanning midnight
+    times = model.arrival_times(datetime(2025, 3, 3, 20, 0), datetime(2025, 3, 5, 10, 0), per_day, rng=rng)
+    assert times == sorted(times)
+    assert times[0] >= datetime(2025, 3, 3, 20, 0) and times[-1] < datetime(2025, 3, 5, 10, 0)
+    expected = per_day * ((1 - curve.cumulative(20 * 3600)) + 1 + curve.cumulative(10 * 3600))
+    assert abs(len(times) - expected) < 5 * np.sqrt(expected)
+
+
+def test_curve_lookup_falls_back():
+    curves = {key: TimeCurve.uniform() for key in [(None, None), (0, None), (None, "7"), (0, "8")]}
+    model = TrafficModel(curves, {(None, None): TimeCurve.uniform()})
+    assert model.grouped
+    assert model.arrival_curve(0, 8) is curves[(0, "8")]
+    assert model.arrival_curve(0, "7") is curves[(0, None)]
+    assert model.arrival_curve(1, "7") is curves[(None, "7")]
+    assert model.arrival_curve(1, "9") is curves[(None, None)]
+    assert model.arrival_curve() is curves[(None, None)]
+    assert model.departure_curve(0, "8") is model.departures[(None, None)]
+
+    with pytest.raises(ValueError):
+        TrafficModel({(0, None): TimeCurve.uniform()}, {(None, None): TimeCurve.uniform()})
+    with pytest.raises(ValueError):
+        TimeCurve(np.zeros(MINUTES_PER_DAY))
+
+
+def sensor_logs(rng, days=10):
+    frames = []
+    for day in pd.date_range("2025-03-03", periods=days):
+        for lot_id, peak in ((1000, 8), (1001, 10)):
+            count = 400 if day.weekday() < 5 else 40
+            entries = day + pd.to_timedelta(rng.normal(peak, 0.5, count) * 3600, unit="s")
+            exits = entries + pd.to_timedelta(rng.uniform(6, 9, count) * 3600, unit="s")
+            frames.append(pd.DataFrame({"lot_id": lot_id, "event_type": ["entry"] * count + ["exit"] * count,
+                                        "event_timestamp": np.concatenate([entries, exits])}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_fit_save_load_round_trip(tmp_path):
+    model = fit_traffic_model(sensor_logs(np.random.default_rng(3)), by="lot_id", min_events=300)
+    assert (None, None) in model.arrivals and (0, None) in model.arrivals and (0, "1001") in model.arrivals
+    assert (5, None) not in model.arrivals  # weekend days have too few events and fall back
+    assert abs(model.arrival_curve(0, "1000").peak_minute() - 8 * 60) < 45
+    assert abs(model.arrival_curve(0, "1001").peak_minute() - 10 * 60) < 45
+
+    path = str(tmp_path / "traffic_model.json")
+    model.save(path)
+    loaded = load_traffic_model(path)
+    assert loaded.min_stay_minutes == model.min_stay_minutes and loaded.grouped
+    for original, restored in ((model.arrivals, loaded.arrivals), (model.departures, loaded.departures)):
+        assert set(original) == set(restored)
+        for key, curve in original.items():
+            np.testing.assert_allclose(restored[key].pdf, curve.pdf, atol=1e-7)
+
+    # Built-in curves are stored by their parameters; a missing default falls back to the built-in one
+    default = TrafficModel.default()
+    default.save(path)
+    assert load_traffic_model(path).to_config() == default.to_config()
+    partial = TrafficModel.from_config({"curves": [{"kind": "arrival", "weekday": 0, "group": 1000, "uniform": True}]})
+    assert partial.arrival_curve(0, 1000).spec == {"uniform": True}
+    assert partial.arrival_curve(1).spec == default.arrival_curve().spec
+    assert isinstance(load_traffic_model(None), TrafficModel)
@@ -0,0 +1,275 @@
+import argparse
+import json
+from datetime import datetime, time, timedelta
+
+import numpy as np
+
+from columnar_io import read_sensor_logs
+from occupancy import event_deltas
+
+MINUTES_PER_DAY = 24 * 60
+SECONDS_PER_DAY = MINUTES_PER_DAY * 60
+# Minute-of-day bin edges, in seconds after midnight
+BIN_EDGES = np.arange(MINUTES_PER_DAY + 1) * 60.0
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Built-in commuter curves as (mean "HH:MM", sd minutes, weight) components:
+# a sharp 8:45 arrival peak with a later shoulder, and departures spread around 17:00
+DEFAULT_ARRIVALS = [("08:45", 12, 0.55), ("09:30", 35, 0.30), ("07:45", 25, 0.15)]
+DEFAULT_DEPARTURES = [("17:00", 25, 0.50), ("16:15", 40, 0.30), ("18:00", 50, 0.20)]
+MIN_STAY_MINUTES = 60
+
+
+def clock_minutes(value):
+    if isinstance(value, str):
+        hours, minutes = value.split(":")
+        return int(hours) * 60 + int(minutes)
+    return float(value)
+
+
+def format_clock(minutes):
+    return f"{int(minutes) // 60:02d}:{int(minutes) % 60:02d}"
+
+
+# A distribution over the time of day with one weight per minute (uniform within each minute).
+# Sampling inverts the piecewise-linear CDF for a whole batch of uniforms at once.
+class TimeCurve:
+    def __init__(self, weights, spec=None):
+        weights = np.clip(np.asarray(weights, dtype=float), 0, None)
+        if weights.shape != (MINUTES_PER_DAY,):
+            raise ValueError(f"Time curve needs {MINUTES_PER_DAY} per-minute weights, got {weights.shape}")
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError("Time curve has no weight")
+        self.pdf = weights / total
+        self.cdf = np.concatenate([[0.0], np.cumsum(self.pdf)])
+        self.cdf[-1] = 1.0
+        self.spec = spec
+
+    # Gaussian components of (mean "HH:MM" or minutes, sd minutes, weight)
+    @classmethod
+    def mixture(cls, components):
+        centers = np.arange(MINUTES_PER_DAY) + 0.5
+        weights = np.zeros(MINUTES_PER_DAY)
+        spec = []
+        for mean, sd, weight in components:
+            mu = clock_minutes(mean)
+            weights += weight * np.exp(-0.5 * ((centers - mu) / sd) ** 2) / sd
+            spec.append([format_clock(mu), sd, weight])
+        return cls(weights, spec={"mixture": spec})
+
+    @classmethod
+    def uniform(cls):
+        return cls(np.ones(MINUTES_PER_DAY), spec={"uniform": True})
+
+    @classmethod
+    def from_config(cls, config):
+        if "mixture" in config:
+            return cls.mixture(config["mixture"])
+        if config.get("uniform"):
+            return cls.uniform()
+        return cls(config["histogram"])
+
+    def to_config(self):
+        if self.spec is not None:
+            return dict(self.spec)
+        return {"histogram": [round(float(p), 8) for p in self.pdf]}
+
+    # Fraction of the day's weight before `seconds` after midnight
+    def cumulative(self, seconds):
+        return np.interp(seconds, BIN_EDGES, self.cdf)
+
+    def inverse(self, u):
+        return np.interp(u, self.cdf, BIN_EDGES)
+
+    # n times in seconds after midnight; with `after` (one value per draw), conditioned on being later
+    def sample(self, n, rng, after=None):
+        low = 0.0 if after is None else self.cumulative(after)
+        return self.inverse(low + rng.random(n) * (1.0 - low))
+
+    def peak_minute(self):
+        return int(np.argmax(self.pdf))
+
+
+# Arrival and departure curves per (weekday, group), where a group is a block for the v2 seeder
+# and a lot for curves fitted per lot. Lookups fall back from (weekday, group) to (weekday, any),
+# (any, group) and finally (any, any), so a model only lists the curves that differ.
+class TrafficModel:
+    def __init__(self, arrivals, departures, min_stay_minutes=MIN_STAY_MINUTES):
+        self.arrivals = dict(arrivals)
+        self.departures = dict(departures)
+        self.min_stay_minutes = min_stay_minutes
+        if (None, None) not in self.arrivals or (None, None) not in self.departures:
+            raise ValueError("Traffic model needs default arrival and departure curves")
+        self.grouped = any(group is not None for _, group in list(self.arrivals) + list(self.departures))
+
+    @classmethod
+    def default(cls):
+        return cls({(None, None): TimeCurve.mixture(DEFAULT_ARRIVALS)},
+                   {(None, None): TimeCurve.mixture(DEFAULT_DEPARTURES)})
+
+    # Constant arrival rate around the clock (the simulator's old behaviour)
+    @classmethod
+    def flat(cls):
+        return cls({(None, None): TimeCurve.uniform()}, {(None, None): TimeCurve.uniform()})
+
+    @staticmethod
+    def _lookup(curves, weekday, group):
+        group = None if group is None else str(group)
+        for key in ((weekday, group), (weekday, None), (None, group), (None, None)):
+            if key in curves:
+                return curves[key]
+
+    def arrival_curve(self, weekday=None, group=None):
+        return self._lookup(self.arrivals, weekday, group)
+
+    def departure_curve(self, weekday=None, group=None):
+        return self._lookup(self.departures, weekday, group)
+
+    # (arrival, departure) in whole seconds after midnight for n visits on a weekday.
+    # Each departure is drawn from the departure curve after the arrival plus the minimum stay.
+    # `groups` (one per visit) selects per-group curves; each group is sampled as one batch.
+    def sample_visits(self, weekday, n, groups=None, rng=None):
+        rng = rng or np.random.default_rng()
+        arrivals = np.empty(n)
+        departures = np.empty(n)
+        if groups is None or not self.grouped:
+            parts = [(None, slice(None))]
+        else:
+            keys, inverse = np.unique(np.asarray(groups), return_inverse=True)
+            parts = [(key, inverse == i) for i, key in enumerate(keys)]
+        for group, rows in parts:
+            count = n if isinstance(rows, slice) else int(rows.sum())
+            arrival = self.arrival_curve(weekday, group).sample(count, rng)
+            departure = self.departure_curve(weekday, group).sample(
+                count, rng, after=arrival + self.min_stay_minutes * 60)
+            arrivals[rows] = arrival
+            departures[rows] = departure
+        arrivals = np.floor(arrivals)
+        return arrivals.astype(np.int64), np.maximum(np.floor(departures), arrivals + 1).astype(np.int64)
+
+    # Sorted arrival datetimes in [start, end) of a Poisson process whose rate follows the arrival
+    # curve, with `per_day` arrivals expected over a whole day
+    def arrival_times(self, start, end, per_day, group=None, rng=None):
+        rng = rng or np.random.default_rng()
+        times = []
+        day = datetime.combine(start.date(), time.min)
+        while day < end:
+            curve = self.arrival_curve(day.weekday(), group)
+            low = curve.cumulative(max((start - day).total_seconds(), 0.0))
+            high = curve.cumulative(min((end - day).total_seconds(), SECONDS_PER_DAY))
+            count = rng.poisson(per_day * (high - low))
+            seconds = np.sort(curve.inverse(low + rng.random(count) * (high - low)))
+            times.extend(day + timedelta(seconds=s) for s in seconds.tolist())
+            day += timedelta(days=1)
+        return times
+
+    def to_config(self):
+        curves = []
+        for kind, table in (("arrival", self.arrivals), ("departure", self.departures)):
+            for (weekday, group), curve in table.items():
+                curves.append({"kind": kind, "weekday": weekday, "group": group, **curve.to_config()})
+        return {"min_stay_minutes": self.min_stay_minutes, "curves": curves}
+
+    @classmethod
+    def from_config(cls, config):
+        tables = {"arrival": {}, "departure": {}}
+        for entry in config["curves"]:
+            group = entry.get("group")
+            key = (entry.get("weekday"), None if group is None else str(group))
+            tables[entry["kind"]][key] = TimeCurve.from_config(entry)
+        # Curves a file leaves out fall back to the built-in commuter curves
+        default = cls.default()
+        tables["arrival"].setdefault((None, None), default.arrivals[(None, None)])
+        tables["departure"].setdefault((None, None), default.departures[(None, None)])
+        return cls(tables["arrival"], tables["departure"],
+                   min_stay_minutes=config.get("min_stay_minutes", MIN_STAY_MINUTES))
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_config(), f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_config(json.load(f))
+
+
+def load_traffic_model(path=None):
+    return TrafficModel.load(path) if path else TrafficModel.default()
+
+
+# Circular moving average over the day, so sparse minutes do not become spikes
+def smooth(counts, window):
+    if window <= 1:
+        return counts
+    kernel = np.ones(window) / window
+    padded = np.concatenate([counts[-window:], counts, counts[:window]])
+    return np.convolve(padded, kernel, mode="same")[window:-window]
+
+
+# Empirical curves from sensor logs: a histogram of entry (arrival) and exit (departure) minutes,
+# overall, per weekday and, with `by`, per weekday and group (e.g. lot_id). Histograms with
+# fewer than `min_events` events are left out and fall back to the broader curve.
+def fit_traffic_model(df, by=None, smoothing_minutes=15, min_events=500):
+    delta = event_deltas(df['event_type']).to_numpy()
+    timestamps = df['event_timestamp']
+    minutes = (timestamps.dt.hour * 60 + timestamps.dt.minute).to_numpy()
+    weekdays = timestamps.dt.weekday.to_numpy()
+    groups = df[by].astype(str).to_numpy() if by else None
+
+    tables = {}
+    for kind, mask in (("arrival", delta > 0), ("departure", delta < 0)):
+        curves = {}
+        keys = {(None, None): mask}
+        for weekday in np.unique(weekdays[mask]):
+            keys[(int(weekday), None)] = mask & (weekdays == weekday)
+            if groups is not None:
+                for group in np.unique(groups[mask & (weekdays == weekday)]):
+                    keys[(int(weekday), str(group))] = mask & (weekdays == weekday) & (groups == group)
+        for key, rows in keys.items():
+            if rows.sum() < min_events:
+                continue
+            counts = np.bincount(minutes[rows], minlength=MINUTES_PER_DAY).astype(float)
+            curves[key] = TimeCurve(smooth(counts, smoothing_minutes))
+        tables[kind] = curves
+    if (None, None) not in tables["arrival"] or (None, None) not in tables["departure"]:
+        raise ValueError(f"Not enough entry/exit events to fit a traffic model (need {min_events} of each)")
+    return TrafficModel(tables["arrival"], tables["departure"])
+
+
+def print_traffic_model(model):
+    print("📈 Arrival / departure peaks:")
+    for weekday in [None] + list(range(7)):
+        arrival = model.arrivals.get((weekday, None))
+        departure = model.departures.get((weekday, None))
+        if arrival is None and departure is None:
+            continue
+        label = "All days" if weekday is None else WEEKDAY_NAMES[weekday]
+        arrival = arrival or model.arrival_curve(weekday)
+        departure = departure or model.departure_curve(weekday)
+        print(f"  {label}: arrivals peak {format_clock(arrival.peak_minute())}, "
+              f"departures peak {format_clock(departure.peak_minute())}")
+    groups = {group for _, group in model.arrivals if group is not None}
+    if groups:
+        print(f"  + per-group curves for {len(groups)} groups")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit arrival/departure curves for the seeders and simulator")
+    parser.add_argument("--input", default="sensor_logs_export.csv", help="Sensor log export (CSV or dataset directory)")
+    parser.add_argument("--output", default="traffic_model.json")
+    parser.add_argument("--by", help="Also fit per-group curves on this column (e.g. lot_id)")
+    parser.add_argument("--smoothing-minutes", type=int, default=15)
+    parser.add_argument("--min-events", type=int, default=500, help="Events needed to fit a curve")
+    parser.add_argument("--start-date", help="Only use logs from this date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Only use logs up to this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    columns = ['event_type', 'event_timestamp'] + ([args.by] if args.by else [])
+    df = read_sensor_logs(args.input, columns=columns, start_date=args.start_date, end_date=args.end_date)
+    print(f"✅ Loaded {len(df)} events from {args.input}")
+    model = fit_traffic_model(df, by=args.by, smoothing_minutes=args.smoothing_minutes, min_events=args.min_events)
+    model.save(args.output)
+    print_traffic_model(model)
+    print(f"✅ Traffic model saved to {args.output}")